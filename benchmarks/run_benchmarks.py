@@ -0,0 +1,149 @@
+# benchmarks/run_benchmarks.py
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic_corpus import generate_corpus
+
+# Compared against the baseline: (section, key, True when higher is better).
+COMPARED = [("", "docs_per_sec", True), ("latency", "p50", False), ("latency", "p90", False), ("", "peak_rss_mb", False)]
+TARGETS = ["extract_borrower_personal_info", "process_urla_pdf", "extract_urla_record"]
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of values (pct in 0..100)."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {"mean": round(sum(values) / len(values), 6),
+            **{f"p{p}": round(percentile(values, p), 6) for p in (50, 90, 99)}}
+
+# --- Targets ---
+# Each target runs in its own fresh process so its peak RSS is not inflated
+# by the targets run before it.
+def _target_call(name: str) -> Callable[[str], Optional[Dict[str, Dict[str, float]]]]:
+    if name == "extract_borrower_personal_info":
+        from src.pdf_parser import extract_borrower_personal_info
+        return lambda path: extract_borrower_personal_info(path, raise_errors=True) and None
+    if name == "process_urla_pdf":
+        from src.main import process_urla_pdf
+
+        def run(path: str) -> None:
+            # process_urla_pdf prints the whole record; keep that out of the timings' output.
+            with contextlib.redirect_stdout(io.StringIO()):
+                process_urla_pdf(os.path.abspath(path))
+        return run
+    if name == "extract_urla_record":
+        from src.main import extract_urla_record
+        from src.metrics import DocumentMetrics
+
+        def run_with_metrics(path: str) -> Dict[str, Dict[str, float]]:
+            metrics = DocumentMetrics()
+            extract_urla_record(path, metrics=metrics)
+            return metrics.stages
+        return run_with_metrics
+    raise ValueError(f"Unknown benchmark target '{name}'")
+
+def run_target(name: str, paths: List[str], repeat: int) -> Dict[str, Any]:
+    """Runs one target over the corpus repeat times (after one untimed warm-up document)."""
+    call = _target_call(name)
+    call(paths[0])
+    latencies: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for path in paths:
+            t0 = time.perf_counter()
+            stage_times = call(path)
+            latencies.append(time.perf_counter() - t0)
+            for stage, times in (stage_times or {}).items():
+                stages.setdefault(stage, []).append(times["wall"])
+    elapsed = time.perf_counter() - started
+    result = {"docs": len(latencies), "elapsed_seconds": round(elapsed, 4),
+              "docs_per_sec": round(len(latencies) / elapsed, 3), "latency": summarize(latencies),
+              # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+              "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                                   / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)}
+    if stages:
+        result["stages"] = {stage: summarize(times) for stage, times in stages.items()}
+    return result
+
+def run_benchmarks(paths: List[str], targets: List[str], repeat: int = 1) -> Dict[str, Any]:
+    results = {}
+    for name in targets:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results[name] = pool.submit(run_target, name, paths, repeat).result()
+    return results
+
+# --- Baseline comparison ---
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Lines describing every compared metric; a metric that got worse by more
+    than tolerance (a fraction, e.g. 0.2) is marked REGRESSION.
+    """
+    lines = []
+    for name, result in current["targets"].items():
+        base = baseline.get("targets", {}).get(name)
+        if base is None:
+            lines.append(f"{name}: not in baseline")
+            continue
+        for section, key, higher_is_better in COMPARED:
+            now = result[section][key] if section else result[key]
+            then = base[section][key] if section else base[key]
+            change = (now - then) / then if then else 0.0
+            worse = -change if higher_is_better else change
+            label = f"{section}.{key}" if section else key
+            flag = "REGRESSION" if worse > tolerance else "ok"
+            lines.append(f"{name} {label}: {then} -> {now} ({change:+.1%}) {flag}")
+    return lines
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark URLA extraction on a synthetic corpus.")
+    parser.add_argument("-n", "--count", type=int, default=20, help="number of synthetic documents")
+    parser.add_argument("--seed", type=int, default=1003)
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the corpus per target")
+    parser.add_argument("--corpus-dir", help="where to write the corpus (default: a temporary directory)")
+    parser.add_argument("--target", action="append", choices=TARGETS, help="target to run (default: all)")
+    parser.add_argument("--save", help="write the results to this JSON baseline file")
+    parser.add_argument("--compare", help="compare the results against this JSON baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative slowdown before a metric counts as a regression (default 0.2)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.corpus_dir or tmp
+        paths = generate_corpus(corpus_dir, args.count, args.seed)
+        targets = run_benchmarks(paths, args.target or TARGETS, args.repeat)
+
+    report = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                       "processor": platform.processor(), "seed": args.seed, "count": args.count,
+                       "repeat": args.repeat, "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+              "targets": targets}
+    print(json.dumps(report, indent=4))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=4)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        lines = compare(report, baseline, args.tolerance)
+        print("\n".join(lines), file=sys.stderr)
+        if any(line.endswith("REGRESSION") for line in lines):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
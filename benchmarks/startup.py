@@ -0,0 +1,82 @@
+# benchmarks/startup.py
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from src.client import request
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_PDF = os.path.join(PROJECT_ROOT, "Data", "URLA.pdf")
+
+# Interpreter start + import of each entry point; "eager" is what every
+# invocation paid before the PDF stack and the data models became lazy.
+IMPORTS = {
+    "bare_interpreter": "pass",
+    "eager_pdf_stack": "import pdfplumber, src.data_models, src.mapper, src.main",
+    "src.main": "import src.main",
+    "src.client": "import src.client",
+}
+
+def _time_command(cmd: List[str], repeat: int) -> Dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(cmd, cwd=PROJECT_ROOT, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - started)
+    return {"median": round(statistics.median(times), 4), "min": round(min(times), 4)}
+
+def _wait_for_daemon(socket_path: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            request({"op": "ping"}, socket_path, timeout=1)
+            return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+def run(pdf_path: str = SAMPLE_PDF, repeat: int = 5) -> dict:
+    """
+    Wall times of fresh interpreter processes: importing each entry point,
+    then extracting pdf_path with a cold in-process run versus the client
+    talking to a warm daemon (with a result cache, so the daemon's work is
+    a lookup and startup cost dominates).
+    """
+    results = {"imports": {name: _time_command([sys.executable, "-c", code], repeat) for name, code in IMPORTS.items()}}
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path, cache_dir = os.path.join(tmp, "daemon.sock"), os.path.join(tmp, "cache")
+        daemon = subprocess.Popen([sys.executable, "-m", "src.daemon", "--socket", socket_path, "-w", "1",
+                                   "--cache-dir", cache_dir], cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL)
+        try:
+            _wait_for_daemon(socket_path)
+            client = [sys.executable, "-m", "src.client", pdf_path, "--socket", socket_path]
+            results["cold_cli"] = _time_command(client[:-2] + ["--socket", os.path.join(tmp, "none.sock")], repeat)
+            subprocess.run(client, cwd=PROJECT_ROOT, check=True, stdout=subprocess.DEVNULL)  # fill the cache
+            results["warm_daemon_client"] = _time_command(client, repeat)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure start-up and import times of the URLA entry points.")
+    parser.add_argument("--pdf", default=SAMPLE_PDF)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+    results = run(args.pdf, args.repeat)
+    print(json.dumps(results, indent=4))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=4)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
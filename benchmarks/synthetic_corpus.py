@@ -0,0 +1,181 @@
+# benchmarks/synthetic_corpus.py
+import argparse
+import os
+import random
+from typing import Dict, List, Optional
+
+# --- Minimal PDF writer ---
+# Text-only pages in the base-14 Helvetica font with WinAnsi encoding, so the
+# generator needs nothing beyond the standard library.
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+FONT_SIZE, LEADING, MARGIN = 8, 11, 36
+
+def _pdf_string(text: str) -> bytes:
+    raw = text.encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+def _page_stream(lines: List[str]) -> bytes:
+    parts = [b"BT", f"/F1 {FONT_SIZE} Tf {LEADING} TL {MARGIN} {PAGE_HEIGHT - MARGIN} Td".encode()]
+    for line in lines:
+        parts.append(_pdf_string(line) + b" Tj T*")
+    parts.append(b"ET")
+    return b"\n".join(parts)
+
+def write_pdf(pages: List[List[str]], path: str, fields: Optional[Dict[str, str]] = None) -> None:
+    """
+    Writes one PDF page per list of text lines. fields ({name: value}) are
+    added as filled-in AcroForm text fields (values only, no widgets drawn).
+    """
+    objects: List[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    page_ids = []
+    for lines in pages:
+        stream = _page_stream(lines)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>".encode())
+        page_ids.append(len(objects))
+    field_ids = []
+    for name, value in (fields or {}).items():
+        objects.append(b"<< /FT /Tx /T " + _pdf_string(name) + b" /V " + _pdf_string(value) + b" >>")
+        field_ids.append(len(objects))
+    acroform = f" /AcroForm << /Fields [{' '.join(f'{i} 0 R' for i in field_ids)}] >>" if field_ids else ""
+    objects[0] = f"<< /Type /Catalog /Pages 2 0 R{acroform} >>".encode()
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+# --- URLA-like content ---
+FIRST_NAMES = ["Thomas", "Maria", "Wei", "Aisha", "Carlos", "Emily", "Dmitri", "Priya"]
+LAST_NAMES = ["Masserman", "Lopez", "Chen", "Okafor", "Silva", "Novak", "Patel", "Brown"]
+EMPLOYERS = ["Google", "Amazon", "Acme", "Initech", "Globex", "Umbrella", "Hooli"]
+BANKS = ["Chase Bank", "Wells Fargo", "Charles Shwab", "Ally Bank", "Citi Bank"]
+URLA_FOOTER = ["Uniform Residential Loan Application", "Freddie Mac Form 65 • Fannie Mae Form 1003", "Effective 1/2021"]
+FILLER = ("The Borrower certifies that the information provided in this application is true and "
+          "correct as of the date set forth opposite the signature and acknowledges the terms below.")
+
+def _employment_block(rng: random.Random, header: str) -> List[str]:
+    return [
+        header,
+        "Gross Monthly Income",
+        f"Employer or Business Name {rng.choice(EMPLOYERS)} Phone ( {rng.randint(200, 999)} ) {rng.randint(100, 999)} – {rng.randint(1000, 9999)}",
+        f"Base $ {rng.randint(2000, 20000)} /month",
+        f"Street {rng.randint(1, 999)} Market St Unit # {rng.randint(1, 99)}",
+        f"Overtime $ {rng.randint(0, 2000)} /month",
+        f"City Springfield State NY ZIP {rng.randint(10000, 99999)} Country USA",
+        f"Bonus $ {rng.randint(0, 5000)} /month",
+        f"Position or Title {rng.choice(['Analyst', 'Manager', 'Engineer'])} Check if this statement applies: Commission $ {rng.randint(0, 3000)} /month",
+        "I am employed by a family member,",
+        f"Start Date {rng.randint(1, 12):02d} / {rng.randint(1, 28):02d} / {rng.randint(1995, 2024)} (mm/dd/yyyy) Military",
+        f"How long in this line of work? {rng.randint(0, 30)} Years {rng.randint(0, 11)} Months party to the transaction. Entitlements $ /month",
+        "Other $ /month",
+        "Owner or Self-Employed I have an ownership share of 25% or more. $ TOTAL $ 0.00 /month",
+    ]
+
+def make_document(rng: random.Random, asset_rows: int, employment_sections: int, filler_lines: int,
+                  extra_pages: int, leading_pages: Optional[int] = None) -> List[List[str]]:
+    """
+    Builds the pages of one URLA-like document from the layout of Data/URLA.pdf,
+    with extra_pages statement pages around it (leading_pages of them before
+    the form; half by default).
+    """
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    page1 = [
+        "Uniform Residential Loan Application",
+        "Section 1: Borrower Information.",
+        "This section asks about your personal information and your income.",
+        "1a. Personal Information",
+        f"Name (First, Middle, Last, Suffix) Social Security Number {rng.randint(100, 999)} – {rng.randint(10, 99)} – {rng.randint(1000, 9999)}",
+        "(or Individual Taxpayer Identification Number)",
+        f"{first}, {last}",
+        "Alternate Names – List any names by which you are known or any names Date of Birth Citizenship",
+        "under which credit was previously received (First, Middle, Last, Suffix) (mm/dd/yyyy) 4 U.S. Citizen",
+        f"T.A. {rng.randint(1, 12)} / {rng.randint(1, 28)} / {rng.randint(1950, 2000)} Permanent Resident Alien",
+        "Married Number Home Phone ( 248 ) 777 – 1234",
+        "Cell Phone ( 248 ) 222 – 1234",
+        "4 Unmarried",
+        "Work Phone ( 248 ) 333 – 1234 Ext. 211",
+        f"Reciprocal Beneficiary Relationship) Email {first.lower()}@example.com",
+        "Current Address",
+        f"Street {rng.randint(1, 999)} West {rng.randint(1, 99)}th St Unit # {rng.randint(1, 99)}",
+        f"City Jersey City State NJ ZIP {rng.randint(10000, 99999)} Country USA",
+        f"How Long at Current Address? {rng.randint(0, 20)} Years {rng.randint(0, 11)} Months Housing No primary housing expense 4 Own Rent ($ /month)",
+    ]
+    page1 += _employment_block(rng, "1b. Current Employment/Self-Employment and Income Does not apply")
+    page2: List[str] = []
+    for _ in range(max(0, employment_sections - 1)):
+        page2 += _employment_block(rng, "1c. IF APPLICABLE, Complete Information for Additional Employment/Self-Employment and Income Does not apply")
+    page2 += [
+        "1d. IF APPLICABLE, Complete Information for Previous Employment/Self-Employment and Income 4 Does not apply",
+        "1e. Income from Other Sources Does not apply",
+        f"Social Security $ {rng.randint(0, 4000)}",
+    ]
+    page3 = [
+        "Section 2: Financial Information — Assets and Liabilities.",
+        "2a. Assets – Bank Accounts, Retirement, and Other Accounts You Have",
+        "Account Type – use list above Financial Institution Account Number Cash or Market Value",
+    ]
+    for _ in range(asset_rows):
+        page3.append(f"{rng.choice(['Checking', 'Savings', 'Stocks'])} {rng.choice(BANKS)} "
+                     f"{rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(100000, 999999)} $ {rng.randint(100, 500000)}")
+    page3 += [
+        "2b. Other Assets and Credits You Have Does not apply",
+        f"Earnest Money $ {rng.randint(1000, 20000)}",
+    ]
+    page4 = [
+        "Section 4: Loan and Property Information.",
+        "4a. Loan and Property Information",
+        f"Loan Amount $ {rng.randint(100, 2000) * 1000} Loan Purpose 4 Purchase Refinance Other (specify)",
+    ]
+    # Split pages that overflow the printable height; every form page carries
+    # the URLA footer, as on the real form.
+    per_page = (PAGE_HEIGHT - 2 * MARGIN) // LEADING - len(URLA_FOOTER)
+    urla_pages = []
+    for page in (page1, page2, page3, page4):
+        page += [FILLER] * filler_lines
+        urla_pages += [page[i:i + per_page] + URLA_FOOTER for i in range(0, len(page), per_page)]
+    # Bank statements bundled around the form, as in a loan packet.
+    statements = [[f"Statement page {i + 1}"] + [FILLER] * 60 for i in range(extra_pages)]
+    before = leading_pages if leading_pages is not None else len(statements) // 2
+    return statements[:before] + urla_pages + statements[before:]
+
+def generate_corpus(out_dir: str, count: int = 20, seed: int = 1003,
+                    max_asset_rows: int = 12, max_employment_sections: int = 3,
+                    max_filler_lines: int = 40, max_extra_pages: int = 6) -> List[str]:
+    """
+    Writes count URLA-like PDFs to out_dir and returns their paths. The same
+    seed always produces the same corpus. Documents vary in asset rows,
+    employment sections, filler text density and appended statement pages.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        pages = make_document(rng, rng.randint(1, max_asset_rows), rng.randint(1, max_employment_sections),
+                              rng.randint(0, max_filler_lines), rng.randint(0, max_extra_pages))
+        path = os.path.join(out_dir, f"synthetic_urla_{i:04d}.pdf")
+        write_pdf(pages, path)
+        paths.append(path)
+    return paths
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic URLA-like PDF corpus.")
+    parser.add_argument("out_dir")
+    parser.add_argument("-n", "--count", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1003)
+    parser.add_argument("--extra-pages", type=int, default=6, help="most statement pages bundled with one form")
+    args = parser.parse_args(argv)
+    paths = generate_corpus(args.out_dir, args.count, args.seed, max_extra_pages=args.extra_pages)
+    print(f"Wrote {len(paths)} PDFs to {args.out_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# src/analytics.py
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.columnar import to_columns
+from src.data_models import URLAData
+
+try:
+    import numpy as np
+except ImportError:  # required here, but only once scoring is asked for
+    np = None
+
+INCOME_PARTS = ("base", "overtime", "bonus", "commission", "military_entitlements", "other")
+CURRENT_INCOME = "current_employment.gross_monthly_income"
+ADDITIONAL_INCOME = "additional_employment.gross_monthly_income"
+
+@dataclass
+class UnderwritingLimits:
+    """Thresholds of the ratio checks."""
+    max_dti: float = 0.43
+    max_ltv: float = 1.0
+    total_tolerance: float = 0.01  # allowed gap between income components and a stated total
+
+@dataclass
+class PortfolioScores:
+    """
+    Output of score(): one float64 array per ratio or sum (NaN where an input
+    is missing) and one boolean array per check (True = violated), all
+    aligned with the input records.
+    """
+    metrics: Dict[str, Any]
+    violations: Dict[str, Any]
+    count: int = 0
+    limits: UnderwritingLimits = field(default_factory=UnderwritingLimits)
+
+    def flagged(self) -> Any:
+        """Indexes of the records violating at least one check."""
+        if not self.violations:
+            return np.zeros(0, dtype=np.intp)
+        return np.flatnonzero(np.logical_or.reduce(list(self.violations.values())))
+
+    def summary(self) -> Dict[str, int]:
+        return {"records": self.count, "flagged": int(len(self.flagged())),
+                **{name: int(mask.sum()) for name, mask in self.violations.items()}}
+
+    def records(self) -> Iterator[dict]:
+        """Per-record dicts of the metrics (None for NaN) and the names of the violated checks."""
+        names = list(self.violations)
+        # One boolean matrix (records x checks) instead of a mask lookup per record and check.
+        matrix = np.column_stack([self.violations[n] for n in names]) if names else np.zeros((self.count, 0), bool)
+        metric_rows = zip(*(np.where(np.isnan(v), None, np.round(v, 6)).tolist() for v in self.metrics.values()))
+        for row, flags in zip(metric_rows, matrix.tolist()):
+            yield {**dict(zip(self.metrics, row)), "violations": [n for n, hit in zip(names, flags) if hit]}
+
+def _nansum(*arrays: Any) -> Any:
+    """Element-wise sum treating NaN as 0, but NaN where every input is NaN."""
+    stacked = np.vstack(arrays)
+    total = np.nansum(stacked, axis=0)
+    total[np.isnan(stacked).all(axis=0)] = np.nan
+    return total
+
+def _ratio(numerator: Any, denominator: Any) -> Any:
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=(denominator > 0) & ~np.isnan(numerator))
+    return out
+
+def _all_borrowers(c: Dict[str, Any], column: str) -> Any:
+    """A list sum column (e.g. "other_income_sources.monthly_income.sum") over the borrower and the additional borrowers."""
+    return _nansum(c[f"borrower.{column}"], c[f"additional_borrowers.{column}"])
+
+def score(records: Iterable[URLAData], limits: Optional[UnderwritingLimits] = None) -> PortfolioScores:
+    """
+    Computes underwriting ratios and consistency checks for a batch of
+    URLAData objects in one vectorized pass over their columns
+    (src/columnar.py), instead of walking each application in Python.
+
+    Metrics, over the borrower and the additional borrowers together:
+    employment_income (current plus additional employment), other_income,
+    total_monthly_income, total_assets (bank/retirement accounts plus other
+    assets and credits), monthly_debt (liabilities, other expenses, the
+    mortgages on real estate owned and other new mortgages; debts marked
+    as paid off at closing are left out), dti and ltv (NaN when
+    property_value is missing). Checks: the borrower's employment income
+    components not adding up to a stated total, DTI or LTV above limits,
+    missing loan amount or income, and assets not covering the difference
+    between property value and loan amount.
+    """
+    if np is None:
+        raise ImportError("src.analytics needs numpy (pip install numpy)")
+    limits = limits or UnderwritingLimits()
+    c = to_columns(records, URLAData, as_numpy=True)
+    count = len(c["loan.loan_amount"])
+
+    current_parts = _nansum(*(c[f"borrower.{CURRENT_INCOME}.{part}"] for part in INCOME_PARTS))
+    additional_parts = _nansum(*(c[f"borrower.{ADDITIONAL_INCOME}.{part}.sum"] for part in INCOME_PARTS))
+    co_borrower_parts = _nansum(*(c[f"additional_borrowers.{employment}.{part}.sum"]
+                                  for employment in (CURRENT_INCOME, ADDITIONAL_INCOME) for part in INCOME_PARTS))
+    employment_income = _nansum(current_parts, additional_parts, co_borrower_parts)
+    other_income = _all_borrowers(c, "other_income_sources.monthly_income.sum")
+    total_income = _nansum(employment_income, other_income)
+    total_assets = _nansum(_all_borrowers(c, "assets_bank_retirement_other.cash_or_market_value.sum"),
+                           _all_borrowers(c, "assets_other_assets_credits.cash_or_market_value.sum"))
+    monthly_debt = _nansum(_all_borrowers(c, "liabilities_credit_cards_debts_leases.monthly_payment.sum_after_closing"),
+                           _all_borrowers(c, "liabilities_other_liabilities_expenses.monthly_payment.sum"),
+                           _all_borrowers(c, "real_estate_owned.mortgage_loans.monthly_mortgage_payment.sum_after_closing"),
+                           c["loan.other_new_mortgage_loans.monthly_payment.sum"])
+    loan_amount, property_value = c["loan.loan_amount"], c["loan.property_value"]
+    dti = _ratio(np.nan_to_num(monthly_debt), total_income)
+    ltv = _ratio(loan_amount, property_value)
+
+    current_total = c[f"borrower.{CURRENT_INCOME}.total"]
+    additional_total = c[f"borrower.{ADDITIONAL_INCOME}.total.sum"]
+    # NaN comparisons are False, so a check only fires when its inputs are present.
+    with np.errstate(invalid="ignore"):
+        violations = {
+            "employment_total_mismatch": (np.abs(current_parts - current_total) > limits.total_tolerance)
+                                         | (np.abs(additional_parts - additional_total) > limits.total_tolerance),
+            "dti_above_limit": dti > limits.max_dti,
+            "ltv_above_limit": ltv > limits.max_ltv,
+            "missing_loan_amount": np.isnan(loan_amount),
+            "missing_income": ~(total_income > 0),
+            "insufficient_funds_to_close": (property_value - loan_amount) > np.nan_to_num(total_assets),
+        }
+    metrics = {"employment_income": employment_income, "other_income": other_income,
+               "total_monthly_income": total_income, "total_assets": total_assets,
+               "monthly_debt": monthly_debt, "dti": dti, "ltv": ltv}
+    return PortfolioScores(metrics, violations, count, limits)
+
+def _read_batch_records(path: str) -> Iterator[dict]:
+    """Yields the ok records of a batch runner output file (NDJSON or a JSON array)."""
+    from src.mapper import from_dict
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.read(1)
+        f.seek(0)
+        records = json.load(f) if first == "[" else (json.loads(line) for line in f if line.strip())
+        for record in records:
+            if record.get("status", "ok") == "ok":
+                yield {**record, "model": from_dict(URLAData, record["data"])}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Score batch results: DTI, LTV, asset/income totals and consistency checks.")
+    parser.add_argument("results", help="NDJSON or JSON output of src.batch")
+    parser.add_argument("-o", "--output", default="-", help="Output NDJSON file ('-' for stdout)")
+    parser.add_argument("--max-dti", type=float, default=UnderwritingLimits.max_dti)
+    parser.add_argument("--max-ltv", type=float, default=UnderwritingLimits.max_ltv)
+    parser.add_argument("--flagged-only", action="store_true", help="Only write records violating a check")
+    args = parser.parse_args(argv)
+
+    from src.output import open_sink
+    records = list(_read_batch_records(args.results))
+    scores = score((r["model"] for r in records), UnderwritingLimits(args.max_dti, args.max_ltv))
+    with open_sink(args.output, "ndjson") as sink:
+        for record, scored in zip(records, scores.records()):
+            if args.flagged_only and not scored["violations"]:
+                continue
+            sink.write({"source": record.get("source"), "sha256": record.get("sha256"), **scored})
+    print(json.dumps(scores.summary()), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
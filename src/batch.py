@@ -0,0 +1,235 @@
+# src/batch.py
+import argparse
+import glob
+import os
+import sys
+import time
+from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, List, Optional
+
+from src.cache import ResultCache
+from src.diagnostics import DiagnosticsRollup, DocumentDiagnostics, write_manifest
+from src.main import extract_urla_record
+from src.metrics import DocumentMetrics
+from src.output import REDACTION_MODES, RecordSink, Redactor, open_sink
+from src.pdf_parser import ENGINES, resolve_sections
+from src.shards import JournalSink, ShardJournal, end_torn_line, parse_shard, select_shard
+
+def collect_input_files(source: str) -> List[str]:
+    """
+    Resolves a batch source into a list of PDF paths. The source can be a
+    directory (searched recursively for *.pdf), a glob pattern, or a manifest
+    file listing one PDF path per line (blank lines and '#' comments are skipped,
+    relative paths are resolved against the manifest's directory).
+    """
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "**", "*.pdf")
+        return sorted(glob.glob(pattern, recursive=True))
+
+    if os.path.isfile(source) and not source.lower().endswith(".pdf"):
+        base_dir = os.path.dirname(os.path.abspath(source))
+        paths = []
+        with open(source, "r", encoding="utf-8") as manifest:
+            for line in manifest:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                paths.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+        return paths
+
+    return sorted(glob.glob(source, recursive=True))
+
+@dataclass
+class BatchOptions:
+    """Per-file settings shared by every worker of a batch."""
+    cache: Optional[ResultCache] = None
+    sections: Optional[List[str]] = None
+    metrics: bool = False
+    profile: bool = False
+    stream: bool = False
+    page_workers: int = 1
+    engine: str = "text"
+    diagnostics: bool = False
+
+def process_file(pdf_path: str, options: Optional[BatchOptions] = None) -> dict:
+    """
+    Extracts and populates a single PDF and returns an NDJSON-ready record.
+    Any failure is captured in the record so one bad file never stops a batch.
+    With options.metrics (or profile) the record carries a "metrics" entry,
+    with options.diagnostics a "diagnostics" entry (src/diagnostics.py).
+    """
+    options = options or BatchOptions()
+    metrics = DocumentMetrics(profile=options.profile) if options.metrics or options.profile else None
+    diagnostics = DocumentDiagnostics() if options.diagnostics else None
+    started = time.perf_counter()
+    try:
+        record = {"source": pdf_path, "status": "ok",
+                  **extract_urla_record(pdf_path, options.cache, options.sections, metrics,
+                                       options.stream, options.page_workers, options.engine, diagnostics)}
+    except Exception as e:
+        record = {"source": pdf_path, "status": "error", "error": f"{type(e).__name__}: {e}"}
+    record["elapsed_seconds"] = round(time.perf_counter() - started, 4)
+    if metrics is not None:
+        record["metrics"] = metrics.as_dict()
+    if diagnostics is not None:
+        record["diagnostics"] = diagnostics.as_dict()
+    return record
+
+def _run_pool(paths: List[str], workers: int, options: BatchOptions) -> Iterator[dict]:
+    """
+    Yields records as workers finish them. At most workers * 2 files are in
+    flight at once so huge batches do not queue thousands of futures up front.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        remaining = iter(paths)
+        for path in remaining:
+            pending.add(executor.submit(process_file, path, options))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in wait(pending).done:
+            yield future.result()
+
+def run_batch(paths: Iterable[str], sink: RecordSink, workers: Optional[int] = None,
+              options: Optional[BatchOptions] = None, rollup: Optional[DiagnosticsRollup] = None) -> dict:
+    """
+    Processes every PDF in paths across a process pool and writes each record
+    to sink as soon as it is finished. Returns a summary with ok/error counts.
+    With workers=1 the files are processed inline, without a pool. Pass a
+    DiagnosticsRollup to collect the records' field diagnostics.
+    """
+    paths = list(paths)
+    options = options or BatchOptions()
+    workers = workers or os.cpu_count() or 1
+    summary = {"total": len(paths), "ok": 0, "error": 0}
+    started = time.perf_counter()
+    output_seconds = 0.0
+
+    if workers == 1:
+        records = (process_file(p, options) for p in paths)
+    else:
+        records = _run_pool(paths, workers, options)
+    for record in records:
+        summary[record["status"]] += 1
+        if rollup is not None:
+            rollup.add(record)
+        output_started = time.perf_counter()
+        sink.write(record)
+        output_seconds += time.perf_counter() - output_started
+
+    sink.flush()
+    summary["elapsed_seconds"] = round(time.perf_counter() - started, 4)
+    if options.metrics or options.profile:
+        summary["output_seconds"] = round(output_seconds, 4)
+    return summary
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Extract URLA data from many PDFs into NDJSON or JSON.")
+    parser.add_argument("source", help="Directory, glob pattern or manifest file of PDF paths")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    parser.add_argument("--format", choices=["ndjson", "json", "sqlite"], default="ndjson",
+                        help="Output format (default: ndjson); sqlite writes an indexed result store (src/store.py) to -o, "
+                             "personal data in clear text")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir", default=None, help="Enable the content-hash result cache in this directory")
+    parser.add_argument("--cache-max-mb", type=int, default=512, help="Evict least recently used cache entries above this size")
+    parser.add_argument("--refresh-cache", action="store_true", help="Bypass cache lookups but store fresh results")
+    parser.add_argument("--sections", default=None, help="Comma-separated URLA sections to extract, e.g. 1,4 (default: all)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Find the URLA inside large loan packets and read it page by page (bounded memory)")
+    parser.add_argument("--page-workers", type=int, default=1,
+                        help="Extract the pages of each document across N processes; documents then run one at a time")
+    parser.add_argument("--engine", choices=list(ENGINES), default="text",
+                        help="geometry: read the template fields of sections 1a-1c and 4a from word positions")
+    parser.add_argument("--metrics", action="store_true", help="Add per-stage timing metrics to every record")
+    parser.add_argument("--profile", action="store_true", help="Also run each file under cProfile and tracemalloc")
+    parser.add_argument("--diagnostics", action="store_true",
+                        help="Add a field-level diagnostics report to every record (bypasses cached results)")
+    parser.add_argument("--reprocess", metavar="MANIFEST",
+                        help="Write the documents with failed or unexpectedly missed fields as a manifest to "
+                             "rerun (implies --diagnostics)")
+    parser.add_argument("--shard", metavar="I/N", default=None,
+                        help="Process only shard I of N of the source (assigned by path, so nodes can split a shared "
+                             "manifest); merge the outputs with src.shards")
+    parser.add_argument("--journal", metavar="PATH", default=None,
+                        help="Checkpoint journal of finished documents: a rerun skips them and appends to the output")
+    parser.add_argument("--redact", choices=list(REDACTION_MODES), default=None,
+                        help="Redact SSNs, account numbers, phones and emails in the output: mask them, or hash "
+                             "them with the key in $URLA_REDACT_KEY")
+    args = parser.parse_args(argv)
+    sections = args.sections.split(",") if args.sections else None
+    try:
+        resolve_sections(sections)
+        shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    cache = None
+    if args.cache_dir:
+        cache = ResultCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024, bypass=args.refresh_cache)
+
+    if args.format == "sqlite" and args.output == "-":
+        print("Error: --format sqlite needs an output file (-o results.db)", file=sys.stderr)
+        return 1
+    if args.journal and (args.format == "json" or args.output == "-"):
+        print("Error: --journal needs an ndjson or sqlite output file to resume into", file=sys.stderr)
+        return 1
+    redactor = None
+    if args.redact:
+        if args.format == "sqlite":
+            print("Error: --redact writes ndjson or json; the sqlite store indexes the clear values", file=sys.stderr)
+            return 1
+        try:
+            redactor = Redactor(args.redact, os.environ.get("URLA_REDACT_KEY", "").encode("utf-8"))
+        except ValueError as e:
+            print(f"Error: {e} (set URLA_REDACT_KEY)", file=sys.stderr)
+            return 1
+
+    paths = collect_input_files(args.source)
+    if not paths:
+        print(f"Error: no PDF files found for '{args.source}'", file=sys.stderr)
+        return 1
+    if shard is not None:
+        paths = select_shard(paths, *shard)
+    journal = ShardJournal(args.journal) if args.journal else None
+    if journal is not None:
+        remaining = journal.remaining(paths)
+        if len(remaining) < len(paths):
+            print(f"Skipping {len(paths) - len(remaining)} document(s) already in {args.journal}", file=sys.stderr)
+        paths = remaining
+
+    options = BatchOptions(cache=cache, sections=sections, metrics=args.metrics, profile=args.profile,
+                           stream=args.stream, page_workers=args.page_workers, engine=args.engine,
+                           diagnostics=args.diagnostics or bool(args.reprocess))
+    # Page-level workers replace file-level ones rather than nesting pools.
+    workers = 1 if args.page_workers > 1 else args.workers
+    rollup = DiagnosticsRollup() if options.diagnostics else None
+    append = journal is not None and args.format == "ndjson"
+    if append:
+        end_torn_line(args.output)
+    sink_options = {"append": True} if append else {}
+    if redactor is not None:
+        sink_options["redactor"] = redactor
+    sink = open_sink(args.output, args.format, **sink_options)
+    if journal is not None:
+        sink = JournalSink(sink, journal)
+    with sink:
+        summary = run_batch(paths, sink, workers, options, rollup)
+
+    print(f"Processed {summary['total']} file(s): {summary['ok']} ok, {summary['error']} failed "
+          f"in {summary['elapsed_seconds']}s", file=sys.stderr)
+    if "output_seconds" in summary:
+        print(f"Output writing took {summary['output_seconds']}s", file=sys.stderr)
+    if rollup is not None:
+        reprocess = rollup.to_reprocess()
+        print(f"{len(reprocess)} document(s) with failed or unexpectedly missed fields", file=sys.stderr)
+        if args.reprocess:
+            write_manifest(args.reprocess, reprocess)
+    return 0 if summary["error"] == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
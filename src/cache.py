@@ -0,0 +1,128 @@
+# src/cache.py
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.environ.get("URLA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "urla"))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Eviction trims the cache to this share of its limits, so it runs once per
+# that much new data rather than on every put at the limit.
+LOW_WATER = 0.9
+
+# [size, count] per cache directory, kept per process rather than on the
+# ResultCache: the batch runner pickles its cache into every pool task, and
+# the directory is then scanned once per worker process, not once per task.
+_USAGE: Dict[str, List[int]] = {}
+
+def document_hash(pdf_bytes: bytes) -> str:
+    """SHA-256 of the raw PDF bytes, used as the cache key for a document."""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+class ResultCache:
+    """
+    On-disk cache of parsed URLA documents, keyed by the SHA-256 of the PDF bytes
+    plus a version tag. Two kinds of entries are stored per document:
+    "text" (the extracted page text, keyed by the text extraction version) and
+    "result" (the final URLAData dict, keyed by the parser version), so a parser
+    change re-runs only the regex phase, not the pdfplumber layout pass.
+
+    Entries are evicted least-recently-used first (by file mtime, refreshed on
+    every hit) once the cache grows past max_bytes or max_entries, down to
+    LOW_WATER of those limits. Each process counts its own writes on top of
+    one scan of the directory; evict() rescans, so the writes of other
+    processes are picked up at the latest then.
+    With bypass=True lookups always miss but fresh results are still written,
+    which refreshes stale entries.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_entries: Optional[int] = None, bypass: bool = False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.bypass = bypass
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, doc_hash: str, kind: str, version: str) -> str:
+        return os.path.join(self.cache_dir, doc_hash[:2], f"{doc_hash}-{kind}-{version}.json")
+
+    def get(self, doc_hash: str, kind: str, version: str) -> Optional[Any]:
+        """Returns the cached value or None on a miss (or when bypassing)."""
+        if self.bypass:
+            return None
+        path = self._path(doc_hash, kind, version)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return value
+
+    def put(self, doc_hash: str, kind: str, version: str, value: Any) -> None:
+        """Stores value atomically, so concurrent workers never see partial files."""
+        path = self._path(doc_hash, kind, version)
+        usage = self._usage()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        existing = os.path.getsize(path) if os.path.exists(path) else None
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f, separators=(",", ":"))
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+
+        usage[0] += size - (existing or 0)
+        usage[1] += 0 if existing is not None else 1
+        if usage[0] > self.max_bytes or (self.max_entries is not None and usage[1] > self.max_entries):
+            self.evict()
+
+    def _usage(self) -> List[int]:
+        """This process's [size, count] of the directory, scanned on its first use."""
+        key = os.path.abspath(self.cache_dir)
+        usage = _USAGE.get(key)
+        if usage is None:
+            entries = self._entries()
+            usage = _USAGE[key] = [sum(size for _, size, _ in entries), len(entries)]
+        return usage
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache is within LOW_WATER of its limits."""
+        entries = sorted(self._entries())
+        size = sum(s for _, s, _ in entries)
+        count = len(entries)
+        max_bytes = int(self.max_bytes * LOW_WATER)
+        max_entries = None if self.max_entries is None else int(self.max_entries * LOW_WATER)
+        for _, entry_size, path in entries:
+            if size <= max_bytes and (max_entries is None or count <= max_entries):
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+            count -= 1
+        _USAGE[os.path.abspath(self.cache_dir)] = [size, count]
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        _USAGE[os.path.abspath(self.cache_dir)] = [0, 0]
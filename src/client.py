@@ -0,0 +1,75 @@
+# src/client.py
+# Kept to the standard library on purpose: starting this client must not pay
+# for pdfplumber or the data models, which the warm daemon has loaded already.
+import argparse
+import json
+import os
+import socket
+import sys
+from typing import List, Optional
+
+DEFAULT_SOCKET = os.environ.get("URLA_DAEMON_SOCKET", f"/tmp/urla-daemon-{os.getuid()}.sock")
+
+class DaemonUnavailable(Exception):
+    """No warm worker daemon is listening on the socket."""
+
+def request(payload: dict, socket_path: str = DEFAULT_SOCKET, timeout: Optional[float] = None) -> dict:
+    """Sends one JSON request line to the daemon and returns its JSON reply."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise DaemonUnavailable(f"no daemon at {socket_path}") from e
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        chunks = []
+        while not chunks or not chunks[-1].endswith(b"\n"):
+            chunk = sock.recv(1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        sock.close()
+    return json.loads(b"".join(chunks))
+
+def extract(pdf_path: str, socket_path: str = DEFAULT_SOCKET, sections: Optional[List[str]] = None,
+            stream: bool = False, fallback: bool = True, timeout: Optional[float] = None) -> dict:
+    """
+    Extracts one PDF through the warm worker daemon and returns the batch
+    runner's record for it. When no daemon is running and fallback is set,
+    the PDF is processed in this process instead (paying the cold imports).
+    """
+    payload = {"pdf": os.path.abspath(pdf_path), "sections": sections, "stream": stream}
+    try:
+        return request(payload, socket_path, timeout)
+    except DaemonUnavailable:
+        if not fallback:
+            raise
+    from src.batch import BatchOptions, process_file
+    return process_file(payload["pdf"], BatchOptions(sections=sections, stream=stream))
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Extract URLA PDFs through the warm worker daemon (src/daemon.py).")
+    parser.add_argument("pdfs", nargs="+", help="PDF files to extract")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket of the daemon")
+    parser.add_argument("--sections", default=None, help="Comma-separated URLA sections to extract, e.g. 1,4 (default: all)")
+    parser.add_argument("--stream", action="store_true", help="Find the URLA inside large loan packets")
+    parser.add_argument("--no-fallback", action="store_true", help="Fail instead of extracting in-process without a daemon")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds to wait for each reply")
+    args = parser.parse_args(argv)
+    sections = args.sections.split(",") if args.sections else None
+
+    failed = 0
+    for pdf_path in args.pdfs:
+        try:
+            record = extract(pdf_path, args.socket, sections, args.stream, not args.no_fallback, args.timeout)
+        except DaemonUnavailable as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        failed += record.get("status") != "ok"
+        sys.stdout.write(json.dumps(record) + "\n")
+    return 0 if failed == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# src/columnar.py
+import dataclasses
+import math
+import operator
+import typing
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from src.data_models import URLAData
+
+try:
+    import numpy as np
+except ImportError:  # optional: columns stay array('d') / list without it
+    np = None
+
+_NUMERIC = (int, float, bool)
+
+def _unwrap(hint: Any) -> Any:
+    if typing.get_origin(hint) is Union:
+        inner = [a for a in typing.get_args(hint) if a is not type(None)]
+        if len(inner) == 1:
+            return inner[0]
+    return hint
+
+def _sum_attr(items: list, get: Callable[[Any], Any]) -> float:
+    total, seen = 0.0, False
+    for item in items:
+        value = get(item)
+        # None, or NaN from a nested list without values.
+        if value is not None and value == value:
+            total += value
+            seen = True
+    return total if seen else math.nan
+
+def _paid_off_flag(cls: type) -> Optional[str]:
+    """Name of the field of cls marking an item as paid off at closing (metadata "paid_off"), if any."""
+    return next((f.name for f in dataclasses.fields(cls) if f.metadata.get("paid_off")), None)
+
+def _list_sum(get_list: Callable[[Any], list], get_item: Callable[[Any], Any],
+              skip: Optional[str] = None) -> Callable[[Any], float]:
+    if skip is None:
+        return lambda r: _sum_attr(get_list(r), get_item)
+    is_skipped = operator.attrgetter(skip)
+    return lambda r: _sum_attr([item for item in get_list(r) if not is_skipped(item)], get_item)
+
+def _list_count(get_list: Callable[[Any], list]) -> Callable[[Any], int]:
+    return lambda r: len(get_list(r))
+
+def _compose(outer: Callable[[Any], Any], inner: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda r: inner(outer(r))
+
+def _getter(path: str, get: Optional[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    return get or operator.attrgetter(path)
+
+def _amounts(cls: type, after_closing: bool = False) -> List[Tuple[str, Optional[Callable[[Any], Any]], bool]]:
+    """
+    (dotted path, getter, filtered?) for the amount fields of cls (the
+    float-typed ones), including those of nested dataclasses and, summed
+    over the items, of nested lists of dataclasses (e.g. a property's
+    "mortgage_loans.monthly_mortgage_payment"). Counts, durations and flags
+    are int or bool and have no meaningful sum. The getter is None for plain
+    attribute paths, which are read with one attrgetter. With after_closing,
+    nested list items marked paid off at closing are left out, and filtered
+    tells whether such a list lies on the path.
+    """
+    amounts = []
+    hints = typing.get_type_hints(cls)
+    for f in dataclasses.fields(cls):
+        hint = _unwrap(hints[f.name])
+        item = (typing.get_args(hint) or (Any,))[0] if typing.get_origin(hint) is list else None
+        if dataclasses.is_dataclass(hint):
+            get = operator.attrgetter(f.name)
+            amounts += [(f"{f.name}.{path}", get_inner and _compose(get, get_inner), filtered)
+                        for path, get_inner, filtered in _amounts(hint, after_closing)]
+        elif dataclasses.is_dataclass(item):
+            skip = _paid_off_flag(item) if after_closing else None
+            amounts += [(f"{f.name}.{path}", _list_sum(operator.attrgetter(f.name), _getter(path, get_inner), skip),
+                         filtered or skip is not None)
+                        for path, get_inner, filtered in _amounts(item, after_closing)]
+        elif hint is float:
+            amounts.append((f.name, None, False))
+    return amounts
+
+def _plan(cls: type, prefix: str = "") -> List[Tuple[str, Callable[[Any], Any], bool]]:
+    """
+    (column name, getter, numeric?) for every leaf field of cls; each getter
+    takes the top-level record. Scalar fields give one column (an
+    attrgetter over the dotted path); lists of dataclasses give a ".count"
+    column plus a ".sum" column per amount item field (nested ones
+    included, e.g. "gross_monthly_income.base.sum" or
+    "mortgage_loans.monthly_mortgage_payment.sum"), and a
+    ".sum_after_closing" column leaving out the items paid off at closing
+    wherever such items are summed. Dict-valued fields are not exported.
+    """
+    columns = []
+    hints = typing.get_type_hints(cls)
+    for f in dataclasses.fields(cls):
+        hint = _unwrap(hints[f.name])
+        name = f"{prefix}{f.name}"
+        if dataclasses.is_dataclass(hint):
+            columns += _plan(hint, f"{name}.")
+        elif typing.get_origin(hint) is list:
+            item = (typing.get_args(hint) or (Any,))[0]
+            get_list = operator.attrgetter(name)
+            columns.append((f"{name}.count", _list_count(get_list), True))
+            if dataclasses.is_dataclass(item):
+                for path, get_item, _ in _amounts(item):
+                    columns.append((f"{name}.{path}.sum", _list_sum(get_list, _getter(path, get_item)), True))
+                skip = _paid_off_flag(item)
+                for path, get_item, filtered in _amounts(item, after_closing=True):
+                    if filtered or skip is not None:
+                        columns.append((f"{name}.{path}.sum_after_closing",
+                                        _list_sum(get_list, _getter(path, get_item), skip), True))
+        elif typing.get_origin(hint) is dict:
+            continue
+        else:
+            columns.append((name, operator.attrgetter(name), hint in _NUMERIC))
+    return columns
+
+_ROW_FUNCTIONS: Dict[type, Tuple[List[str], List[bool], Callable[[Any], tuple]]] = {}
+
+def _row_function(cls: type) -> Tuple[List[str], List[bool], Callable[[Any], tuple]]:
+    """Builds (once per class) a function returning all leaf values of a record as a tuple."""
+    if cls not in _ROW_FUNCTIONS:
+        plan = _plan(cls)
+        getters = tuple(getter for _, getter, _ in plan)
+
+        def row(r: Any) -> tuple:
+            return tuple([getter(r) for getter in getters])
+
+        _ROW_FUNCTIONS[cls] = ([name for name, _, _ in plan], [numeric for _, _, numeric in plan], row)
+    return _ROW_FUNCTIONS[cls]
+
+def column_names(cls: type = URLAData) -> List[str]:
+    """Names of the columns to_columns() produces for cls."""
+    return list(_row_function(cls)[0])
+
+def to_columns(records: Iterable[Any], cls: type = URLAData, as_numpy: bool = True) -> Dict[str, Any]:
+    """
+    Flattens a collection of URLAData objects into one column per leaf field,
+    e.g. "loan.loan_amount", "borrower.current_employment.gross_monthly_income.base"
+    or "borrower.assets_bank_retirement_other.cash_or_market_value.sum".
+    Numeric columns are float64 with NaN for missing values (numpy arrays when
+    numpy is installed and as_numpy is set, array('d') otherwise); text columns
+    are lists with None for missing values.
+    """
+    names, numeric, row = _row_function(cls)
+    rows = [row(r) for r in records]
+    # Transpose rows into columns in one C-level pass.
+    values_by_column = list(zip(*rows)) if rows else [() for _ in names]
+    columns: Dict[str, Any] = {}
+    for name, is_numeric, values in zip(names, numeric, values_by_column):
+        if not is_numeric:
+            columns[name] = list(values)
+        elif as_numpy and np is not None:
+            # numpy turns None into NaN for float arrays.
+            columns[name] = np.array(values, dtype=np.float64)
+        else:
+            columns[name] = array("d", (math.nan if v is None else float(v) for v in values))
+    return columns
@@ -0,0 +1,121 @@
+# src/daemon.py
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Optional
+
+from src.batch import BatchOptions, process_file
+from src.cache import ResultCache
+from src.client import DEFAULT_SOCKET, DaemonUnavailable, request
+from src.pdf_parser import resolve_sections
+
+def preload() -> None:
+    """
+    Imports the PDF stack and the data models and builds the per-class
+    mapper/serializer plans, so no request pays for them.
+    """
+    from src.data_models import URLAData
+    from src.mapper import get_builder
+    from src.output import get_serializer
+    from src.pdf_parser import _pdfplumber
+    _pdfplumber()
+    get_builder(URLAData)
+    get_serializer(URLAData)
+
+def _warm_up() -> int:
+    preload()
+    return os.getpid()
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        daemon: "WarmWorkerDaemon" = self.server.owner  # type: ignore[attr-defined]
+        line = self.rfile.readline()
+        try:
+            reply = daemon.handle(json.loads(line))
+        except Exception as e:
+            reply = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class WarmWorkerDaemon:
+    """
+    Long-lived process keeping the heavy modules loaded for short-lived
+    callers (cron jobs, serverless handlers, src/client.py). Modules are
+    preloaded before the worker pool forks, so workers start warm too.
+    Requests are one JSON line per connection over a Unix socket:
+    {"pdf": path, "sections": [...], "stream": bool} is answered with the
+    batch runner's record for that file, {"op": "ping"} with the daemon's pid.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, workers: Optional[int] = None,
+                 cache: Optional[ResultCache] = None):
+        self.socket_path = socket_path
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        preload()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        wait([self._executor.submit(_warm_up) for _ in range(self.workers)])
+
+    def handle(self, payload: dict) -> dict:
+        if payload.get("op") == "ping":
+            return {"status": "ok", "pid": os.getpid(), "workers": self.workers}
+        sections = payload.get("sections")
+        resolve_sections(sections)
+        options = BatchOptions(cache=self.cache, sections=sections, stream=bool(payload.get("stream")))
+        return self._executor.submit(process_file, payload["pdf"], options).result()
+
+    def _claim_socket(self) -> None:
+        """Removes a stale socket file; refuses to start next to a live daemon."""
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            request({"op": "ping"}, self.socket_path, timeout=2)
+        except (DaemonUnavailable, OSError, ValueError):
+            os.unlink(self.socket_path)
+            return
+        raise RuntimeError(f"a daemon is already listening on {self.socket_path}")
+
+    def serve_forever(self) -> None:
+        self._claim_socket()
+        self.start()
+        server = _Server(self.socket_path, _Handler)
+        server.owner = self  # type: ignore[attr-defined]
+        print(f"URLA worker daemon listening on {self.socket_path} ({self.workers} warm workers)", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            os.unlink(self.socket_path)
+            self._executor.shutdown(cancel_futures=True)
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the warm URLA worker daemon on a Unix socket.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket to listen on")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir", default=None, help="Enable the content-hash result cache in this directory")
+    parser.add_argument("--cache-max-mb", type=int, default=512, help="Evict least recently used cache entries above this size")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024) if args.cache_dir else None
+    # Unwind through serve_forever's cleanup (socket file, pool) on SIGTERM too.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        WarmWorkerDaemon(args.socket, args.workers, cache).serve_forever()
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,32 +2,37 @@
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 
-@dataclass
+# Fields holding personal data carry metadata {"pii": kind}; redacted exports
+# (src/output.py, Redactor) mask or key-hash them by kind. The flag marking a
+# debt as paid off at closing carries {"paid_off": True}; columnar exports
+# (src/columnar.py) also sum amounts without the items it is set on.
+
+@dataclass(slots=True)
 class Address:
     street: Optional[str] = None
     unit: Optional[str] = None
     city: Optional[str] = None
     state: Optional[str] = None
-    zip_code: Optional[str] = None
+    zip_code: Optional[str] = field(default=None, metadata={"aliases": ("zip",)})
     county: Optional[str] = None
     country: Optional[str] = None
     how_long_years: Optional[int] = None
     how_long_months: Optional[int] = None
     housing_expense: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class ContactInfo:
-    home_phone: Optional[str] = None
-    cell_phone: Optional[str] = None
-    work_phone: Optional[str] = None
-    email: Optional[str] = None
+    home_phone: Optional[str] = field(default=None, metadata={"pii": "phone"})
+    cell_phone: Optional[str] = field(default=None, metadata={"pii": "phone"})
+    work_phone: Optional[str] = field(default=None, metadata={"pii": "phone"})
+    email: Optional[str] = field(default=None, metadata={"pii": "email"})
 
-@dataclass
+@dataclass(slots=True)
 class DependentsInfo:
     number: Optional[int] = None
     ages: Optional[int] = None # Assuming a single field for ages as per parser
 
-@dataclass
+@dataclass(slots=True)
 class GrossMonthlyIncome:
     base: Optional[float] = None
     overtime: Optional[float] = None
@@ -37,10 +42,10 @@ class GrossMonthlyIncome:
     other: Optional[float] = None
     total: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class Employment:
     employer_name: Optional[str] = None
-    phone: Optional[str] = None
+    phone: Optional[str] = field(default=None, metadata={"pii": "phone"})
     gross_monthly_income: GrossMonthlyIncome = field(default_factory=GrossMonthlyIncome)
     address: Address = field(default_factory=Address)
     position_title: Optional[str] = None
@@ -52,48 +57,48 @@ class Employment:
     ownership_share_25_or_more: Optional[bool] = None
     monthly_income_loss: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class OtherIncomeSource:
     source: Optional[str] = None
     monthly_income: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class BankAccount:
     account_type: Optional[str] = None
     financial_institution: Optional[str] = None
-    account_number: Optional[str] = None
+    account_number: Optional[str] = field(default=None, metadata={"pii": "account_number"})
     cash_or_market_value: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class OtherAssetCredit:
     asset_or_credit_type: Optional[str] = None
     cash_or_market_value: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class Liability:
     account_type: Optional[str] = None
     company_name: Optional[str] = None
-    account_number: Optional[str] = None
+    account_number: Optional[str] = field(default=None, metadata={"pii": "account_number"})
     unpaid_balance: Optional[float] = None
     monthly_payment: Optional[float] = None
-    paid_off_at_closing: Optional[bool] = None
+    paid_off_at_closing: Optional[bool] = field(default=None, metadata={"paid_off": True})
 
-@dataclass
+@dataclass(slots=True)
 class OtherLiabilityExpense:
     type: Optional[str] = None
     monthly_payment: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class MortgageLoanOnProperty:
     creditor_name: Optional[str] = None
-    account_number: Optional[str] = None
+    account_number: Optional[str] = field(default=None, metadata={"pii": "account_number"})
     monthly_mortgage_payment: Optional[float] = None
     unpaid_balance: Optional[float] = None
-    to_be_paid_off_at_closing: Optional[bool] = None
+    to_be_paid_off_at_closing: Optional[bool] = field(default=None, metadata={"paid_off": True})
     type: Optional[str] = None
     credit_limit: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class RealEstateProperty:
     address: Address = field(default_factory=Address)
     property_value: Optional[float] = None
@@ -104,7 +109,7 @@ class RealEstateProperty:
     net_monthly_rental_income: Optional[float] = None
     mortgage_loans: List[MortgageLoanOnProperty] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class Declarations:
     occupy_primary_residence: Optional[str] = None
     ownership_interest_in_other_property_past_3_years: Optional[str] = None
@@ -126,7 +131,7 @@ class Declarations:
     declared_bankruptcy: Optional[str] = None
     bankruptcy_types: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class MilitaryServiceInfo:
     ever_served: Optional[str] = None
     currently_serving: Optional[bool] = None
@@ -134,18 +139,18 @@ class MilitaryServiceInfo:
     non_activated_reserve_national_guard: Optional[bool] = None
     surviving_spouse: Optional[bool] = None
 
-@dataclass
+@dataclass(slots=True)
 class DemographicInfo:
     ethnicity: List[str] = field(default_factory=list)
     race: List[str] = field(default_factory=list)
     sex: Optional[str] = None
     do_not_wish_to_provide: Dict[str, Optional[bool]] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class Borrower:
     name: Optional[str] = None
     alternate_names: Optional[str] = None
-    social_security_number: Optional[str] = None
+    social_security_number: Optional[str] = field(default=None, metadata={"pii": "ssn"})
     date_of_birth: Optional[str] = None
     citizenship: Optional[str] = None
     marital_status: Optional[str] = None
@@ -164,18 +169,18 @@ class Borrower:
     military_service: MilitaryServiceInfo = field(default_factory=MilitaryServiceInfo)
     demographic_info: DemographicInfo = field(default_factory=DemographicInfo)
 
-@dataclass
+@dataclass(slots=True)
 class LoanOriginatorInfo:
     organization_name: Optional[str] = None
     address: Optional[str] = None
     nmlsr_id: Optional[str] = None
     originator_name: Optional[str] = None
     originator_nmlsr_id: Optional[str] = None
-    email: Optional[str] = None
+    email: Optional[str] = field(default=None, metadata={"pii": "email"})
     state_license_id: Optional[str] = None
-    phone: Optional[str] = None
+    phone: Optional[str] = field(default=None, metadata={"pii": "phone"})
 
-@dataclass
+@dataclass(slots=True)
 class NewMortgageLoan:
     creditor_name: Optional[str] = None
     lien_type: Optional[str] = None
@@ -183,19 +188,19 @@ class NewMortgageLoan:
     loan_amount: Optional[float] = None
     credit_limit: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class RentalIncomeOnProperty:
     expected_monthly_rental_income: Optional[float] = None
     expected_net_monthly_rental_income: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class GiftGrant:
     asset_type: Optional[str] = None
     deposited_not_deposited: Optional[str] = None
     source: Optional[str] = None
     cash_or_market_value: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class Loan:
     loan_amount: Optional[float] = None
     loan_purpose: Optional[str] = None
@@ -210,8 +215,9 @@ class Loan:
     gifts_grants: List[GiftGrant] = field(default_factory=list)
     loan_originator_info: LoanOriginatorInfo = field(default_factory=LoanOriginatorInfo)
 
-@dataclass
+@dataclass(slots=True)
 class URLAData:
     """Main container for all extracted URLA data."""
     borrower: Borrower = field(default_factory=Borrower)
-    loan: Loan = field(default_factory=Loan)
\ No newline at end of file
+    loan: Loan = field(default_factory=Loan)
+    additional_borrowers: List[Borrower] = field(default_factory=list)
\ No newline at end of file
@@ -0,0 +1,142 @@
+# src/diagnostics.py
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+@dataclass
+class FieldDiagnostic:
+    """
+    Outcome of one field spec. status is "matched", "missed" (no match, an
+    empty value, or anchor None when the section header was not found) or
+    "error" (the convert step raised; error holds the exception). anchor is
+    the section key whose span the pattern ran against, "fallback" for the
+    whole text, or the label a geometry spec was located by. start/end are
+    character offsets of the match in the document text (None for geometry),
+    rows the number of matches of a table ("extend") spec.
+    """
+    status: str
+    section: str
+    anchor: Optional[str] = None
+    start: Optional[int] = None
+    end: Optional[int] = None
+    rows: Optional[int] = None
+    error: Optional[str] = None
+
+@dataclass
+class DocumentDiagnostics:
+    """
+    Field-level report for one document, filled in while its specs run
+    (pass it to extract_urla or parse_urla_text). With diagnostics, a field
+    whose conversion fails is recorded and left empty instead of failing the
+    whole document. Fields of additional borrowers are recorded under
+    "additional_borrowers.<n>.<field>" (see part()).
+    """
+    source: Optional[str] = None
+    method: Optional[str] = None
+    template: Optional[str] = None
+    fields: Dict[str, FieldDiagnostic] = field(default_factory=dict)
+    prefix: str = ""
+    offset: int = 0
+
+    def record(self, name: str, section: str, status: str, anchor: Optional[str] = None,
+               span: Optional[Tuple[int, int]] = None, rows: Optional[int] = None, error: Optional[str] = None) -> None:
+        start, end = (span[0] + self.offset, span[1] + self.offset) if span is not None else (None, None)
+        self.fields[self.prefix + name] = FieldDiagnostic(status, section, anchor, start, end, rows, error)
+
+    def part(self, prefix: str, offset: int) -> "DocumentDiagnostics":
+        """A view recording into the same report for text parsed from full_text[offset:]."""
+        return DocumentDiagnostics(self.source, self.method, self.template, self.fields, prefix, offset)
+
+    def names(self, status: str) -> List[str]:
+        return [name for name, diagnostic in self.fields.items() if diagnostic.status == status]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Compact form: counts, the missed field names, {field: error} and, per
+        matched field, [anchor, start, end] (plus the row count for tables).
+        """
+        matched = {}
+        for name, d in self.fields.items():
+            if d.status == "matched":
+                matched[name] = [d.anchor, d.start, d.end] + ([d.rows] if d.rows is not None else [])
+        return {"source": self.source, "method": self.method, "template": self.template,
+                "matched": len(matched), "missed": self.names("missed"),
+                "errors": {name: d.error for name, d in self.fields.items() if d.status == "error"},
+                "fields": matched}
+
+class DiagnosticsRollup:
+    """
+    Batch-wide view of the per-document reports in batch runner records:
+    per field, how many documents matched, missed or failed it. A document
+    is worth reprocessing when its record failed, a field conversion
+    failed, or it missed a field that most of the batch has (missed by at
+    most max_miss_rate of the documents reporting it); fields most
+    applications leave blank (alternate names, a second job) do not count.
+    """
+
+    def __init__(self, max_miss_rate: float = 0.5):
+        self.max_miss_rate = max_miss_rate
+        self.documents = 0
+        self.counts: Dict[str, Counter] = {}
+        self._documents: List[Tuple[Optional[str], bool, Tuple[str, ...]]] = []
+
+    def add(self, record: dict) -> None:
+        self.documents += 1
+        report = record.get("diagnostics") or {}
+        for status, names in (("matched", report.get("fields", ())), ("missed", report.get("missed", ())),
+                              ("error", report.get("errors", ()))):
+            for name in names:
+                self.counts.setdefault(name, Counter())[status] += 1
+        failed = record.get("status", "ok") != "ok" or bool(report.get("errors"))
+        self._documents.append((record.get("source"), failed, tuple(report.get("missed", ()))))
+
+    def add_many(self, records: Iterable[dict]) -> "DiagnosticsRollup":
+        for record in records:
+            self.add(record)
+        return self
+
+    def miss_rates(self) -> Dict[str, float]:
+        """Share of the documents reporting each field that missed it (or failed to convert it)."""
+        return {name: round((c["missed"] + c["error"]) / sum(c.values()), 4) for name, c in sorted(self.counts.items())}
+
+    def to_reprocess(self) -> List[str]:
+        rates = self.miss_rates()
+        return [source for source, failed, missed in self._documents
+                if source and (failed or any(rates[name] <= self.max_miss_rate for name in missed))]
+
+    def as_dict(self) -> Dict[str, Any]:
+        rates = self.miss_rates()
+        return {"documents": self.documents, "reprocess": len(self.to_reprocess()),
+                "fields": {name: {"miss_rate": rates[name], **self.counts[name]} for name in rates}}
+
+def write_manifest(path: str, sources: Iterable[str]) -> None:
+    """A manifest file (one path per line) that src.batch takes as its source."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(f"{os.path.abspath(source)}\n" for source in sources)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Roll up the diagnostics of a batch run (src.batch --diagnostics).")
+    parser.add_argument("results", help="NDJSON or JSON output of src.batch --diagnostics")
+    parser.add_argument("--max-miss-rate", type=float, default=0.5,
+                        help="Fields missed by at most this share of the batch are expected in every document")
+    parser.add_argument("--reprocess", metavar="MANIFEST",
+                        help="Write the documents to reprocess as a manifest for src.batch")
+    args = parser.parse_args(argv)
+
+    with open(args.results, "r", encoding="utf-8") as f:
+        first = f.read(1)
+        f.seek(0)
+        records = json.load(f) if first == "[" else (json.loads(line) for line in f if line.strip())
+        rollup = DiagnosticsRollup(args.max_miss_rate).add_many(records)
+    json.dump(rollup.as_dict(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    if args.reprocess:
+        write_manifest(args.reprocess, rollup.to_reprocess())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+# src/form_fields.py
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# pdfminer is imported inside the functions below: they only run on an already
+# opened document, and importing this module stays cheap (see src/client.py).
+
+@dataclass(frozen=True)
+class FormFieldSpec:
+    """
+    Maps one AcroForm widget onto the extracted dict. `names` are the accepted
+    field names after normalize_field_name(); `convert` turns the widget value
+    into the stored value and returns None to skip it.
+    """
+    names: Tuple[str, ...]
+    section: str
+    path: Tuple[str, ...]
+    convert: Callable[[Any], Any]
+
+def normalize_field_name(name: str) -> str:
+    """
+    "form1[0].Page1[0].Borrower_SSN[0]" -> "borrowerssn": the last name segment,
+    lower-cased, with array indices and punctuation dropped.
+    """
+    last = name.split(".")[-1]
+    return re.sub(r"[^a-z0-9]", "", re.sub(r"\[\d+\]", "", last).lower())
+
+# --- Converters ---
+def _str(value: Any) -> Optional[str]:
+    from pdfminer.psparser import PSLiteral
+    if isinstance(value, PSLiteral):
+        return None
+    value = str(value).strip()
+    return value or None
+
+def _amount(value: Any) -> Optional[float]:
+    text = _str(value)
+    if text is None:
+        return None
+    text = text.replace("$", "").replace(",", "").split("/")[0].strip()
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+def _int(value: Any) -> Optional[int]:
+    amount = _amount(value)
+    return int(amount) if amount is not None else None
+
+def _checked(label: str) -> Callable[[Any], Optional[str]]:
+    """Checkbox widgets store a name such as /Yes or /On when ticked and /Off otherwise."""
+    def convert(value: Any) -> Optional[str]:
+        from pdfminer.psparser import PSLiteral
+        if isinstance(value, PSLiteral):
+            name = value.name.decode() if isinstance(value.name, bytes) else value.name
+            return label if name and name != "Off" else None
+        return label if str(value).strip().lower() in ("yes", "on", "true", "x", "1") else None
+    return convert
+
+def _address_specs(prefix: Tuple[str, ...], section: str, path: Tuple[str, ...]) -> List[FormFieldSpec]:
+    specs = []
+    for key, suffixes in (("street", ("street", "address")), ("unit", ("unit",)), ("city", ("city",)),
+                          ("state", ("state",)), ("zip", ("zip", "zipcode")), ("country", ("country",)),
+                          ("county", ("county",))):
+        specs.append(FormFieldSpec(tuple(p + s for p in prefix for s in suffixes), section, path + (key,), _str))
+    return specs
+
+def _employment_specs(prefixes: Tuple[str, ...], section: str, emp_key: str) -> List[FormFieldSpec]:
+    emp = ("employment_info", emp_key)
+    income = emp + ("gross_monthly_income",)
+
+    def names(*suffixes: str) -> Tuple[str, ...]:
+        return tuple(p + s for p in prefixes for s in suffixes)
+
+    specs = [
+        FormFieldSpec(names("employername", "businessname", "employerorbusinessname"), section, emp + ("employer_name",), _str),
+        FormFieldSpec(names("phone", "employerphone"), section, emp + ("phone",), _str),
+        FormFieldSpec(names("positiontitle", "position", "title"), section, emp + ("position_title",), _str),
+        FormFieldSpec(names("startdate"), section, emp + ("start_date",), _str),
+        FormFieldSpec(names("lineofworkyears", "yearsinlineofwork"), section, emp + ("how_long_in_work", "years"), _int),
+        FormFieldSpec(names("lineofworkmonths", "monthsinlineofwork"), section, emp + ("how_long_in_work", "months"), _int),
+    ]
+    for key in ("base", "overtime", "bonus", "commission", "other", "total"):
+        specs.append(FormFieldSpec(names(key, key + "income"), section, income + (key,), _amount))
+    specs.append(FormFieldSpec(names("military", "militaryentitlements"), section, income + ("military_entitlements",), _amount))
+    specs.extend(_address_specs(tuple(p + "employer" for p in prefixes), section, emp + ("address",)))
+    return specs
+
+# --- Widget-name table ---
+# Field names seen on fillable Form 1003 templates. A template with other
+# names falls back to the text path; add its names here.
+FORM_FIELD_SPECS: List[FormFieldSpec] = [
+    FormFieldSpec(("borrowername", "borrowerfullname"), "1a", ("borrower_info", "name"), _str),
+    FormFieldSpec(("ssn", "socialsecuritynumber", "borrowerssn"), "1a", ("borrower_info", "social_security_number"), _str),
+    FormFieldSpec(("alternatenames", "borroweralternatenames"), "1a", ("borrower_info", "alternate_names"), _str),
+    FormFieldSpec(("dob", "dateofbirth", "borrowerdob"), "1a", ("borrower_info", "date_of_birth"), _str),
+    FormFieldSpec(("uscitizen", "citizenshipuscitizen"), "1a", ("borrower_info", "citizenship"), _checked("U.S. Citizen")),
+    FormFieldSpec(("permanentresidentalien",), "1a", ("borrower_info", "citizenship"), _checked("Permanent Resident Alien")),
+    FormFieldSpec(("nonpermanentresidentalien",), "1a", ("borrower_info", "citizenship"), _checked("Non-Permanent Resident Alien")),
+    FormFieldSpec(("married", "maritalstatusmarried"), "1a", ("borrower_info", "marital_status"), _checked("Married")),
+    FormFieldSpec(("separated", "maritalstatusseparated"), "1a", ("borrower_info", "marital_status"), _checked("Separated")),
+    FormFieldSpec(("unmarried", "maritalstatusunmarried"), "1a", ("borrower_info", "marital_status"), _checked("Unmarried")),
+    FormFieldSpec(("dependentsnumber", "numberofdependents"), "1a", ("borrower_info", "dependents", "number"), _int),
+    FormFieldSpec(("dependentsages",), "1a", ("borrower_info", "dependents", "ages"), _str),
+    FormFieldSpec(("email", "borroweremail"), "1a", ("borrower_info", "contact_info", "email"), _str),
+    FormFieldSpec(("homephone",), "1a", ("borrower_info", "contact_info", "home_phone"), _str),
+    FormFieldSpec(("cellphone",), "1a", ("borrower_info", "contact_info", "cell_phone"), _str),
+    FormFieldSpec(("workphone",), "1a", ("borrower_info", "contact_info", "work_phone"), _str),
+    *_address_specs(("current", "currentaddress"), "1a", ("borrower_info", "current_address")),
+    FormFieldSpec(("currentyears", "currentaddressyears"), "1a", ("borrower_info", "current_address", "how_long_years"), _int),
+    FormFieldSpec(("currentmonths", "currentaddressmonths"), "1a", ("borrower_info", "current_address", "how_long_months"), _int),
+    FormFieldSpec(("housingown",), "1a", ("borrower_info", "current_address", "housing_expense"), _checked("Own")),
+    FormFieldSpec(("housingrent",), "1a", ("borrower_info", "current_address", "housing_expense"), _checked("Rent")),
+    *_employment_specs(("current", "currentemployment", "employment1"), "1b", "current_employment"),
+    *_employment_specs(("additional", "additionalemployment", "employment2"), "1c", "additional_employment"),
+    FormFieldSpec(("loanamount",), "4a", ("loan_property_info", "loan_amount"), _amount),
+    FormFieldSpec(("loanpurposepurchase",), "4a", ("loan_property_info", "loan_purpose"), _checked("Purchase")),
+    FormFieldSpec(("loanpurposerefinance",), "4a", ("loan_property_info", "loan_purpose"), _checked("Refinance")),
+    FormFieldSpec(("loanpurposeother",), "4a", ("loan_property_info", "loan_purpose"), _checked("Other")),
+    FormFieldSpec(("numberofunits",), "4a", ("loan_property_info", "number_of_units"), _int),
+    FormFieldSpec(("propertyvalue",), "4a", ("loan_property_info", "property_value"), _amount),
+    *_address_specs(("property", "propertyaddress"), "4a", ("loan_property_info", "property_address")),
+]
+
+_SPECS_BY_NAME: Dict[str, FormFieldSpec] = {name: spec for spec in FORM_FIELD_SPECS for name in spec.names}
+
+def read_form_fields(pdf: Any) -> Dict[str, Any]:
+    """
+    Returns {fully qualified field name: value} for every AcroForm field of an
+    open pdfplumber document that has a value. Reads only the widget
+    dictionaries, so no page is laid out. Empty for flattened documents.
+    """
+    from pdfminer.pdftypes import resolve1
+    from pdfminer.utils import decode_text
+    acroform = resolve1(pdf.doc.catalog.get("AcroForm"))
+    if not isinstance(acroform, dict):
+        return {}
+
+    values: Dict[str, Any] = {}
+    stack = [(resolve1(f), "") for f in resolve1(acroform.get("Fields")) or []]
+    while stack:
+        field, parent = stack.pop()
+        if not isinstance(field, dict):
+            continue
+        partial = resolve1(field.get("T"))
+        name = parent
+        if partial is not None:
+            partial = decode_text(partial) if isinstance(partial, bytes) else str(partial)
+            name = f"{parent}.{partial}" if parent else partial
+        value = resolve1(field.get("V"))
+        if value is not None:
+            values[name] = decode_text(value) if isinstance(value, bytes) else value
+        stack.extend((resolve1(kid), name) for kid in resolve1(field.get("Kids")) or [])
+    return values
+
+def map_form_fields(fields: Dict[str, Any], data: dict, keys: Optional[Set[str]] = None) -> Set[str]:
+    """
+    Stores the values of known widgets in data (the parser's dict skeleton),
+    restricted to the section keys when given. Returns the section keys that
+    received at least one value (empty when nothing was mapped).
+    """
+    filled: Set[str] = set()
+    for name, raw in fields.items():
+        spec = _SPECS_BY_NAME.get(normalize_field_name(name))
+        if spec is None or (keys is not None and spec.section not in keys):
+            continue
+        value = spec.convert(raw)
+        if value is None:
+            continue
+        node = data
+        for key in spec.path[:-1]:
+            node = node.setdefault(key, {})
+        node[spec.path[-1]] = value
+        filled.add(spec.section)
+    return filled
@@ -0,0 +1,238 @@
+# src/geometry.py
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.diagnostics import DocumentDiagnostics
+from src.pdf_parser import _target
+
+# Side of a WordGrid cell in points; about two text lines, so a field box
+# touches only a handful of cells.
+GRID_CELL = 24.0
+# How far (points) a label may sit from its template position and still be
+# taken for it; lender-printed variants shift the form by a few points.
+LABEL_TOLERANCE = 20.0
+
+class WordGrid:
+    """
+    Uniform-grid spatial index over the words of one page (the dicts of
+    pdfplumber's page.extract_words()). Each word is filed under the cell
+    holding its centre, and under its text, so finding a label and the
+    words inside a field box both touch a few entries instead of the page.
+    """
+
+    def __init__(self, words: List[dict], cell: float = GRID_CELL):
+        self.words = words
+        self.cell = cell
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._by_text: Dict[str, List[int]] = defaultdict(list)
+        for i, word in enumerate(words):
+            cx, cy = (word["x0"] + word["x1"]) / 2, (word["top"] + word["bottom"]) / 2
+            self._cells[(int(cx // cell), int(cy // cell))].append(i)
+            self._by_text[word["text"]].append(i)
+
+    def within(self, x0: float, top: float, x1: float, bottom: float) -> List[dict]:
+        """Words whose centre lies inside the box, in reading order."""
+        cell, hits = self.cell, []
+        for cx in range(int(x0 // cell), int(x1 // cell) + 1):
+            for cy in range(int(top // cell), int(bottom // cell) + 1):
+                hits.extend(self._cells.get((cx, cy), ()))
+        words = self.words
+        return [words[i] for i in sorted(hits)
+                if x0 <= (words[i]["x0"] + words[i]["x1"]) / 2 <= x1
+                and top <= (words[i]["top"] + words[i]["bottom"]) / 2 <= bottom]
+
+    def find(self, label: str, at: Tuple[float, float], tolerance: float = LABEL_TOLERANCE) -> Optional[dict]:
+        """
+        The first word of the label phrase nearest to its expected (x0, top)
+        position, or None when the phrase is not within tolerance of it.
+        extract_words() returns words in reading order, so the rest of the
+        phrase is checked against the words that follow.
+        """
+        tokens = label.split()
+        words, best, best_distance = self.words, None, tolerance
+        for i in self._by_text.get(tokens[0], ()):
+            distance = max(abs(words[i]["x0"] - at[0]), abs(words[i]["top"] - at[1]))
+            if distance <= best_distance and [w["text"] for w in words[i + 1:i + len(tokens)]] == tokens[1:]:
+                best, best_distance = words[i], distance
+        return best
+
+@dataclass(frozen=True)
+class GeometrySpec:
+    """
+    One field located by the position of its label on the URLA template.
+    `at` is where the label's first word starts on page `page`; `box` is the
+    value box as (dx0, dtop, dx1, dbottom) offsets from the label actually
+    found, and `convert` turns the text of the words inside it into the value
+    stored at `path` of the extracted dict (None leaves the field unset).
+    """
+    name: str
+    section: str
+    path: Tuple[str, ...]
+    page: int
+    label: str
+    at: Tuple[float, float]
+    box: Tuple[float, float, float, float]
+    convert: Callable[[str], Any] = str
+
+# --- Converters (same value formats as the regex field specs) ---
+def _no_spaces(text: str) -> str:
+    return text.replace("–", "-").replace(" ", "")
+
+def _int(text: str) -> int:
+    return int(text)
+
+def _money(text: str) -> Optional[float]:
+    value = text.replace("$", "").replace(",", "").strip()
+    return float(value) if value else None
+
+def _phone(text: str) -> Optional[str]:
+    digits = re.findall(r"\d+", text)
+    if len(digits) < 3:
+        return None
+    phone = f"({digits[0]}) {digits[1]}-{digits[2]}"
+    return f"{phone} Ext. {digits[3]}" if len(digits) > 3 else phone
+
+def _checkbox(*options: str) -> Callable[[str], Optional[str]]:
+    """The option preceded by the "4" check-mark glyph (ZapfDingbats), if any."""
+    pattern = re.compile(r"(?:^| )4 (" + "|".join(map(re.escape, options)) + r")(?= |$)")
+    return lambda text: m.group(1) if (m := pattern.search(text)) else None
+
+# --- Template (1/2021 URLA, 612 x 792 pt pages) ---
+def _address_specs(section: str, path: Tuple[str, ...], page: int, top: float,
+                   parts: Dict[str, Tuple[str, float, float, float, float]]) -> List[GeometrySpec]:
+    """
+    Specs for an address block whose Street line starts at top: parts maps
+    each address key to (label, x0 of the label, dx0, dx1, dline), dline
+    being the label's line relative to the Street line.
+    """
+    return [GeometrySpec(f"{path[-1]}.{key}", section, path + (key,), page, label, (lx, top + dline), (dx0, -1, dx1, 10))
+            for key, (label, lx, dx0, dx1, dline) in parts.items()]
+
+def _employment_specs(section: str, emp_key: str, page: int, top: float) -> List[GeometrySpec]:
+    """One employment block (1b current, 1c additional); top is that of its "Employer or Business Name" label."""
+    emp = ("employment_info", emp_key)
+    income = emp + ("gross_monthly_income",)
+    specs = [
+        GeometrySpec("employer_name", section, emp + ("employer_name",), page, "Employer or Business Name", (36, top), (112, -2, 280, 10)),
+        GeometrySpec("phone", section, emp + ("phone",), page, "Phone", (320, top), (28, -2, 130, 10), _phone),
+        GeometrySpec("position_title", section, emp + ("position_title",), page, "Position or Title", (36, top + 49.4), (63, -2, 240, 10)),
+        GeometrySpec("start_date", section, emp + ("start_date",), page, "Start Date", (36, top + 63.5), (46, -2, 130, 10), _no_spaces),
+        GeometrySpec("how_long_years", section, emp + ("how_long_in_work", "years"), page, "How long in this line of work?",
+                     (36, top + 77.3), (115, -4, 130, 10), _int),
+        GeometrySpec("how_long_months", section, emp + ("how_long_in_work", "months"), page, "How long in this line of work?",
+                     (36, top + 77.3), (158, -4, 174, 10), _int),
+    ]
+    for i, label in enumerate(("Base", "Overtime", "Bonus", "Commission")):
+        specs.append(GeometrySpec(label.lower(), section, income + (label.lower(),), page, label, (454, top + 10.2 + 14 * i),
+                                  (46, -2, 96, 10), _money))
+    specs += _address_specs(section, emp + ("address",), page, top + 13.8, {
+        "street": ("Street", 36, 25, 325, 0), "unit": ("Unit #", 365.1, 22, 85, 0), "city": ("City", 36, 15, 190, 14),
+        "state": ("State", 229.9, 20, 50, 14), "zip": ("ZIP", 284.1, 12, 70, 14), "country": ("Country", 356.1, 32, 95, 14),
+    })
+    return [GeometrySpec(f"{emp_key}.{s.name}", s.section, s.path, s.page, s.label, s.at, s.box, s.convert) for s in specs]
+
+GEOMETRY_SPECS: List[GeometrySpec] = [
+    # Section 1a: Borrower Info (page 1)
+    GeometrySpec("name", "1a", ("borrower_info", "name"), 0, "Name (First, Middle, Last, Suffix)", (36, 176), (0, 12, 300, 24)),
+    GeometrySpec("alternate_names", "1a", ("borrower_info", "alternate_names"), 0, "Alternate Names", (36, 201.8), (0, 24, 290, 36)),
+    GeometrySpec("social_security_number", "1a", ("borrower_info", "social_security_number"), 0, "Social Security Number", (342, 176),
+                 (95, -2, 235, 11), _no_spaces),
+    GeometrySpec("date_of_birth", "1a", ("borrower_info", "date_of_birth"), 0, "Date of Birth", (341.5, 200.5), (0, 22, 95, 36), _no_spaces),
+    GeometrySpec("citizenship", "1a", ("borrower_info", "citizenship"), 0, "Citizenship", (441, 202.1), (-5, 8, 135, 45),
+                 _checkbox("U.S. Citizen", "Permanent Resident Alien", "Non-Permanent Resident Alien")),
+    GeometrySpec("marital_status", "1a", ("borrower_info", "marital_status"), 0, "Marital Status", (35.9, 329.1), (0, 9, 105, 40),
+                 _checkbox("Married", "Separated", "Unmarried")),
+    GeometrySpec("email", "1a", ("borrower_info", "contact_info", "email"), 0, "Email", (341.4, 381.1), (20, -2, 235, 10)),
+    *(GeometrySpec(key, "1a", ("borrower_info", "contact_info", key), 0, label, (341.5, top), (50, -2, 235, 10), _phone)
+      for key, label, top in (("home_phone", "Home Phone", 343.1), ("cell_phone", "Cell Phone", 355.1), ("work_phone", "Work Phone", 367.1))),
+    *_address_specs("1a", ("borrower_info", "current_address"), 0, 410.7, {
+        "street": ("Street", 35.9, 25, 455, 0), "unit": ("Unit #", 496, 24, 80, 0), "city": ("City", 35.9, 15, 320, 12),
+        "state": ("State", 360, 20, 52, 12), "zip": ("ZIP", 416.5, 14, 68, 12), "country": ("Country", 487, 32, 90, 12),
+    }),
+    GeometrySpec("current_address_how_long_years", "1a", ("borrower_info", "current_address", "how_long_years"), 0,
+                 "How Long at Current Address?", (36, 436.7), (115, -4, 130, 10), _int),
+    GeometrySpec("current_address_how_long_months", "1a", ("borrower_info", "current_address", "how_long_months"), 0,
+                 "How Long at Current Address?", (36, 436.7), (158, -4, 174, 10), _int),
+    GeometrySpec("housing_expense", "1a", ("borrower_info", "current_address", "housing_expense"), 0, "Housing", (247.3, 436.9),
+                 (45, -3, 245, 10), _checkbox("No primary housing expense", "Own", "Rent")),
+    # Sections 1b & 1c: Employment (pages 1 and 2)
+    *_employment_specs("1b", "current_employment", 0, 590.6),
+    *_employment_specs("1c", "additional_employment", 1, 61.7),
+    # Section 4a: Loan and Property (page 5)
+    GeometrySpec("loan_amount", "4a", ("loan_property_info", "loan_amount"), 4, "Loan Amount", (36, 98.3), (56, -2, 178, 10), _money),
+    GeometrySpec("loan_purpose", "4a", ("loan_property_info", "loan_purpose"), 4, "Loan Purpose", (217.6, 98.3), (68, -2, 270, 10),
+                 _checkbox("Purchase", "Refinance", "Other")),
+    *_address_specs("4a", ("loan_property_info", "property_address"), 4, 112.4, {
+        "street": ("Street", 117, 25, 378, 0), "unit": ("Unit #", 497, 24, 80, 0), "city": ("City", 117, 15, 243, 13.8),
+        "state": ("State", 362.5, 20, 52, 13.8), "zip": ("ZIP", 416.1, 14, 70, 13.8), "county": ("County", 488, 29, 90, 13.8),
+    }),
+    GeometrySpec("number_of_units", "4a", ("loan_property_info", "number_of_units"), 4, "Number of Units", (117, 140.2), (62, -2, 105, 10), _int),
+    GeometrySpec("property_value", "4a", ("loan_property_info", "property_value"), 4, "Property Value", (225.6, 140.2), (60, -2, 180, 10), _money),
+    GeometrySpec("occupancy", "4a", ("loan_property_info", "occupancy"), 4, "Occupancy", (36, 154.3), (75, -3, 505, 10),
+                 _checkbox("Primary Residence", "Second Home", "Investment Property", "FHA Secondary Residence")),
+    GeometrySpec("mixed_use_property", "4a", ("loan_property_info", "mixed_use_property"), 4, "Mixed-Use", (44.8, 170), (470, 2, 535, 14),
+                 _checkbox("NO", "YES")),
+    GeometrySpec("manufactured_home", "4a", ("loan_property_info", "manufactured_home"), 4, "Manufactured", (45.1, 194.9), (470, -3, 535, 10),
+                 _checkbox("NO", "YES")),
+]
+
+# Sections fully covered by GEOMETRY_SPECS; the rest (tables, declarations) stay on the text path.
+GEOMETRY_SECTIONS = frozenset(spec.section for spec in GEOMETRY_SPECS)
+
+def extract_geometry(pdf: Any, keys: Optional[Set[str]], data: dict,
+                     specs: List[GeometrySpec] = GEOMETRY_SPECS,
+                     diagnostics: Optional[DocumentDiagnostics] = None) -> Set[str]:
+    """
+    Fills data from the word boxes of the template pages (only the pages the
+    selected specs live on are read, and no page text is linearized). Returns
+    the sections whose labels were not all found where the template puts
+    them, or whose values did not convert: those pages do not follow the
+    template, nothing of them is filled in, and the caller re-extracts such
+    sections on the text path. With diagnostics, the fields of the located
+    sections are recorded (anchored at their label); the others are
+    recorded by the text path.
+    """
+    by_page: Dict[int, List[GeometrySpec]] = defaultdict(list)
+    for spec in specs:
+        if keys is None or spec.section in keys:
+            by_page[spec.page].append(spec)
+    missing: Set[str] = set()
+    found: List[Tuple[GeometrySpec, Any]] = []
+    for page_index in sorted(by_page):
+        if page_index >= len(pdf.pages):
+            missing.update(spec.section for spec in by_page[page_index])
+            continue
+        page = pdf.pages[page_index]
+        # Only the band of the page holding this page's labels and boxes goes through word extraction.
+        top = max(0, min(spec.at[1] + min(spec.box[1], 0) for spec in by_page[page_index]) - LABEL_TOLERANCE)
+        bottom = min(page.height, max(spec.at[1] + spec.box[3] for spec in by_page[page_index]) + LABEL_TOLERANCE)
+        grid = WordGrid(page.crop((0, top, page.width, bottom)).extract_words(x_tolerance=1))
+        for spec in by_page[page_index]:
+            label = grid.find(spec.label, spec.at)
+            if label is None:
+                missing.add(spec.section)
+                continue
+            dx0, dtop, dx1, dbottom = spec.box
+            text = " ".join(w["text"] for w in grid.within(label["x0"] + dx0, label["top"] + dtop,
+                                                            label["x0"] + dx1, label["top"] + dbottom))
+            if not text:
+                found.append((spec, None))
+                continue
+            try:
+                value = spec.convert(text)
+            except ValueError:
+                missing.add(spec.section)
+                continue
+            found.append((spec, value))
+    # A partly located section is left entirely to the text path rather than mixing in misplaced values.
+    for spec, value in found:
+        if spec.section in missing:
+            continue
+        if value is not None:
+            node, key = _target(data, spec.path)
+            node[key] = value
+        if diagnostics is not None:
+            diagnostics.record(spec.name, spec.section, "missed" if value is None else "matched", spec.label)
+    return missing
@@ -0,0 +1,184 @@
+# src/incremental.py
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+from typing import Any, List, Optional, Set, Tuple
+
+from src.cache import DEFAULT_CACHE_DIR, ResultCache, document_hash
+from src.form_fields import map_form_fields, read_form_fields
+from src.main import populate_urla_data
+from src.metrics import DocumentMetrics, stage
+from src.output import dataclass_to_dict
+from src.pdf_parser import (FIELD_SPECS, PARSER_VERSION, TEXT_VERSION, FieldSpec, _new_extracted_data,
+                            _parse_borrowers, _pdfplumber, parse_urla_text, reparse_sections, split_sections)
+
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+def page_fingerprints(pdf: Any) -> List[str]:
+    """
+    SHA-256 of every page's decoded content streams (and media box). Only the
+    raw streams are read, no layout analysis, so this is cheap next to
+    extract_text.
+    """
+    from pdfminer.pdftypes import resolve1
+    fingerprints = []
+    for page in pdf.pages:
+        digest = hashlib.sha256(repr(page.page_obj.mediabox).encode("ascii"))
+        for ref in page.page_obj.contents:
+            stream = resolve1(ref)
+            digest.update(stream.get_data() if hasattr(stream, "get_data") else b"")
+        fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+def _join_pages(texts: List[str]) -> Tuple[str, List[Tuple[int, int]]]:
+    """The document text as _page_texts builds it, plus each page's (start, end) offsets in it."""
+    chunks, ranges, offset = [], [], 0
+    for text in texts:
+        chunk = f"{text}\n" if text else ""
+        chunks.append(chunk)
+        ranges.append((offset, offset + len(chunk)))
+        offset += len(chunk)
+    return "".join(chunks), ranges
+
+def sections_on_pages(full_text: str, ranges: List[Tuple[int, int]], pages: List[int],
+                      field_specs: List[FieldSpec] = FIELD_SPECS) -> Set[str]:
+    """
+    Section keys whose span in full_text overlaps any of the given pages, plus
+    every section of field_specs whose header is missing (its specs fall back
+    to the whole text, so any page can change them).
+    """
+    spans = split_sections(full_text)
+    touched = [ranges[i] for i in pages]
+    keys = {key for key, (start, end) in spans.items()
+            if any(start < page_end and page_start < end for page_start, page_end in touched)}
+    return keys | {spec.section for spec in field_specs if spec.section not in spans}
+
+def extract_revision(pdf_path: str, cache: ResultCache, previous: Optional[str] = None,
+                     metrics: Optional[DocumentMetrics] = None) -> dict:
+    """
+    Extracts a (re)submitted URLA, reusing the cached pages of an earlier
+    submission whose SHA-256 is previous. Page fingerprints and page texts
+    are stored for every document processed here; for a revision only the
+    pages whose content stream hash changed go through layout analysis, and
+    only the sections on those pages are re-run and merged into the earlier
+    extracted data. Returns the extract_urla_record fields plus
+    "changed_pages" and "sections" (the re-run section keys, None for all).
+    Without usable earlier pages (first submission, different page count,
+    another form revision or a parser version change) the whole document is
+    extracted. As in extract_urla, the form revision is fingerprinted and
+    its spec table used, and a fillable form's widgets are merged with the
+    text of the sections they do not cover ("acroform+text").
+    """
+    with stage(metrics, "read"):
+        with open(pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+        doc_hash = document_hash(pdf_bytes)
+    with stage(metrics, "cache"):
+        result = cache.get(doc_hash, "result", PARSER_VERSION)
+    if result is not None:
+        return {"sha256": doc_hash, "cached": True, "method": "cache", "data": result,
+                "changed_pages": [], "sections": []}
+
+    with stage(metrics, "cache"):
+        old_pages = cache.get(previous, "pages", TEXT_VERSION) if previous else None
+        old_extracted = cache.get(previous, "extracted", PARSER_VERSION) if previous else None
+
+    from src.templates import detect_template
+    with _pdfplumber().open(io.BytesIO(pdf_bytes)) as pdf:
+        with stage(metrics, "fingerprint"):
+            urla_template = detect_template(pdf)
+        with stage(metrics, "forms"):
+            data = _new_extracted_data()
+            filled = map_form_fields(read_form_fields(pdf), data, None)
+        # As in extract_urla: sections of this revision without widget values are read from the text.
+        uncovered = urla_template.spec_sections - filled
+        form_only = bool(filled) and not uncovered
+        if form_only:
+            # Fillable forms are read from their widgets, which is already cheap.
+            extracted, method, changed, sections = data, "acroform", list(range(len(pdf.pages))), None
+        else:
+            with stage(metrics, "fingerprint"):
+                fingerprints = page_fingerprints(pdf)
+            if old_pages is not None and old_pages.get("template") == urla_template.revision \
+                    and len(old_pages["fingerprints"]) == len(fingerprints):
+                changed = [i for i, (old, new) in enumerate(zip(old_pages["fingerprints"], fingerprints)) if old != new]
+                texts = list(old_pages["texts"])
+            else:
+                changed, texts = list(range(len(fingerprints))), [""] * len(fingerprints)
+            with stage(metrics, "extract_text"):
+                for i in changed:
+                    page = pdf.pages[i]
+                    texts[i] = page.extract_text(x_tolerance=1) or ""
+                    page.close()
+    if metrics is not None:
+        metrics.source, metrics.page_count = pdf_path, len(pdf.pages)
+
+    if not form_only:
+        full_text, ranges = _join_pages(texts)
+        field_specs = urla_template.field_specs
+        if filled:
+            # Widget values change without touching the content streams, so the widgets are
+            # always re-read and only the uncovered sections are parsed from the text.
+            with stage(metrics, "regex"):
+                extracted = _parse_borrowers(full_text, urla_template.select_field_specs(uncovered), data,
+                                             metrics=metrics)
+            method, sections = "acroform+text", sorted(uncovered)
+        elif old_extracted is not None and old_pages is not None and len(changed) < len(texts):
+            old_text, old_ranges = _join_pages(old_pages["texts"])
+            sections = (sections_on_pages(full_text, ranges, changed, field_specs)
+                        | sections_on_pages(old_text, old_ranges, changed, field_specs))
+            with stage(metrics, "regex"):
+                extracted, method = reparse_sections(full_text, old_extracted, sections, field_specs), "incremental"
+            sections = sorted(sections)
+        else:
+            extracted, method, sections = parse_urla_text(full_text, metrics=metrics, template=urla_template), "text", None
+        with stage(metrics, "cache"):
+            cache.put(doc_hash, "pages", TEXT_VERSION,
+                      {"fingerprints": fingerprints, "texts": texts, "template": urla_template.revision})
+            cache.put(doc_hash, "extracted", PARSER_VERSION, extracted)
+            cache.put(doc_hash, "text", TEXT_VERSION, full_text)
+    if metrics is not None:
+        metrics.method = method
+
+    with stage(metrics, "populate"):
+        urla_data = populate_urla_data(extracted)
+    with stage(metrics, "serialize"):
+        result = dataclass_to_dict(urla_data)
+    with stage(metrics, "cache"):
+        cache.put(doc_hash, "result", PARSER_VERSION, result)
+    return {"sha256": doc_hash, "cached": False, "method": method, "data": result,
+            "changed_pages": changed, "sections": sections}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Extract a resubmitted URLA, re-parsing only the changed pages.")
+    parser.add_argument("pdf", help="PDF of the (re)submitted application")
+    parser.add_argument("--previous", default=None,
+                        help="Earlier submission: its PDF path or SHA-256 (it must have been processed here before)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Cache holding the earlier submission's pages")
+    args = parser.parse_args(argv)
+
+    previous = args.previous
+    if previous is not None and not SHA256_RE.match(previous):
+        if not os.path.isfile(previous):
+            print(f"Error: '{previous}' is neither a file nor a SHA-256", file=sys.stderr)
+            return 1
+        with open(previous, "rb") as f:
+            previous = document_hash(f.read())
+
+    from src.templates import UnsupportedTemplateError
+    try:
+        record = extract_revision(args.pdf, ResultCache(args.cache_dir), previous)
+    except UnsupportedTemplateError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Extraction path: {record['method']}, changed pages: {record['changed_pages']}, "
+          f"re-run sections: {'all' if record['sections'] is None else record['sections']}", file=sys.stderr)
+    print(json.dumps(record["data"], indent=4))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# src/mapper.py
+import dataclasses
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
+
+from src.data_models import URLAData
+
+T = TypeVar("T")
+
+# --- Routes from the parser's dict layout to the URLAData layout ---
+# (source path in the extracted dict, target path in URLAData). When the
+# target is a dataclass, the source dict's keys are merged into it, so a new
+# parser key that matches a model field name needs no change here.
+EXTRACTED_DICT_ROUTES: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = [
+    (("borrower_info",), ("borrower",)),
+    (("employment_info", "current_employment"), ("borrower", "current_employment")),
+    (("employment_info", "additional_employment"), ("borrower", "additional_employment")),
+    (("other_income_sources",), ("borrower", "other_income_sources")),
+    (("assets", "bank_retirement_other"), ("borrower", "assets_bank_retirement_other")),
+    (("assets", "other_assets_credits"), ("borrower", "assets_other_assets_credits")),
+    (("liabilities", "credit_cards_debts_leases"), ("borrower", "liabilities_credit_cards_debts_leases")),
+    (("liabilities", "other_liabilities_expenses"), ("borrower", "liabilities_other_liabilities_expenses")),
+    (("real_estate_owned",), ("borrower", "real_estate_owned")),
+    (("declarations",), ("borrower", "declarations")),
+    (("military_service",), ("borrower", "military_service")),
+    (("demographic_info",), ("borrower", "demographic_info")),
+    (("loan_property_info",), ("loan",)),
+    (("other_new_mortgage_loans",), ("loan", "other_new_mortgage_loans")),
+    (("rental_income_on_property",), ("loan", "rental_income_on_property")),
+    (("gifts_grants",), ("loan", "gifts_grants")),
+    (("loan_originator_info",), ("loan", "loan_originator_info")),
+]
+
+# --- Per-class converters ---
+_BUILDERS: Dict[type, Callable[[Any], Any]] = {}
+
+def _converter(hint: Any) -> Optional[Callable[[Any], Any]]:
+    """Returns a converter for values of a field type, or None to store them as is."""
+    origin = typing.get_origin(hint)
+    args = typing.get_args(hint)
+    if origin is Union:
+        inner = [a for a in args if a is not type(None)]
+        return _converter(inner[0]) if len(inner) == 1 else None
+    if dataclasses.is_dataclass(hint):
+        return get_builder(hint)
+    if origin is list:
+        item = _converter(args[0]) if args else None
+        if item is None:
+            return list
+        # The parser stores single-entry sections (e.g. additional_employment) as one dict.
+        return lambda v: [item(x) for x in (v if isinstance(v, list) else [v])]
+    if origin is dict:
+        return dict
+    return None
+
+def get_builder(cls: Type[T]) -> Callable[[Any], T]:
+    """
+    Returns a function building an instance of the dataclass cls from a dict.
+    The plan (source keys including metadata "aliases", and one converter per
+    field) is worked out from the type hints once per class and cached.
+    Missing or None values leave a field at its default (nested dataclasses and
+    lists also when empty); unknown keys are ignored. Instances of cls are
+    passed through unchanged.
+    """
+    builder = _BUILDERS.get(cls)
+    if builder is not None:
+        return builder
+
+    hints = typing.get_type_hints(cls)
+    plan = []
+    for f in dataclasses.fields(cls):
+        factory = f.default_factory if f.default_factory is not dataclasses.MISSING else None
+        default = None if f.default is dataclasses.MISSING else f.default
+        keys = (f.name,) + tuple(f.metadata.get("aliases", ()))
+        plan.append((f.name, keys, _converter(hints.get(f.name, Any)), factory, default))
+
+    def builder(data: Any) -> T:
+        if type(data) is cls:
+            return data
+        kwargs = {}
+        for name, keys, convert, factory, default in plan:
+            value = None
+            for key in keys:
+                if key in data:
+                    value = data[key]
+                    break
+            if convert is None:
+                present = value is not None
+            else:
+                # Nested dataclasses and lists also fall back to their default when empty.
+                present = bool(value)
+            if not present:
+                kwargs[name] = factory() if factory is not None else default
+            else:
+                kwargs[name] = value if convert is None else convert(value)
+        return cls(**kwargs)
+
+    _BUILDERS[cls] = builder
+    return builder
+
+def from_dict(cls: Type[T], data: dict) -> T:
+    """Builds a (nested) dataclass object from plain dicts and lists."""
+    return get_builder(cls)(data)
+
+def _compile_routes(routes: List[Tuple[Tuple[str, ...], Tuple[str, ...]]]) -> Callable[[dict], dict]:
+    """
+    Returns the reshaping function for a route table. The paths are split
+    into (first key, rest, target parents, target leaf) once, so reshaping a
+    document is one guarded lookup per route.
+    """
+    plan = [(source[0], source[1:], target[:-1], target[-1]) for source, target in routes]
+
+    def reshape(src: dict) -> dict:
+        out: dict = {}
+        for first, rest, parents, leaf in plan:
+            value = src.get(first)
+            for key in rest:
+                value = value.get(key) if type(value) is dict else None
+            if value is None:
+                continue
+            node = out
+            for key in parents:
+                node = node.setdefault(key, {})
+            if type(value) is dict:
+                node.setdefault(leaf, {}).update(value)
+            else:
+                node[leaf] = value
+        return out
+
+    return reshape
+
+_reshape = _compile_routes(EXTRACTED_DICT_ROUTES)
+
+def reshape_extracted_dict(extracted_dict: dict) -> dict:
+    """
+    Rearranges the parser's dict into the nesting of URLAData using
+    EXTRACTED_DICT_ROUTES. Each additional borrower is reshaped the same way
+    and keeps only its "borrower" part.
+    """
+    reshaped = _reshape(extracted_dict)
+    additional = extracted_dict.get("additional_borrowers")
+    if additional:
+        reshaped["additional_borrowers"] = [_reshape(borrower).get("borrower", {}) for borrower in additional]
+    return reshaped
+
+def urla_from_extracted_dict(extracted_dict: dict) -> URLAData:
+    """Builds the URLAData data model from the dictionary returned by the parser."""
+    return from_dict(URLAData, reshape_extracted_dict(extracted_dict))
@@ -0,0 +1,80 @@
+# src/metrics.py
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+@dataclass
+class DocumentMetrics:
+    """
+    Structured metrics record for one document: wall and CPU seconds per
+    pipeline stage ("open", "forms", "extract_text", "regex", "populate",
+    "serialize") and per section regex group, plus page count and text length.
+    With profile=True, profiled() also collects a cProfile summary and the
+    tracemalloc peak.
+    """
+    source: Optional[str] = None
+    method: Optional[str] = None
+    page_count: Optional[int] = None
+    text_length: Optional[int] = None
+    stages: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    sections: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    profile: bool = False
+    profile_report: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def _add(bucket: Dict[str, Dict[str, float]], name: str, wall: float, cpu: float) -> None:
+        entry = bucket.setdefault(name, {"wall": 0.0, "cpu": 0.0})
+        entry["wall"] += wall
+        entry["cpu"] += cpu
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Adds the wall and CPU time of the block to stage name (repeated stages accumulate)."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self._add(self.stages, name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def add_section(self, section: str, wall: float, cpu: float) -> None:
+        self._add(self.sections, section, wall, cpu)
+
+    @contextmanager
+    def profiled(self, top: int = 15) -> Iterator[None]:
+        """Runs the block under cProfile and tracemalloc when profile is set."""
+        if not self.profile:
+            yield
+            return
+        profiler = cProfile.Profile()
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+            self.profile_report = {"peak_memory_bytes": peak, "cumulative_top": out.getvalue()}
+
+    def as_dict(self) -> Dict[str, Any]:
+        rounded = lambda bucket: {k: {t: round(v, 6) for t, v in times.items()} for k, times in bucket.items()}
+        record = {"source": self.source, "method": self.method, "page_count": self.page_count,
+                  "text_length": self.text_length, "stages": rounded(self.stages), "sections": rounded(self.sections)}
+        if self.profile_report is not None:
+            record["profile"] = self.profile_report
+        return record
+
+def stage(metrics: Optional[DocumentMetrics], name: str) -> ContextManager[None]:
+    """metrics.stage(name), or a no-op when metrics are not being collected."""
+    return metrics.stage(name) if metrics is not None else nullcontext()
@@ -0,0 +1,135 @@
+# src/ocr.py
+import atexit
+import hashlib
+import io
+import multiprocessing
+import os
+import shutil
+import subprocess
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from src.cache import ResultCache
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+# Bump when the rendering or Tesseract settings change, so cached page text is redone.
+OCR_VERSION = "1"
+TESSERACT_CMD = os.environ.get("TESSERACT_CMD", "tesseract")
+
+class ScannedDocumentError(ValueError):
+    """The document has image-only pages but no text could be extracted or recognised."""
+
+def is_image_only(page: Any) -> bool:
+    """True for a page with no text layer but at least one image (a scan)."""
+    return not page.chars and bool(page.images)
+
+def page_image_hash(page: Any) -> str:
+    """
+    SHA-256 of a page's content streams and the raw data of its images. Scans
+    share near-identical content streams ("draw image Im0"), so the image
+    bytes are what tells two scanned pages apart.
+    """
+    from pdfminer.pdftypes import resolve1
+    digest = hashlib.sha256(repr(page.page_obj.mediabox).encode("ascii"))
+    for ref in page.page_obj.contents:
+        stream = resolve1(ref)
+        digest.update(stream.get_data() if hasattr(stream, "get_data") else b"")
+    for image in page.images:
+        digest.update(image["stream"].get_rawdata() or b"")
+    return digest.hexdigest()
+
+def ocr_page(source: Union[str, bytes], page_index: int, resolution: int = 300, lang: str = "eng",
+             timeout: Optional[float] = 120) -> str:
+    """Renders one page (pypdfium2, via pdfplumber) and runs Tesseract on it. Runs in an OCR worker."""
+    from src.pdf_parser import _pdfplumber
+    with _pdfplumber().open(source if isinstance(source, str) else io.BytesIO(source)) as pdf:
+        image = pdf.pages[page_index].to_image(resolution=resolution).original
+    png = io.BytesIO()
+    image.convert("L").save(png, format="PNG")
+    # --psm 4: one column of variable-size lines, closest to the form's label/value rows.
+    completed = subprocess.run([TESSERACT_CMD, "stdin", "stdout", "-l", lang, "--psm", "4"], input=png.getvalue(),
+                               capture_output=True, check=True, timeout=timeout)
+    return completed.stdout.decode("utf-8", errors="replace")
+
+def _in_worker() -> bool:
+    """True inside a worker process (batch runner, service, page workers)."""
+    return multiprocessing.parent_process() is not None
+
+class OcrEngine:
+    """
+    Local OCR fallback for scanned pages. Pages are rendered and recognised
+    in a separate process pool (created on first use and reused), and the
+    recognised text is cached per page_image_hash() so rescans and resubmitted
+    bundles containing the same scanned pages are not recognised twice.
+    Inside a worker process, or for a single page, pages are recognised
+    inline instead: the surrounding pool already keeps the CPUs busy, and a
+    pool per worker would start workers x CPUs processes.
+    """
+
+    def __init__(self, workers: Optional[int] = None, cache: Optional[ResultCache] = None,
+                 resolution: int = 300, lang: str = "eng", executor: Optional["Executor"] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.resolution = resolution
+        self.lang = lang
+        self._executor = executor
+
+    @staticmethod
+    def available() -> bool:
+        return shutil.which(TESSERACT_CMD) is not None
+
+    def _version(self) -> str:
+        return f"{OCR_VERSION}-{self.lang}-{self.resolution}"
+
+    def recognize(self, source: Union[str, bytes], pages: Dict[int, str]) -> Dict[int, str]:
+        """
+        OCR text for {page index: page hash}. Cached pages are served from the
+        cache; the rest are recognised (in parallel unless running inline,
+        see OcrEngine) and then cached.
+        """
+        texts: Dict[int, str] = {}
+        missing: List[int] = []
+        for index, page_hash in pages.items():
+            cached = self.cache.get(page_hash, "ocr", self._version()) if self.cache is not None else None
+            if cached is None:
+                missing.append(index)
+            else:
+                texts[index] = cached
+        if not missing:
+            return texts
+        if self._executor is None and (self.workers == 1 or len(missing) == 1 or _in_worker()):
+            recognized = {index: ocr_page(source, index, self.resolution, self.lang) for index in missing}
+        else:
+            if self._executor is None:
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            futures = {index: self._executor.submit(ocr_page, source, index, self.resolution, self.lang)
+                       for index in missing}
+            recognized = {index: future.result() for index, future in futures.items()}
+        for index, text in recognized.items():
+            texts[index] = text
+            if self.cache is not None:
+                self.cache.put(pages[index], "ocr", self._version(), text)
+        return texts
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+_DEFAULT_ENGINES: Dict[Optional[str], OcrEngine] = {}
+
+def default_ocr_engine(cache: Optional[ResultCache] = None) -> OcrEngine:
+    """One shared engine (and worker pool) per cache directory."""
+    key = cache.cache_dir if cache is not None else None
+    if key not in _DEFAULT_ENGINES:
+        _DEFAULT_ENGINES[key] = OcrEngine(cache=cache)
+    return _DEFAULT_ENGINES[key]
+
+@atexit.register
+def _close_default_engines() -> None:
+    """Shuts down the worker pools of the shared engines at interpreter exit."""
+    for engine in _DEFAULT_ENGINES.values():
+        engine.close()
+    _DEFAULT_ENGINES.clear()
@@ -0,0 +1,331 @@
+# src/output.py
+import abc
+import dataclasses
+import hashlib
+import hmac
+import json
+import re
+import sys
+import typing
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional fast encoder
+    orjson = None
+
+# --- Precomputed dataclass serializers ---
+_SERIALIZERS: Dict[type, Callable[[Any], dict]] = {}
+
+def _plain(value: Any) -> Any:
+    """Fallback for values whose declared type does not say what they hold."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return get_serializer(type(value))(value)
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+def _converter(hint: Any) -> Optional[Callable[[Any], Any]]:
+    """Returns a converter for a field type, or None when the value is stored as is."""
+    origin = typing.get_origin(hint)
+    args = typing.get_args(hint)
+    if origin is Union:
+        inner = [a for a in args if a is not type(None)]
+        if len(inner) == 1:
+            convert = _converter(inner[0])
+            return None if convert is None else (lambda v: None if v is None else convert(v))
+        return _plain
+    if dataclasses.is_dataclass(hint):
+        return lambda v: get_serializer(hint)(v)
+    if origin is list:
+        item = _converter(args[0]) if args else _plain
+        return list if item is None else (lambda v: [item(x) for x in v])
+    if origin is dict:
+        value = _converter(args[1]) if len(args) == 2 else _plain
+        return dict if value is None else (lambda v: {k: value(x) for k, x in v.items()})
+    if hint in (int, float, str, bool):
+        return None
+    return _plain
+
+def get_serializer(cls: type) -> Callable[[Any], dict]:
+    """
+    Returns a function turning an instance of the dataclass cls into a plain
+    dict. The field list and one converter per field are worked out from the
+    type hints once per class, so serializing an object does no
+    dataclasses.fields() reflection.
+    """
+    serializer = _SERIALIZERS.get(cls)
+    if serializer is not None:
+        return serializer
+
+    hints = typing.get_type_hints(cls)
+    plan = [(f.name, _converter(hints.get(f.name, Any))) for f in dataclasses.fields(cls)]
+
+    def serializer(obj: Any) -> dict:
+        out = {}
+        for name, convert in plan:
+            value = getattr(obj, name)
+            out[name] = value if convert is None or value is None else convert(value)
+        return out
+
+    _SERIALIZERS[cls] = serializer
+    return serializer
+
+def dataclass_to_dict(obj: Any) -> Any:
+    """
+    Converts a (nested) dataclass object into plain dicts and lists so it can be
+    passed to a JSON encoder.
+    """
+    return _plain(obj)
+
+# --- PII redaction ---
+_REDACTION_PLANS: Dict[type, Optional[Callable[[dict, "Redactor"], dict]]] = {}
+REDACTION_MODES = ("mask", "hash")
+
+def _digits(value: str) -> str:
+    return "".join(c for c in value if c.isdigit())
+
+def _alnum(value: str) -> str:
+    return "".join(c for c in value if c.isalnum()).upper()
+
+# "(248) 333-1234 Ext. 211", "... x211": the extension is not part of the number.
+_PHONE_EXTENSION_RE = re.compile(r"\s*(?:ext\.?|extension|x)\s*\d+\s*$", re.IGNORECASE)
+
+def _phone_digits(value: str) -> str:
+    return _digits(_PHONE_EXTENSION_RE.sub("", value))
+
+def _last_four(value: str, prefix: str) -> str:
+    return prefix + (value[-4:] if len(value) > 4 else "****")
+
+# Masks keep what analytics can use without identifying anyone: the last
+# four digits of numbers and the domain of an email address.
+_MASKS: Dict[str, Callable[[str], str]] = {
+    "ssn": lambda v: _last_four(_digits(v), "***-**-"),
+    "account_number": lambda v: _last_four(_alnum(v), "****"),
+    "phone": lambda v: _last_four(_phone_digits(v), "(***) ***-"),
+    "email": lambda v: "***@" + v.rpartition("@")[2].lower() if "@" in v else "***",
+}
+# Differently written equal values (dashes, spaces, case) hash to the same token.
+_NORMALIZE: Dict[str, Callable[[str], str]] = {
+    "ssn": _digits, "account_number": _alnum, "phone": _phone_digits, "email": lambda v: v.strip().casefold(),
+}
+
+class Redactor:
+    """
+    Replaces the values of data model fields marked {"pii": kind} (SSNs,
+    account numbers, phones, emails). mode "mask" keeps the last four digits
+    ("***-**-6789") or the email domain; mode "hash" writes an HMAC-SHA256
+    token under key, so the same person or account gets the same token
+    across documents and batches (joins and dedupes still work) while the
+    value cannot be recovered without the key. Results are memoized per
+    value, so the SSNs and accounts repeated across a batch are done once.
+    """
+
+    def __init__(self, mode: str = "mask", key: Optional[bytes] = None, memo_size: int = 100_000):
+        if mode not in REDACTION_MODES:
+            raise ValueError(f"Unknown redaction mode '{mode}'")
+        if mode == "hash" and not key:
+            raise ValueError("keyed hashing needs a key")
+        self.mode = mode
+        self.key = key
+        self.memo_size = memo_size
+        self._memo: Dict[Tuple[str, str], str] = {}
+
+    def redact(self, kind: str, value: Any) -> str:
+        value = str(value)
+        redacted = self._memo.get((kind, value))
+        if redacted is None:
+            if self.mode == "hash":
+                normalized = _NORMALIZE.get(kind, str)(value)
+                redacted = hmac.new(self.key, f"{kind}:{normalized}".encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+            else:
+                redacted = _MASKS.get(kind, lambda v: "***")(value)
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[(kind, value)] = redacted
+        return redacted
+
+    def redact_record(self, record: Any) -> Any:
+        """
+        Redacted, plain form of an output record: a dataclass object, or a
+        batch runner record whose "data" is a serialized URLAData. Only the
+        dicts on the way to a PII field are copied; the input is not changed.
+        """
+        if dataclasses.is_dataclass(record) and not isinstance(record, type):
+            plan = get_redaction_plan(type(record))
+            data = get_serializer(type(record))(record)
+            return data if plan is None else plan(data, self)
+        if isinstance(record, dict) and isinstance(record.get("data"), dict):
+            from src.data_models import URLAData
+            return {**record, "data": get_redaction_plan(URLAData)(record["data"], self)}
+        return record
+
+def _dataclass_of(hint: Any) -> Tuple[Optional[type], bool]:
+    """The dataclass a field holds (directly, Optional or as a List of it) and whether it is a list."""
+    origin, args = typing.get_origin(hint), typing.get_args(hint)
+    if origin is Union:
+        inner = [a for a in args if a is not type(None)]
+        return _dataclass_of(inner[0]) if len(inner) == 1 else (None, False)
+    if origin is list and args:
+        return _dataclass_of(args[0])[0], True
+    return (hint, False) if dataclasses.is_dataclass(hint) else (None, False)
+
+def get_redaction_plan(cls: type) -> Optional[Callable[[dict, Redactor], dict]]:
+    """
+    Returns a function redacting the serialized (get_serializer) dict of the
+    dataclass cls, or None when no field of cls or its nested dataclasses is
+    marked as PII. Like the serializers, the plan is worked out from the
+    field metadata and type hints once per class, and it only descends into
+    the fields that lead to PII.
+    """
+    if cls in _REDACTION_PLANS:
+        return _REDACTION_PLANS[cls]
+    hints = typing.get_type_hints(cls)
+    leaves: List[Tuple[str, str]] = []
+    branches: List[Tuple[str, Callable[[dict, Redactor], dict], bool]] = []
+    for f in dataclasses.fields(cls):
+        kind = f.metadata.get("pii")
+        if kind:
+            leaves.append((f.name, kind))
+            continue
+        nested, is_list = _dataclass_of(hints.get(f.name, Any))
+        plan = get_redaction_plan(nested) if nested is not None else None
+        if plan is not None:
+            branches.append((f.name, plan, is_list))
+
+    def redact(data: dict, redactor: Redactor) -> dict:
+        out = dict(data)
+        for name, kind in leaves:
+            if out.get(name) is not None:
+                out[name] = redactor.redact(kind, out[name])
+        for name, plan, is_list in branches:
+            value = out.get(name)
+            if is_list and value:
+                out[name] = [plan(v, redactor) if isinstance(v, dict) else v for v in value]
+            elif isinstance(value, dict):
+                out[name] = plan(value, redactor)
+        return out
+
+    _REDACTION_PLANS[cls] = redact if leaves or branches else None
+    return _REDACTION_PLANS[cls]
+
+def _encodable(record: Any) -> Any:
+    # Records that are already plain dicts (the batch runner's) are not walked again.
+    if dataclasses.is_dataclass(record) and not isinstance(record, type):
+        return get_serializer(type(record))(record)
+    return record
+
+# --- JSON encoding ---
+def encode_json(obj: Any, fast: bool = True) -> bytes:
+    """Compact JSON as UTF-8 bytes, using orjson when it is installed."""
+    if fast and orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+# --- Output sinks ---
+class RecordSink(abc.ABC):
+    """
+    Anything the batch runner can write result records to: write() takes one
+    record, flush() makes the records written so far durable, close()
+    flushes and releases the target. count is the number of records taken.
+    """
+    count: int = 0
+
+    @abc.abstractmethod
+    def write(self, record: Any) -> None:
+        ...
+
+    @abc.abstractmethod
+    def flush(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        ...
+
+    def __enter__(self) -> "RecordSink":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+class OutputSink(RecordSink):
+    """
+    Incremental writer for result records. Encoded records are collected in a
+    buffer that is flushed to the stream once it exceeds buffer_size bytes,
+    so a batch never holds more than one buffer of output in memory. With
+    append, an existing output file is continued rather than replaced; with
+    a redactor, PII fields are redacted as each record is encoded.
+    """
+
+    def __init__(self, target: Union[str, IO[bytes]] = "-", buffer_size: int = 256 * 1024, fast: bool = True,
+                 append: bool = False, redactor: Optional[Redactor] = None):
+        if isinstance(target, str):
+            self._stream = sys.stdout.buffer if target == "-" else open(target, "ab" if append else "wb")
+            self._owns_stream = target != "-"
+        else:
+            self._stream, self._owns_stream = target, False
+        self.buffer_size = buffer_size
+        self.fast = fast
+        self.redactor = redactor
+        self.count = 0
+        self._buffer: list = []
+        self._buffered = 0
+
+    def _emit(self, chunk: bytes) -> None:
+        self._buffer.append(chunk)
+        self._buffered += len(chunk)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def _prepare(self, record: Any) -> Any:
+        return self.redactor.redact_record(record) if self.redactor is not None else _encodable(record)
+
+    @abc.abstractmethod
+    def write(self, record: Any) -> None:
+        ...
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._stream.write(b"".join(self._buffer))
+            self._buffer, self._buffered = [], 0
+        self._stream.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owns_stream:
+            self._stream.close()
+
+class NDJSONSink(OutputSink):
+    """One compact JSON document per line."""
+
+    def write(self, record: Any) -> None:
+        self._emit(encode_json(self._prepare(record), self.fast) + b"\n")
+        self.count += 1
+
+class JSONArraySink(OutputSink):
+    """A single JSON array, written element by element."""
+
+    def write(self, record: Any) -> None:
+        self._emit((b"[" if self.count == 0 else b",\n") + encode_json(self._prepare(record), self.fast))
+        self.count += 1
+
+    def close(self) -> None:
+        self._emit(b"[]\n" if self.count == 0 else b"]\n")
+        super().close()
+
+SINKS: Dict[str, type] = {"ndjson": NDJSONSink, "json": JSONArraySink}
+
+def open_sink(target: Union[str, IO[bytes]] = "-", format: str = "ndjson", **kwargs: Any) -> RecordSink:
+    """
+    Creates the sink registered for format ("ndjson" or "json") writing to
+    target. "sqlite" stores the records in a ResultStore file (src/store.py).
+    """
+    if format == "sqlite":
+        from src.store import StoreSink
+        return StoreSink(target, **kwargs)
+    if format not in SINKS:
+        raise ValueError(f"Unknown output format '{format}'")
+    return SINKS[format](target, **kwargs)
@@ -1,15 +1,130 @@
 # src/pdf_parser.py
-import pdfplumber
+import copy
+import io
 import re
-from typing import Dict, List
+import time
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Match, Optional, Pattern, Set, Tuple, Union
 
-def extract_borrower_personal_info(pdf_path: str) -> dict:
+from src.form_fields import map_form_fields, read_form_fields
+from src.diagnostics import DocumentDiagnostics
+from src.metrics import DocumentMetrics, stage
+from src.ocr import OcrEngine, ScannedDocumentError, default_ocr_engine, is_image_only, page_image_hash
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from src.templates import UrlaTemplate
+
+def _pdfplumber() -> Any:
     """
-    Extracts information from all sections of the URLA PDF based on raw text analysis.
-    This version uses highly specific anchors for each field to handle jumbled text.
+    pdfplumber (and pdfminer under it) is imported on first use rather than with
+    this module: it is most of the package's import time, and cache hits and
+    the daemon client never open a PDF.
+    """
+    import pdfplumber
+    return pdfplumber
+
+# Version tags for cached results: bump TEXT_VERSION when the pdfplumber text
+# extraction settings change and PARSER_VERSION when the field specs (or the
+# URLAData population) change.
+TEXT_VERSION = "1"
+PARSER_VERSION = "5"
+
+# --- URLA page/region layout ---
+# Page index and (x0, top, x1, bottom) region of every section on the 1/2021
+# URLA layout (612 x 792 pt pages). Regions start just above the section header
+# so the cropped text still begins with it and split_sections() finds it.
+URLA_PAGE_SIZE = (612, 792)
+URLA_LAYOUT: Dict[str, List[Tuple[int, Tuple[float, float, float, float]]]] = {
+    "1": [(0, (0, 120, 612, 158))],
+    "1a": [(0, (0, 158, 612, 569))],
+    "1b": [(0, (0, 569, 612, 792))],
+    "1c": [(1, (0, 0, 612, 218))],
+    "1d": [(1, (0, 218, 612, 387))],
+    "1e": [(1, (0, 387, 612, 792))],
+    "2": [(2, (0, 0, 612, 90))],
+    "2a": [(2, (0, 90, 612, 271))],
+    "2b": [(2, (0, 271, 612, 447))],
+    "2c": [(2, (0, 447, 612, 611))],
+    "2d": [(2, (0, 611, 612, 792))],
+    "3": [(3, (0, 0, 612, 74))],
+    "3a": [(3, (0, 74, 612, 288))],
+    "3b": [(3, (0, 288, 612, 504))],
+    "3c": [(3, (0, 504, 612, 792))],
+    "4": [(4, (0, 0, 612, 75))],
+    "4a": [(4, (0, 75, 612, 236))],
+    "4b": [(4, (0, 236, 612, 340))],
+    "4c": [(4, (0, 340, 612, 430))],
+    "4d": [(4, (0, 430, 612, 792))],
+    "5": [(5, (0, 0, 612, 77))],
+    "5a": [(5, (0, 77, 612, 345))],
+    "5b": [(5, (0, 345, 612, 792))],
+    "6": [(6, (0, 0, 612, 792))],
+    "7": [(7, (0, 0, 612, 191))],
+    "8": [(7, (0, 191, 612, 792))],
+    "9": [(8, (0, 0, 612, 792))],
+}
+
+def resolve_sections(sections: Optional[Iterable[str]]) -> Optional[Set[str]]:
+    """
+    Expands requested sections into layout keys: "1" selects "1" and "1a".."1e",
+    "4a" selects only that subsection. None means the whole document.
+    """
+    if sections is None:
+        return None
+    keys = set()
+    for section in sections:
+        section = str(section).strip()
+        matched = {key for key in URLA_LAYOUT if key == section or (section.isdigit() and key[:-1] == section and not key.isdigit())}
+        if not matched:
+            raise ValueError(f"Unknown URLA section '{section}'")
+        keys |= matched
+    return keys
+
+def _layout_regions(keys: Set[str], layout: Optional[dict] = None) -> List[Tuple[int, Tuple[float, float, float, float]]]:
+    """Regions for the given keys in document order (of layout, URLA_LAYOUT by default), merging vertically adjacent ones."""
+    layout = URLA_LAYOUT if layout is None else layout
+    regions = sorted((page, bbox) for key in keys for page, bbox in layout.get(key, ()))
+    merged: List[Tuple[int, Tuple[float, float, float, float]]] = []
+    for page, bbox in regions:
+        if merged and merged[-1][0] == page and merged[-1][1][3] >= bbox[1]:
+            prev = merged[-1][1]
+            merged[-1] = (page, (prev[0], prev[1], prev[2], max(prev[3], bbox[3])))
+        else:
+            merged.append((page, bbox))
+    return merged
+
+# --- Section splitting ---
+# URLA section headers sit at the start of a line: "Section 2: ..." or "1b. ...".
+SECTION_HEADER_RE = re.compile(r"^(?:Section (\d+):|(\d[a-e])\.)", re.MULTILINE)
+SECTION_ORDER = {key: i for i, key in enumerate(URLA_LAYOUT)}
+# Printed in the footer of every URLA page; tells the form apart from the
+# statements and disclosures it is bundled with.
+URLA_PAGE_MARKER = "Uniform Residential Loan Application"
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    Declarative description of one extracted field.
+    `section` is the key of the section span the pattern runs against, `path`
+    the location in the extracted dict and `convert` turns the match into a value.
+    mode: "set" assigns the value, "update" merges a dict of values, "append"
+    appends it to a list (unless it is None) and "extend" appends one value
+    per match (finditer), so table rows cost one regex step each.
+    If the section header is not found, the pattern runs against the whole
+    text when `fallback` is set, otherwise the field is skipped.
     """
-    # Initialize the main data structure
-    extracted_data = {
+    name: str
+    section: str
+    path: Tuple[str, ...]
+    pattern: Pattern[str]
+    convert: Callable[[Match[str]], Any]
+    mode: str = "set"
+    fallback: bool = True
+
+def _new_extracted_data() -> dict:
+    """Returns the empty dict skeleton filled in by the parser."""
+    return {
         "borrower_info": {"dependents": {}, "contact_info": {}, "current_address": {}},
         "employment_info": {
             "current_employment": {"gross_monthly_income": {}, "address": {}, "how_long_in_work": {}},
@@ -21,72 +136,653 @@ def extract_borrower_personal_info(pdf_path: str) -> dict:
         "other_new_mortgage_loans": [], "rental_income_on_property": {}, "gifts_grants": [],
         "declarations": {}, "military_service": {},
         "demographic_info": {"ethnicity": [], "race": [], "do_not_wish_to_provide": {}},
-        "loan_originator_info": {}
+        "loan_originator_info": {}, "additional_borrowers": []
     }
 
+# --- Converters ---
+def _text(m: Match[str]) -> str:
+    return m.group(1).strip()
+
+def _digits(m: Match[str]) -> str:
+    return m.group(1).replace('–', '-').replace(' ', '').strip()
+
+def _no_spaces(m: Match[str]) -> str:
+    return m.group(1).replace(" ", "")
+
+def _amount(m: Match[str]) -> float:
+    return float(m.group(1).replace(",", ""))
+
+def _monthly_amount(m: Match[str]) -> float:
+    return float(m.group(1).replace(",", "").split('/')[0])
+
+def _phone(m: Match[str]) -> str:
+    return f"({m.group(1)}) {m.group(2).replace('–', '-').replace(' ', '').strip()}"
+
+def _constant(value: Any) -> Callable[[Match[str]], Any]:
+    return lambda m: value
+
+def _address(m: Match[str]) -> dict:
+    return dict(zip(("street", "unit", "city", "state", "zip", "country"), [s.strip() for s in m.groups()]))
+
+def _years_months(years_key: str, months_key: str) -> Callable[[Match[str]], dict]:
+    return lambda m: {years_key: int(m.group(1)), months_key: int(m.group(2))}
+
+def _employment_specs(section_id: str, emp_key: str) -> List[FieldSpec]:
+    """Field specs for one employment block (1b current, 1c additional)."""
+    emp = ("employment_info", emp_key)
+    income = emp + ("gross_monthly_income",)
+    specs = [
+        FieldSpec("employer_name", section_id, emp + ("employer_name",), re.compile(r"Employer or Business Name\s+([^\s]+)"), lambda m: m.group(1)),
+        FieldSpec("phone", section_id, emp + ("phone",), re.compile(r"Phone\s+\(([\d\s]+)\)\s+([\d\s–]+)"),
+                  lambda m: f"({m.group(1).strip()}) {m.group(2).replace('–','-').replace(' ','').strip()}"),
+        FieldSpec("position_title", section_id, emp + ("position_title",), re.compile(r"Position or Title\s+([^\n]+?)(?=\s+Check)"), _text),
+        FieldSpec("start_date", section_id, emp + ("start_date",), re.compile(r"Start Date\s+([^\(]+)"), _no_spaces),
+        FieldSpec("how_long_in_work", section_id, emp + ("how_long_in_work",), re.compile(r"How long in this line of work\?\s+(\d+)\s+Years\s+(\d+)\s+Months"),
+                  _years_months("years", "months"), mode="update"),
+    ]
+    for label in ("Base", "Overtime", "Bonus", "Commission"):
+        specs.append(FieldSpec(label.lower(), section_id, income + (label.lower(),), re.compile(fr"{label}\s+\$\s+([\d,./]+)"), _monthly_amount))
+    specs.append(FieldSpec("address", section_id, emp + ("address",),
+                           re.compile(r"Street\s+([^\n]+?)\s+Unit #\s+([^\n]+)\nCity\s+([^\n]+?)\s+State\s+([A-Z]{2})\s+ZIP\s+(\d+)\s+Country\s+([A-Z]+)"),
+                           _address, mode="update"))
+    return [FieldSpec(f"{emp_key}.{s.name}", s.section, s.path, s.pattern, s.convert, s.mode, fallback=False) for s in specs]
+
+# --- Table rows ---
+# Row types of the form's pick lists, longest alternatives first where one is a prefix.
+_ACCOUNT_TYPES = ("Checking|Savings|Money Market|Certificate of Deposit|Mutual Fund|Stock Options|Stocks|Bonds|Retirement|"
+                  "Bridge Loan Proceeds|Individual Development Account|Trust Account|Cash Value of Life Insurance")
+_ASSET_CREDIT_TYPES = ("Proceeds from Real Estate Property to be sold on or before closing|Proceeds from Sale of Non-Real Estate Asset|"
+                       "Secured Borrowed Funds|Unsecured Borrowed Funds|Earnest Money|Employer Assistance|Lot Equity|"
+                       "Relocation Funds|Rent Credit|Sweat Equity|Trade Equity|Other")
+_LIABILITY_TYPES = "Revolving|Installment|Open 30-Day|Lease|Other"
+_OTHER_LIABILITY_TYPES = "Alimony|Child Support|Separate Maintenance|Job Related Expenses|Other Monthly Payment|Other"
+# One money cell after its "$": digits, nothing (an empty cell) or an unreadable value.
+_CELL = r"([^\s$]*)"
+
+_PROPERTY_ADDRESS_RE = re.compile(r"Address Street +([^\n]+?) +Unit #[ ]*([^\n]*)\nCity +([^\n]+?) +State +([A-Z]{2}) +ZIP +(\d+) +Country +([^\n]+)")
+_PROPERTY_VALUES_RE = re.compile(r"^\$ ?([\d,.]+) (Sold|Pending Sale|Retained) (Primary Residence|Second Home|Investment|Other)"
+                                 fr" \$ ?{_CELL} \$ ?{_CELL} \$ ?{_CELL}$", re.M)
+_PROPERTY_MORTGAGE_RE = re.compile(fr"^(.+?) (\S+) \$ ?{_CELL} \$ ?{_CELL}( 4)? (FHA|VA|Conventional|USDA-RD|Other) \$ ?{_CELL}$", re.M)
+
+def _cell_amount(value: str) -> Optional[float]:
+    """A money cell as a float; None for an empty or unreadable cell (e.g. OCR noise)."""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            full_text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text(x_tolerance=1)
-                if page_text:
-                    full_text += page_text + "\n"
-
-            # --- Section 1: Borrower Info ---
-            if m := re.search(r"Name \(First, Middle, Last, Suffix\).*?\n.*?\n([^\n]+)", full_text): extracted_data["borrower_info"]["name"] = m.group(1).strip()
-            if m := re.search(r"Social Security Number\s+([\d\s–-]+)", full_text): extracted_data["borrower_info"]["social_security_number"] = m.group(1).replace('–', '-').replace(' ', '').strip()
-            if m := re.search(r"Alternate Names[^\n]+\n([^\n]+)", full_text): extracted_data["borrower_info"]["alternate_names"] = m.group(1).strip()
-            if m := re.search(r"T\.A\.\s+([\d\s/]+)\s+Permanent", full_text): extracted_data["borrower_info"]["date_of_birth"] = m.group(1).replace(" ", "")
-            if re.search(r"4 U\.S\. Citizen", full_text): extracted_data["borrower_info"]["citizenship"] = "U.S. Citizen"
-            if re.search(r"4 Unmarried", full_text): extracted_data["borrower_info"]["marital_status"] = "Unmarried"
-            if m := re.search(r"Email\s+([\w.@]+)", full_text): extracted_data["borrower_info"]["contact_info"]["email"] = m.group(1).strip()
-            if m := re.search(r"Home Phone\s+\(.*?(\d{3}).*?([\d\s–]+)", full_text): extracted_data["borrower_info"]["contact_info"]["home_phone"] = f"({m.group(1)}) {m.group(2).replace('–', '-').replace(' ', '').strip()}"
-            if m := re.search(r"Cell Phone\s+\(.*?(\d{3}).*?([\d\s–]+)", full_text): extracted_data["borrower_info"]["contact_info"]["cell_phone"] = f"({m.group(1)}) {m.group(2).replace('–', '-').replace(' ', '').strip()}"
-            if m := re.search(r"Work Phone\s+\(.*?(\d{3}).*?(\d{3}).*?(\d{4}).*?Ext\.\s*(\d+)", full_text): extracted_data["borrower_info"]["contact_info"]["work_phone"] = f"({m.group(1)}) {m.group(2)}-{m.group(3)} Ext. {m.group(4)}"
-            if m := re.search(r"Current Address\nStreet\s+([\w\s.]+)\s+Unit #\s+([\w\d]+)\nCity\s+([\w\s]+)\s+State\s+(\w{2})\s+ZIP\s+(\d+)\s+Country\s+(\w+)", full_text):
-                addr = extracted_data["borrower_info"]["current_address"]
-                addr["street"], addr["unit"], addr["city"], addr["state"], addr["zip"], addr["country"] = [s.strip() for s in m.groups()]
-            if m := re.search(r"How Long at Current Address\?\s+(\d+)\s+Years\s+(\d+)\s+Months", full_text):
-                extracted_data["borrower_info"]["current_address"]["how_long_years"], extracted_data["borrower_info"]["current_address"]["how_long_months"] = int(m.group(1)), int(m.group(2))
-            if re.search(r"Housing No primary housing expense\s+4\s+Own", full_text): extracted_data["borrower_info"]["current_address"]["housing_expense"] = "Own"
-
-            # --- Sections 1b & 1c: Employment ---
-            for section_id, emp_key in [("1b", "current_employment"), ("1c", "additional_employment")]:
-                if emp_block_match := re.search(fr"{section_id}\.([\s\S]+?)(?=\n1[c-e]\.|\nSection 2:)", full_text):
-                    emp_block = emp_block_match.group(1)
-                    emp_data = extracted_data["employment_info"][emp_key]
-                    if m := re.search(r"Employer or Business Name\s+([^\s]+)", emp_block): emp_data["employer_name"] = m.group(1)
-                    if m := re.search(r"Phone\s+\(([\d\s]+)\)\s+([\d\s–]+)", emp_block): emp_data["phone"] = f"({m.group(1).strip()}) {m.group(2).replace('–','-').replace(' ','').strip()}"
-                    if m := re.search(r"Position or Title\s+([^\n]+?)(?=\s+Check)", emp_block): emp_data["position_title"] = m.group(1).strip()
-                    if m := re.search(r"Start Date\s+([^\(]+)", emp_block): emp_data["start_date"] = m.group(1).replace(" ", "")
-                    if m := re.search(r"How long in this line of work\?\s+(\d+)\s+Years\s+(\d+)\s+Months", emp_block):
-                        emp_data["how_long_in_work"]["years"], emp_data["how_long_in_work"]["months"] = int(m.group(1)), int(m.group(2))
-                    income = emp_data["gross_monthly_income"]
-                    if m := re.search(r"Base\s+\$\s+([\d,./]+)", emp_block): income["base"] = float(m.group(1).replace(",", "").split('/')[0])
-                    if m := re.search(r"Overtime\s+\$\s+([\d,./]+)", emp_block): income["overtime"] = float(m.group(1).replace(",", "").split('/')[0])
-                    if m := re.search(r"Bonus\s+\$\s+([\d,./]+)", emp_block): income["bonus"] = float(m.group(1).replace(",", "").split('/')[0])
-                    if m := re.search(r"Commission\s+\$\s+([\d,./]+)", emp_block): income["commission"] = float(m.group(1).replace(",", "").split('/')[0])
-                    if m := re.search(r"Street\s+([^\n]+?)\s+Unit #\s+([^\n]+)\nCity\s+([^\n]+?)\s+State\s+([A-Z]{2})\s+ZIP\s+(\d+)\s+Country\s+([A-Z]+)", emp_block):
-                        addr = emp_data["address"]
-                        addr["street"], addr["unit"], addr["city"], addr["state"], addr["zip"], addr["country"] = [s.strip() for s in m.groups()]
-
-            # --- Section 1e: Other Income ---
-            if m := re.search(r"Social Security\s+\$\s+([\d,]+)", full_text):
-                extracted_data["other_income_sources"].append({"source": "Social Security", "monthly_income": float(m.group(1).replace(",", ""))})
-
-            # --- Section 2: Assets & Liabilities ---
-            asset_rows = re.findall(r"\n(Checking|Savings|Stocks)\s+([\w\s]+)\s+([\d-]+)\s+\$\s+([\d,]+)", full_text)
-            for row in asset_rows:
-                extracted_data["assets"]["bank_retirement_other"].append({"account_type": row[0], "financial_institution": row[1].strip(), "account_number": row[2], "cash_or_market_value": float(row[3].replace(",", ""))})
-            if m := re.search(r"Earnest Money\s+\$\s+([\d,]+)", full_text):
-                extracted_data["assets"]["other_assets_credits"].append({"asset_or_credit_type": "Earnest Money", "cash_or_market_value": float(m.group(1).replace(",", ""))})
-
-            # --- Section 4: Loan and Property ---
-            loan_info = extracted_data["loan_property_info"]
-            if m := re.search(r"Loan Amount\s+\$\s([\d,]+)", full_text): loan_info["loan_amount"] = float(m.group(1).replace(",", ""))
-            if re.search(r"Loan Purpose\s+4\s+Purchase", full_text): loan_info["loan_purpose"] = "Purchase"
+        return float(value.replace(",", ""))
+    except ValueError:
+        return None
+
+def _checked_option(first_mark: Optional[str], first: str, second_mark: Optional[str], second: str) -> Optional[str]:
+    """The label of a two-option checkbox pair whose "4" check mark was captured."""
+    return first if first_mark else second if second_mark else None
+
+def _property(m: Match[str]) -> Optional[dict]:
+    """
+    One Section 3 property block (m spans the rest of its section): address,
+    the value/status/occupancy row and the mortgage rows under it. Returns
+    None for a blank block, which apply_field_specs skips.
+    """
+    text, start, end = m.string, m.start(), m.end()
+    address = _PROPERTY_ADDRESS_RE.match(text, start, end)
+    if not address:
+        return None
+    prop: Dict[str, Any] = {"address": _address(address), "mortgage_loans": []}
+    values = _PROPERTY_VALUES_RE.search(text, address.end(), end)
+    if values:
+        prop.update(property_value=_cell_amount(values.group(1)), status=values.group(2), intended_occupancy=values.group(3),
+                    monthly_insurance_taxes_dues=_cell_amount(values.group(4)), monthly_rental_income=_cell_amount(values.group(5)),
+                    net_monthly_rental_income=_cell_amount(values.group(6)))
+    for row in _PROPERTY_MORTGAGE_RE.finditer(text, values.end() if values else address.end(), end):
+        prop["mortgage_loans"].append({
+            "creditor_name": row.group(1), "account_number": row.group(2), "monthly_mortgage_payment": _cell_amount(row.group(3)),
+            "unpaid_balance": _cell_amount(row.group(4)), "to_be_paid_off_at_closing": row.group(5) is not None,
+            "type": row.group(6), "credit_limit": _cell_amount(row.group(7))})
+    return prop
+
+# --- Field-spec table (compiled once at import) ---
+FIELD_SPECS: List[FieldSpec] = [
+    # Section 1a: Borrower Info
+    FieldSpec("name", "1a", ("borrower_info", "name"), re.compile(r"Name \(First, Middle, Last, Suffix\).*?\n.*?\n([^\n]+)"), _text),
+    FieldSpec("social_security_number", "1a", ("borrower_info", "social_security_number"), re.compile(r"Social Security Number\s+([\d\s–-]+)"), _digits),
+    FieldSpec("alternate_names", "1a", ("borrower_info", "alternate_names"), re.compile(r"Alternate Names[^\n]+\n([^\n]+)"), _text),
+    FieldSpec("date_of_birth", "1a", ("borrower_info", "date_of_birth"), re.compile(r"T\.A\.\s+([\d\s/]+)\s+Permanent"), _no_spaces),
+    FieldSpec("citizenship", "1a", ("borrower_info", "citizenship"), re.compile(r"4 U\.S\. Citizen"), _constant("U.S. Citizen")),
+    FieldSpec("marital_status", "1a", ("borrower_info", "marital_status"), re.compile(r"4 Unmarried"), _constant("Unmarried")),
+    FieldSpec("email", "1a", ("borrower_info", "contact_info", "email"), re.compile(r"Email\s+([\w.@]+)"), _text),
+    FieldSpec("home_phone", "1a", ("borrower_info", "contact_info", "home_phone"), re.compile(r"Home Phone\s+\(.*?(\d{3}).*?([\d\s–]+)"), _phone),
+    FieldSpec("cell_phone", "1a", ("borrower_info", "contact_info", "cell_phone"), re.compile(r"Cell Phone\s+\(.*?(\d{3}).*?([\d\s–]+)"), _phone),
+    FieldSpec("work_phone", "1a", ("borrower_info", "contact_info", "work_phone"), re.compile(r"Work Phone\s+\(.*?(\d{3}).*?(\d{3}).*?(\d{4}).*?Ext\.\s*(\d+)"),
+              lambda m: f"({m.group(1)}) {m.group(2)}-{m.group(3)} Ext. {m.group(4)}"),
+    FieldSpec("current_address", "1a", ("borrower_info", "current_address"),
+              re.compile(r"Current Address\nStreet\s+([\w\s.]+)\s+Unit #\s+([\w\d]+)\nCity\s+([\w\s]+)\s+State\s+(\w{2})\s+ZIP\s+(\d+)\s+Country\s+(\w+)"),
+              _address, mode="update"),
+    FieldSpec("current_address_how_long", "1a", ("borrower_info", "current_address"), re.compile(r"How Long at Current Address\?\s+(\d+)\s+Years\s+(\d+)\s+Months"),
+              _years_months("how_long_years", "how_long_months"), mode="update"),
+    FieldSpec("housing_expense", "1a", ("borrower_info", "current_address", "housing_expense"), re.compile(r"Housing No primary housing expense\s+4\s+Own"), _constant("Own")),
+    # Sections 1b & 1c: Employment
+    *_employment_specs("1b", "current_employment"),
+    *_employment_specs("1c", "additional_employment"),
+    # Section 1e: Other Income
+    FieldSpec("other_income.social_security", "1e", ("other_income_sources",), re.compile(r"Social Security\s+\$\s+([\d,]+)"),
+              lambda m: {"source": "Social Security", "monthly_income": _amount(m)}, mode="append"),
+    # Section 2: Assets & Liabilities (table rows: one line per row, empty "$ $" rows never match)
+    FieldSpec("assets.bank_retirement_other", "2a", ("assets", "bank_retirement_other"), re.compile(fr"^({_ACCOUNT_TYPES}) (.+?) (\S+) \$ ?([\d,.]+)$", re.M),
+              lambda m: {"account_type": m.group(1), "financial_institution": m.group(2).strip(), "account_number": m.group(3), "cash_or_market_value": _cell_amount(m.group(4))},
+              mode="extend"),
+    FieldSpec("assets.other_assets_credits", "2b", ("assets", "other_assets_credits"), re.compile(fr"^({_ASSET_CREDIT_TYPES}) \$ ?([\d,.]+)$", re.M),
+              lambda m: {"asset_or_credit_type": m.group(1), "cash_or_market_value": _cell_amount(m.group(2))}, mode="extend"),
+    FieldSpec("liabilities.credit_cards_debts_leases", "2c", ("liabilities", "credit_cards_debts_leases"),
+              re.compile(fr"^({_LIABILITY_TYPES}) (.+?) (\S+) \$ ?{_CELL}( 4)? \$ ?{_CELL}$", re.M),
+              lambda m: {"account_type": m.group(1), "company_name": m.group(2), "account_number": m.group(3), "unpaid_balance": _cell_amount(m.group(4)),
+                         "paid_off_at_closing": m.group(5) is not None, "monthly_payment": _cell_amount(m.group(6))},
+              mode="extend"),
+    FieldSpec("liabilities.other_liabilities_expenses", "2d", ("liabilities", "other_liabilities_expenses"), re.compile(fr"^({_OTHER_LIABILITY_TYPES}) \$ ?([\d,.]+)$", re.M),
+              lambda m: {"type": m.group(1), "monthly_payment": _cell_amount(m.group(2))}, mode="extend"),
+    # Section 3: Real Estate (one block per property, mortgage rows inside it)
+    *(FieldSpec(f"real_estate_owned.{key}", key, ("real_estate_owned",), re.compile(r"Address Street(?s:.*)"), _property, mode="append", fallback=False)
+      for key in ("3a", "3b", "3c")),
+    # Section 4: Loan and Property
+    FieldSpec("loan_amount", "4a", ("loan_property_info", "loan_amount"), re.compile(r"Loan Amount\s+\$\s([\d,]+)"), _amount),
+    FieldSpec("loan_purpose", "4a", ("loan_property_info", "loan_purpose"), re.compile(r"Loan Purpose\s+4\s+Purchase"), _constant("Purchase")),
+    FieldSpec("property_address", "4a", ("loan_property_info", "property_address"),
+              re.compile(r"Property Address Street +([^\n]+?) +Unit #[ ]*([^\n]*)\nCity +([^\n]+?) +State +([A-Z]{2}) +ZIP +(\d+) +County +([^\n]+)"),
+              lambda m: dict(zip(("street", "unit", "city", "state", "zip", "county"), [s.strip() for s in m.groups()])), mode="update"),
+    FieldSpec("number_of_units", "4a", ("loan_property_info", "number_of_units"), re.compile(r"Number of Units\s+(\d+)"), lambda m: int(m.group(1))),
+    FieldSpec("property_value", "4a", ("loan_property_info", "property_value"), re.compile(r"Property Value\s+\$\s*([\d,]+)"), _amount),
+    FieldSpec("other_new_mortgage_loans", "4b", ("other_new_mortgage_loans",),
+              re.compile(fr"^(.+?) (4 )?First Lien (4 )?Subordinate Lien \$ ?{_CELL} \$ ?{_CELL} \$ ?{_CELL}$", re.M),
+              lambda m: {"creditor_name": m.group(1), "lien_type": _checked_option(m.group(2), "First Lien", m.group(3), "Subordinate Lien"),
+                         "monthly_payment": _cell_amount(m.group(4)), "loan_amount": _cell_amount(m.group(5)), "credit_limit": _cell_amount(m.group(6))},
+              mode="extend"),
+    FieldSpec("expected_monthly_rental_income", "4c", ("rental_income_on_property", "expected_monthly_rental_income"),
+              re.compile(r"Expected Monthly Rental Income\s+\$\s*([\d,.]+)"), _amount),
+    FieldSpec("expected_net_monthly_rental_income", "4c", ("rental_income_on_property", "expected_net_monthly_rental_income"),
+              re.compile(r"Expected Net Monthly Rental Income\s+\$\s*([\d,.]+)"), _amount),
+    FieldSpec("gifts_grants", "4d", ("gifts_grants",), re.compile(r"^(Cash Gift|Gift of Equity|Grant) (4 )?Deposited (4 )?Not Deposited (.+?) \$ ?([\d,.]+)$", re.M),
+              lambda m: {"asset_type": m.group(1), "deposited_not_deposited": _checked_option(m.group(2), "Deposited", m.group(3), "Not Deposited"),
+                         "source": m.group(4), "cash_or_market_value": _cell_amount(m.group(5))},
+              mode="extend"),
+]
+
+# Top-level keys of the extracted dict that describe a borrower (as opposed to
+# the loan); an additional borrower's pages only fill these.
+BORROWER_KEYS = ("borrower_info", "employment_info", "other_income_sources", "assets", "liabilities",
+                 "real_estate_owned", "declarations", "military_service", "demographic_info")
+
+def select_field_specs(sections: Optional[Iterable[str]] = None) -> List[FieldSpec]:
+    """The field specs belonging to the requested sections (all of them for None)."""
+    keys = resolve_sections(sections)
+    return FIELD_SPECS if keys is None else [spec for spec in FIELD_SPECS if spec.section in keys]
+
+def split_sections(full_text: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Splits the document text into section spans in a single pass.
+    Returns {"1": (start, end), "1a": (start, end), ...} with offsets into
+    full_text; a span runs from its header to the next header. If a header
+    repeats, the first occurrence wins.
+    """
+    spans: Dict[str, Tuple[int, int]] = {}
+    headers = [(m.start(), m.group(1) or m.group(2)) for m in SECTION_HEADER_RE.finditer(full_text)]
+    for i, (start, key) in enumerate(headers):
+        end = headers[i + 1][0] if i + 1 < len(headers) else len(full_text)
+        spans.setdefault(key, (start, end))
+    return spans
+
+def split_borrowers(full_text: str) -> List[Tuple[int, int]]:
+    """
+    Splits the text at every repeated "Section 1:" header, which starts the
+    Additional Borrower pages of a co-borrower. The first span is the
+    application itself; each further span holds one additional borrower.
+    """
+    starts = [m.start() for m in SECTION_HEADER_RE.finditer(full_text) if m.group(1) == "1"][1:]
+    bounds = [0, *starts, len(full_text)]
+    return list(zip(bounds, bounds[1:]))
+
+def _target(data: dict, path: Tuple[str, ...]) -> Tuple[Any, str]:
+    node = data
+    for key in path[:-1]:
+        node = node[key]
+    return node, path[-1]
+
+def apply_field_specs(full_text: str, specs: List[FieldSpec], data: dict,
+                      spans: Optional[Dict[str, Tuple[int, int]]] = None,
+                      metrics: Optional[DocumentMetrics] = None,
+                      diagnostics: Optional[DocumentDiagnostics] = None) -> dict:
+    """
+    Runs each spec's compiled pattern only against its own section span
+    (pattern.search with pos/endpos, so no substrings are copied) and stores
+    the converted values in data. With metrics, the time spent per section
+    regex group is recorded; with diagnostics, the outcome of every spec
+    (see _apply_with_diagnostics).
+    """
+    if spans is None:
+        spans = split_sections(full_text)
+    whole = (0, len(full_text))
+
+    if metrics is not None:
+        for spec in specs:
+            wall, cpu = time.perf_counter(), time.process_time()
+            apply_field_specs(full_text, [spec], data, spans, diagnostics=diagnostics)
+            metrics.add_section(spec.section, time.perf_counter() - wall, time.process_time() - cpu)
+        return data
+    if diagnostics is not None:
+        return _apply_with_diagnostics(full_text, specs, data, spans, diagnostics)
+
+    for spec in specs:
+        span = spans.get(spec.section)
+        if span is None:
+            if not spec.fallback:
+                continue
+            span = whole
+        node, key = _target(data, spec.path)
+
+        if spec.mode == "extend":
+            node[key].extend(spec.convert(m) for m in spec.pattern.finditer(full_text, *span))
+            continue
+        m = spec.pattern.search(full_text, *span)
+        if not m:
+            continue
+        if spec.mode == "set":
+            node[key] = spec.convert(m)
+        elif spec.mode == "update":
+            node[key].update(spec.convert(m))
+        elif spec.mode == "append":
+            value = spec.convert(m)
+            if value is not None:
+                node[key].append(value)
+    return data
 
+def _apply_with_diagnostics(full_text: str, specs: List[FieldSpec], data: dict,
+                            spans: Dict[str, Tuple[int, int]], diagnostics: DocumentDiagnostics) -> dict:
+    """
+    apply_field_specs() recording, per spec, the anchor its pattern ran
+    against, the match offsets and any exception raised by convert. A failed
+    conversion leaves that field (or table row) empty and parsing goes on.
+    """
+    for spec in specs:
+        span, anchor = spans.get(spec.section), spec.section
+        if span is None:
+            if not spec.fallback:
+                diagnostics.record(spec.name, spec.section, "missed")
+                continue
+            span, anchor = (0, len(full_text)), "fallback"
+        if spec.mode == "extend":
+            matches = list(spec.pattern.finditer(full_text, *span))
+        else:
+            matches = [m for m in (spec.pattern.search(full_text, *span),) if m]
+        values, error, error_span = [], None, None
+        for m in matches:
+            try:
+                values.append(spec.convert(m))
+            except Exception as e:
+                error, error_span = error or f"{type(e).__name__}: {e}", error_span or m.span()
+        node, key = _target(data, spec.path)
+        if spec.mode == "extend":
+            node[key].extend(values)
+        elif values and spec.mode == "set":
+            node[key] = values[0]
+        elif values and spec.mode == "update":
+            node[key].update(values[0])
+        elif values and spec.mode == "append" and values[0] is not None:
+            node[key].append(values[0])
+        rows = len(values) if spec.mode == "extend" else None
+        if error is not None:
+            diagnostics.record(spec.name, spec.section, "error", anchor, error_span, rows, error)
+        elif not values or values[0] is None:
+            diagnostics.record(spec.name, spec.section, "missed", anchor)
+        else:
+            diagnostics.record(spec.name, spec.section, "matched", anchor,
+                               (matches[0].start(), matches[-1].end()), rows)
+    return data
+
+def reparse_sections(full_text: str, previous: dict, sections: Iterable[str],
+                     field_specs: Optional[List[FieldSpec]] = None) -> dict:
+    """
+    Re-runs only the field specs of the given section keys over full_text and
+    merges their values into a copy of a previously extracted dict. Every
+    location those specs write to is reset first (along with any other spec
+    writing to the same location), so fields that disappeared are dropped.
+    field_specs is the spec table of the document's template (FIELD_SPECS
+    by default).
+    """
+    field_specs = FIELD_SPECS if field_specs is None else field_specs
+    sections = set(sections)
+    paths = {spec.path for spec in field_specs if spec.section in sections}
+    specs = [spec for spec in field_specs if spec.path in paths]
+    data, skeleton = copy.deepcopy(previous), _new_extracted_data()
+    for spec in specs:
+        node, key = _target(data, spec.path)
+        empty_node, _ = _target(skeleton, spec.path)
+        if key in empty_node:
+            node[key] = empty_node[key]
+        else:
+            node.pop(key, None)
+    # Additional borrowers are cheap to redo and are always parsed in full.
+    return _parse_borrowers(full_text, specs, data, [spec for spec in field_specs if spec.path[0] in BORROWER_KEYS])
+
+def _parse_borrowers(full_text: str, specs: List[FieldSpec], data: dict,
+                     borrower_specs: Optional[List[FieldSpec]] = None,
+                     metrics: Optional[DocumentMetrics] = None,
+                     diagnostics: Optional[DocumentDiagnostics] = None) -> dict:
+    """
+    Applies specs to the application part of full_text (split_borrowers) and
+    the borrower specs among them to each additional borrower's part. Those
+    are stored under "additional_borrowers", each with the BORROWER_KEYS of
+    the extracted dict.
+    """
+    parts = split_borrowers(full_text)
+    apply_field_specs(full_text if len(parts) == 1 else full_text[:parts[0][1]], specs, data, metrics=metrics,
+                      diagnostics=diagnostics)
+    if borrower_specs is None:
+        borrower_specs = [spec for spec in specs if spec.path[0] in BORROWER_KEYS]
+    skeleton = {key: value for key, value in _new_extracted_data().items() if key in BORROWER_KEYS}
+    data["additional_borrowers"] = [
+        apply_field_specs(full_text[start:end], borrower_specs, copy.deepcopy(skeleton), diagnostics=(
+            diagnostics.part(f"additional_borrowers.{i}.", start) if diagnostics is not None else None))
+        for i, (start, end) in enumerate(parts[1:])]
+    return data
+
+# Extraction engines of extract_urla: "text" (linearized page text + field
+# specs) and "geometry" (word boxes located on the template, src/geometry.py).
+ENGINES = ("text", "geometry")
+
+@dataclass
+class ExtractionResult:
+    """
+    Output of extract_urla(): the extracted dict, the path that produced it
+    ("acroform" for fillable forms read from their widgets, "acroform+text"
+    when the sections without widget specs were read from the page text,
+    "text" for the layout + regex path, "ocr" when scanned pages were recognised, "geometry"
+    for the word-box engine) and, for the text paths, the document text. In
+    streaming mode, pages is the (first, last) index of the URLA pages read.
+    template is the form revision whose extractor ran (src/templates.py).
+    """
+    data: dict
+    method: str
+    text: Optional[str] = None
+    pages: Optional[Tuple[int, int]] = None
+    template: Optional[str] = None
+
+Region = Tuple[int, Optional[Tuple[float, float, float, float]]]
+
+def _regions(page_count: int, keys: Optional[Set[str]], layout: Optional[dict] = None) -> List[Region]:
+    """(page index, crop box or None for the whole page) to extract, in document order."""
+    if keys is None:
+        return [(i, None) for i in range(page_count)]
+    return [(page_index, bbox) for page_index, bbox in _layout_regions(keys, layout) if page_index < page_count]
+
+def _region_texts(pdf: Any, regions: List[Region]) -> List[Optional[str]]:
+    texts = []
+    for page_index, bbox in regions:
+        page = pdf.pages[page_index]
+        if bbox is not None:
+            x0, top, x1, bottom = bbox
+            page = page.crop((x0, top, min(x1, page.width), min(bottom, page.height)))
+        texts.append(page.extract_text(x_tolerance=1))
+    return texts
+
+def _join_texts(texts: Iterable[Optional[str]]) -> str:
+    return "".join(f"{text}\n" for text in texts if text)
+
+def _page_texts(pdf: Any, keys: Optional[Set[str]]) -> str:
+    return _join_texts(_region_texts(pdf, _regions(len(pdf.pages), keys)))
+
+def _source(pdf_path: Union[str, IO[bytes]]) -> Union[str, bytes]:
+    """What worker processes reopen the document from: its path, or its bytes."""
+    if isinstance(pdf_path, str):
+        return pdf_path
+    pdf_path.seek(0)
+    return pdf_path.read()
+
+def _extract_regions(source: Union[str, bytes], regions: List[Region]) -> List[Optional[str]]:
+    """Worker side of parallel extraction: opens the document itself and extracts its share of regions."""
+    with _pdfplumber().open(source if isinstance(source, str) else io.BytesIO(source)) as pdf:
+        return _region_texts(pdf, regions)
+
+def _parallel_region_texts(source: Union[str, IO[bytes]], regions: List[Region], page_workers: int,
+                           executor: Optional["Executor"] = None) -> List[Optional[str]]:
+    """
+    Splits the regions of one document into page_workers contiguous runs,
+    extracts them in worker processes (each opening the file on its own) and
+    returns the texts in page order. Pass an executor to reuse a pool.
+    """
+    if not regions:
+        return []
+    from concurrent.futures import ProcessPoolExecutor
+    source = _source(source)
+    size = -(-len(regions) // page_workers)
+    runs = [regions[i:i + size] for i in range(0, len(regions), size)]
+    pool = executor or ProcessPoolExecutor(max_workers=min(page_workers, len(runs)))
+    try:
+        futures = [pool.submit(_extract_regions, source, run) for run in runs]
+        return [text for future in futures for text in future.result()]
+    finally:
+        if executor is None:
+            pool.shutdown()
+
+def _ocr_scanned_pages(pdf: Any, pdf_path: Union[str, IO[bytes]], regions: List[Region],
+                       texts: List[Optional[str]], ocr: Optional[OcrEngine]) -> Tuple[List[Optional[str]], int]:
+    """
+    Replaces the (empty) text of image-only pages with OCR output and returns
+    the texts plus the number of pages recognised. A scanned page's text
+    stands in for its first region; with no OCR engine installed, a document
+    that has no text at all raises ScannedDocumentError instead of quietly
+    parsing to an empty result.
+    """
+    scanned: Dict[int, str] = {}
+    for (page_index, _), text in zip(regions, texts):
+        if not text and page_index not in scanned and is_image_only(pdf.pages[page_index]):
+            scanned[page_index] = page_image_hash(pdf.pages[page_index])
+    if not scanned:
+        return texts, 0
+    engine = ocr or default_ocr_engine()
+    if not engine.available():
+        if not any(texts):
+            raise ScannedDocumentError(f"{len(scanned)} scanned page(s) without a text layer and no OCR engine "
+                                       f"installed (Tesseract)")
+        return texts, 0
+    recognized = engine.recognize(_source(pdf_path), scanned)
+    texts = list(texts)
+    for i, (page_index, _) in enumerate(regions):
+        if page_index in recognized:
+            texts[i] = recognized.pop(page_index)
+    return texts, len(scanned)
+
+def iter_urla_pages(pdf: Any, keys: Optional[Set[str]] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Yields (page index, text) for the URLA pages of a loan packet, walking the
+    pages one at a time and closing each one (dropping its parsed layout
+    objects) as soon as its text is taken. Pages before the form are skipped;
+    the walk stops at the first page after it, or as soon as a header past the
+    last requested section shows up, so the rest of the bundle is never parsed.
+    """
+    last_wanted = max(SECTION_ORDER[key] for key in keys) if keys else len(SECTION_ORDER) - 1
+    started = False
+    for index, page in enumerate(pdf.pages):
+        try:
+            text = page.extract_text(x_tolerance=1) or ""
+        finally:
+            page.close()
+        if URLA_PAGE_MARKER not in text:
+            if started:
+                return
+            continue
+        started = True
+        yield index, text
+        if any(SECTION_ORDER.get(m.group(1) or m.group(2), -1) > last_wanted for m in SECTION_HEADER_RE.finditer(text)):
+            return
+
+def _streamed_text(pdf: Any, keys: Optional[Set[str]]) -> Tuple[str, Optional[Tuple[int, int]]]:
+    texts, indexes = [], []
+    for index, text in iter_urla_pages(pdf, keys):
+        texts.append(text)
+        indexes.append(index)
+    return _join_texts(texts), ((indexes[0], indexes[-1]) if indexes else None)
+
+def extract_text(pdf_path: Union[str, IO[bytes]], sections: Optional[Iterable[str]] = None,
+                 stream: bool = False, page_workers: int = 1) -> str:
+    """
+    Returns the text of every page, one page per chunk, newline terminated.
+    pdf_path can also be an open binary file object. When sections is given,
+    only the pages and cropped regions those sections occupy (URLA_LAYOUT) go
+    through layout analysis. With stream, only the URLA pages of a larger
+    bundle are returned (see iter_urla_pages). With page_workers > 1, the
+    pages are extracted across that many processes.
+    """
+    keys = resolve_sections(sections)
+    with _pdfplumber().open(pdf_path) as pdf:
+        if stream:
+            return _streamed_text(pdf, keys)[0]
+        if page_workers > 1:
+            return _join_texts(_parallel_region_texts(pdf_path, _regions(len(pdf.pages), keys), page_workers))
+        return _page_texts(pdf, keys)
+
+def extract_urla(pdf_path: Union[str, IO[bytes]], sections: Optional[Iterable[str]] = None,
+                 use_forms: bool = True, metrics: Optional[DocumentMetrics] = None,
+                 stream: bool = False, page_workers: int = 1,
+                 executor: Optional["Executor"] = None, use_ocr: bool = True,
+                 ocr: Optional[OcrEngine] = None, engine: str = "text",
+                 template: Optional[str] = None,
+                 diagnostics: Optional[DocumentDiagnostics] = None, data: Optional[dict] = None) -> ExtractionResult:
+    """
+    Extracts a URLA PDF, taking the AcroForm fast path when the document is a
+    filled-in fillable form: values are read straight from the widget
+    dictionaries and, beyond the revision fingerprint, no page goes through
+    layout analysis. Widgets are used
+    per section: a section with at least one filled, known widget is read
+    from its widgets, and the other requested sections go through the
+    text/regex path and are merged in (method "acroform+text"). Flattened
+    documents (or forms whose widgets are empty or unknown) use the
+    text/regex path.
+    Pass a DocumentMetrics to record per-stage timings. Set stream for large
+    loan packets: the URLA is located by its page footers and read page by
+    page, so memory stays bounded by a page rather than the whole bundle.
+    page_workers > 1 fans the pages of this one document out across worker
+    processes (optionally those of executor) to cut its latency.
+    Image-only (scanned) pages are recognised with OCR (src/ocr.py; ocr, or
+    the shared default engine) and fed to the same regexes, with method
+    "ocr"; pass use_ocr=False to skip them. Streaming mode does not OCR.
+    With engine="geometry", the template fields of sections 1a-1c and 4a are
+    read from word boxes (src/geometry.py, method "geometry") and only the
+    remaining sections go through text extraction; it reads the form's own
+    pages, so additional borrower pages and streaming need the text engine.
+    The form revision is fingerprinted from the first page's header and
+    footer (src/templates.py) and only that revision's layout and specs run;
+    pass template (a revision id) to skip the fingerprint. Pass a
+    DocumentDiagnostics to get the outcome of every field (src/diagnostics.py).
+    data is the dict skeleton to fill in place (a new one by default); when
+    extraction fails part way, it keeps the values parsed up to the failure.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown extraction engine '{engine}'")
+    keys = resolve_sections(sections)
+    data = _new_extracted_data() if data is None else data
+    with stage(metrics, "open"):
+        pdf = _pdfplumber().open(pdf_path)
+    with pdf:
+        with stage(metrics, "open"):
+            page_count = len(pdf.pages)
+        if metrics is not None:
+            metrics.page_count = page_count
+        from src.templates import check_supported, detect_template, get_template
+        with stage(metrics, "fingerprint"):
+            urla_template = check_supported(get_template(template)) if template else detect_template(pdf)
+        if diagnostics is not None:
+            diagnostics.template = urla_template.revision
+        filled: Set[str] = set()
+        if use_forms:
+            with stage(metrics, "forms"):
+                filled = map_form_fields(read_form_fields(pdf), data, keys)
+            # Sections of this revision without a filled widget (including partly filled forms) come from the text.
+            uncovered = {key for key in (keys if keys is not None else urla_template.layout)
+                         if key in urla_template.spec_sections} - filled
+            if filled and not uncovered:
+                if metrics is not None:
+                    metrics.method = "acroform"
+                if diagnostics is not None:
+                    diagnostics.method = "acroform"
+                return ExtractionResult(data, "acroform", template=urla_template.revision)
+        method, pages, text_keys, region_keys = "text", None, keys, keys
+        geometry = engine == "geometry" and not stream and not filled
+        if filled:
+            text_keys, region_keys = uncovered, uncovered
+        elif geometry:
+            from src.geometry import extract_geometry
+            with stage(metrics, "geometry"):
+                missing = extract_geometry(pdf, keys, data, urla_template.geometry_specs, diagnostics)
+            text_keys = (keys if keys is not None else set(urla_template.layout)) - (urla_template.geometry_sections - missing)
+            # A document off the template is read like the text engine would read it.
+            region_keys = keys if missing else text_keys
+            method = "geometry"
+        with stage(metrics, "extract_text"):
+            if stream:
+                full_text, pages = _streamed_text(pdf, region_keys)
+            else:
+                regions = _regions(page_count, region_keys, urla_template.layout)
+                if page_workers > 1:
+                    texts = _parallel_region_texts(pdf_path, regions, page_workers, executor)
+                else:
+                    texts = _region_texts(pdf, regions)
+        if not stream:
+            if use_ocr:
+                with stage(metrics, "ocr"):
+                    texts, recognized = _ocr_scanned_pages(pdf, pdf_path, regions, texts, ocr)
+                method = "ocr" if recognized else method
+            full_text = _join_texts(texts)
+    if filled:
+        method = f"acroform+{method}"
+    if metrics is not None:
+        metrics.method, metrics.text_length = method, len(full_text)
+    if diagnostics is not None:
+        diagnostics.method = method
+    if geometry or filled:
+        # The remaining sections by their exact layout keys ("4" must not pull 4a back in). The
+        # text is partial, so it is not returned for caching.
+        with stage(metrics, "regex"):
+            data = _parse_borrowers(full_text, urla_template.select_field_specs(text_keys), data, metrics=metrics,
+                                    diagnostics=diagnostics)
+        return ExtractionResult(data, method, None, pages, urla_template.revision)
+    return ExtractionResult(parse_urla_text(full_text, keys, metrics, urla_template, diagnostics, data), method,
+                            full_text, pages, urla_template.revision)
+
+def parse_urla_text(full_text: str, sections: Optional[Iterable[str]] = None,
+                    metrics: Optional[DocumentMetrics] = None, template: Optional["UrlaTemplate"] = None,
+                    diagnostics: Optional[DocumentDiagnostics] = None, data: Optional[dict] = None) -> dict:
+    """
+    Runs the field-spec table over already extracted document text, filling
+    data (a new dict skeleton by default). With sections, only the specs
+    belonging to those sections run. Additional borrower pages are parsed
+    separately (see _parse_borrowers). Without a template, the revision is
+    fingerprinted from the text itself.
+    """
+    if template is None:
+        from src.templates import template_for_text
+        template = template_for_text(full_text)
+    if diagnostics is not None:
+        diagnostics.template = template.revision
+    with stage(metrics, "regex"):
+        return _parse_borrowers(full_text, template.select_field_specs(resolve_sections(sections)),
+                                _new_extracted_data() if data is None else data, metrics=metrics, diagnostics=diagnostics)
+
+def extract_borrower_personal_info(pdf_path: Union[str, IO[bytes]], raise_errors: bool = False,
+                                   sections: Optional[Iterable[str]] = None, stream: bool = False,
+                                   page_workers: int = 1, engine: str = "text") -> dict:
+    """
+    Extracts information from all sections of the URLA PDF based on raw text analysis.
+    This version uses highly specific anchors for each field to handle jumbled text.
+    Parsing errors are printed and the partially filled dict is returned, unless
+    raise_errors is set (used by the batch runner to record per-file failures).
+    Pass sections (e.g. ["1", "4"]) to extract only part of the application,
+    stream=True for URLAs embedded in large loan packets, page_workers > 1
+    to extract the pages of this one document in parallel, and
+    engine="geometry" to read the template fields from word boxes.
+    """
+    extracted_data = _new_extracted_data()
+
+    try:
+        extract_urla(pdf_path, sections, stream=stream, page_workers=page_workers, engine=engine, data=extracted_data)
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"An error occurred during parsing: {e}")
 
-    return extracted_data
\ No newline at end of file
+    return extracted_data
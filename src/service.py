@@ -0,0 +1,231 @@
+# src/service.py
+import argparse
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.mapper import urla_from_extracted_dict
+from src.output import dataclass_to_dict, encode_json
+from src.pdf_parser import extract_borrower_personal_info, resolve_sections
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 429: "Too Many Requests",
+           500: "Internal Server Error", 504: "Gateway Timeout"}
+
+# How long a connection is drained after its response before it is closed.
+LINGER_SECONDS = 2.0
+
+class DocumentError(Exception):
+    """The upload is not a readable URLA PDF; answered with 422 rather than 500."""
+
+def _document_errors() -> Tuple[type, ...]:
+    """Exceptions that mean the uploaded document is at fault, not the server."""
+    from pdfminer.psparser import PSException
+    from pdfplumber.utils.exceptions import PdfminerException
+    from src.ocr import ScannedDocumentError
+    from src.templates import UnsupportedTemplateError
+    return PSException, PdfminerException, ScannedDocumentError, UnsupportedTemplateError
+
+def extract_pdf_bytes(pdf_bytes: bytes, sections: Optional[List[str]] = None) -> bytes:
+    """Extracts an uploaded PDF and returns the populated URLAData as JSON bytes (runs in a worker)."""
+    try:
+        extracted = extract_borrower_personal_info(io.BytesIO(pdf_bytes), raise_errors=True, sections=sections)
+    except _document_errors() as e:
+        raise DocumentError(f"{type(e).__name__}: {e}") from None
+    return encode_json(dataclass_to_dict(urla_from_extracted_dict(extracted)))
+
+async def _discard(reader: asyncio.StreamReader) -> None:
+    while await reader.read(64 * 1024):
+        pass
+
+def _busy() -> Tuple[int, bytes]:
+    return 429, encode_json({"error": "server busy, retry later"})
+
+class ExtractionService:
+    """
+    Minimal HTTP/1.1 front end for URLA extraction, built on asyncio streams.
+
+    POST /extract with the raw PDF as the request body (optionally
+    ?sections=1,4) returns the URLAData JSON; GET /health reports the load.
+    At most `workers` extractions run at once and up to `queue_size` more
+    wait for a worker; anything beyond that is refused with 429 straight
+    away, before its body is read, so a burst never turns into unbounded
+    queued work or buffered uploads. A request that has not finished within
+    `timeout` seconds gets a 504: one still waiting for a worker is dropped,
+    one already running keeps its worker slot until it actually ends. An upload that is not a readable PDF gets a 422.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_size: int = 16, timeout: float = 60.0,
+                 max_upload_bytes: int = 50 * 1024 * 1024, executor: Optional[Executor] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.max_upload_bytes = max_upload_bytes
+        self._executor = executor or ProcessPoolExecutor(max_workers=self.workers)
+        self._owns_executor = executor is None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.admitted = 0  # running + waiting extractions
+
+    def start(self) -> None:
+        """
+        Starts the worker processes and waits until they are up. Called before
+        the server listens: forked workers would otherwise be created during
+        the first request and inherit its connection and the listening socket.
+        """
+        wait([self._executor.submit(os.getpid) for _ in range(self.workers)])
+
+    def _admit(self) -> bool:
+        """Takes an admission (running or waiting extraction), unless the server is at capacity."""
+        if self.admitted >= self.workers + self.queue_size:
+            return False
+        self.admitted += 1
+        return True
+
+    async def extract(self, pdf_bytes: bytes, sections: Optional[List[str]] = None) -> Tuple[int, bytes]:
+        """Runs one extraction under the admission limits and returns (status, JSON body)."""
+        if not self._admit():
+            return _busy()
+        return await self._extract_admitted(pdf_bytes, sections)
+
+    async def _extract_admitted(self, pdf_bytes: bytes, sections: Optional[List[str]]) -> Tuple[int, bytes]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        try:
+            try:
+                # A request still waiting for a worker when the timeout hits is
+                # simply dropped, giving its admission back straight away.
+                await asyncio.wait_for(self._slots.acquire(), self.timeout)
+            except BaseException:
+                self.admitted -= 1
+                raise
+            task = asyncio.ensure_future(self._run(pdf_bytes, sections))
+            # Retrieve the outcome even when nobody waits for it any more.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            # shield: once running, a timed-out request stops waiting, but the
+            # extraction keeps its slot and admission until the worker is free.
+            return 200, await asyncio.wait_for(asyncio.shield(task), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            return 504, encode_json({"error": f"extraction did not finish within {self.timeout}s"})
+        except DocumentError as e:
+            return 422, encode_json({"error": str(e)})
+        except Exception as e:
+            return 500, encode_json({"error": f"{type(e).__name__}: {e}"})
+
+    async def _run(self, pdf_bytes: bytes, sections: Optional[List[str]]) -> bytes:
+        """Runs one extraction in the slot already acquired for it."""
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, extract_pdf_bytes, pdf_bytes, sections)
+        finally:
+            self._slots.release()
+            self.admitted -= 1
+
+    # --- HTTP handling ---
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            status, body = await self._handle_request(reader)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            status, body = 400, encode_json({"error": "malformed request"})
+        except ConnectionError:
+            writer.close()
+            return
+        headers = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json",
+                   f"Content-Length: {len(body)}", "Connection: close"]
+        if status == 429:
+            headers.append("Retry-After: 1")
+        try:
+            writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+            # Lingering close: a request answered without reading its upload (429, 400) still has
+            # it in flight, and closing on unread data resets the connection, which can discard
+            # the response before the client reads it. Half-close and drop the rest instead.
+            if writer.can_write_eof():
+                writer.write_eof()
+                await asyncio.wait_for(_discard(reader), LINGER_SECONDS)
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        request_line, *header_lines = head.split("\r\n")
+        method, target, _ = request_line.split(" ", 2)
+        headers: Dict[str, str] = {}
+        for line in header_lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+
+        if url.path == "/health":
+            if method != "GET":
+                return 405, encode_json({"error": "use GET"})
+            return 200, encode_json({"status": "ok", "workers": self.workers, "admitted": self.admitted,
+                                     "capacity": self.workers + self.queue_size})
+        if url.path != "/extract":
+            return 404, encode_json({"error": f"no route for {url.path}"})
+        if method != "POST":
+            return 405, encode_json({"error": "use POST"})
+        if "content-length" not in headers:
+            return 411, encode_json({"error": "Content-Length required"})
+        length = int(headers["content-length"])
+        if length > self.max_upload_bytes:
+            return 413, encode_json({"error": f"upload exceeds {self.max_upload_bytes} bytes"})
+
+        query = parse_qs(url.query)
+        sections = query["sections"][0].split(",") if "sections" in query else None
+        try:
+            resolve_sections(sections)
+        except ValueError as e:
+            return 400, encode_json({"error": str(e)})
+        # Admission is taken before the body is read, so refused uploads are never buffered.
+        if not self._admit():
+            return _busy()
+        try:
+            pdf_bytes = await reader.readexactly(length)
+        except BaseException:
+            self.admitted -= 1
+            raise
+        return await self._extract_admitted(pdf_bytes, sections)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        self.start()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Serving URLA extraction on http://{host}:{port} ({self.workers} workers, queue {self.queue_size})",
+              file=sys.stderr)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve URLA extraction over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--queue-size", type=int, default=16, help="Requests allowed to wait for a worker before 429s")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--max-upload-mb", type=int, default=50, help="Largest accepted PDF upload")
+    args = parser.parse_args(argv)
+
+    service = ExtractionService(args.workers, args.queue_size, args.timeout, args.max_upload_mb * 1024 * 1024)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
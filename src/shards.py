@@ -0,0 +1,170 @@
+# src/shards.py
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import IO, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.output import RecordSink, open_sink
+
+# --- Shard assignment ---
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parses "I/N" (shard I of N, counted from 0) as given to --shard."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}', expected INDEX/COUNT such as 3/16") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{value}': index must be in 0..{count - 1}")
+    return index, count
+
+def shard_of(path: str, count: int) -> int:
+    """
+    Shard a document belongs to: its path's SHA-256, modulo count. It depends
+    on the path alone, so every node computes the same split from its own
+    copy of the manifest and adding paths does not move the existing ones.
+    (CRC-32 is linear and splits paths differing in one character badly.)
+    """
+    return int.from_bytes(hashlib.sha256(path.encode("utf-8")).digest()[:8], "big") % count
+
+def select_shard(paths: Iterable[str], index: int, count: int) -> List[str]:
+    return [path for path in paths if shard_of(path, count) == index]
+
+# --- Checkpoint journal ---
+class ShardJournal:
+    """
+    Append-only checkpoint of a shard's finished documents: one
+    "<sha256>\\t<source>" line per document whose record reached the output.
+    Kept on the node's local disk; a restarted shard loads it and skips the
+    sources it lists. A line cut short by a crash is (at worst) an unknown
+    source, so that document is simply redone.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sources: Set[str] = set()
+        self.hashes: Set[str] = set()
+        end_torn_line(path)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    content_hash, _, source = line.rstrip("\n").partition("\t")
+                    if len(content_hash) == 64 and source:
+                        self.hashes.add(content_hash)
+                        self.sources.add(source)
+        self._file: IO[str] = open(path, "a", encoding="utf-8")
+
+    def __contains__(self, source: str) -> bool:
+        return source in self.sources
+
+    def remaining(self, paths: Iterable[str]) -> List[str]:
+        return [path for path in paths if path not in self.sources]
+
+    def add(self, content_hash: str, source: str) -> None:
+        self._file.write(f"{content_hash}\t{source}\n")
+        self._file.flush()
+        self.hashes.add(content_hash)
+        self.sources.add(source)
+
+    def close(self) -> None:
+        self._file.close()
+
+def end_torn_line(path: str) -> None:
+    """
+    Terminates a last line cut short by a crash (an output or journal file
+    about to be appended to), so it cannot run into the next line written.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+class JournalSink(RecordSink):
+    """
+    Wraps the shard's output sink: each record is flushed to the output
+    before its document is journaled, so a crash can at worst repeat a
+    record (merge_outputs() keeps the last one), never lose one. Error
+    records are written but not journaled and are retried on restart.
+    """
+
+    def __init__(self, sink: RecordSink, journal: ShardJournal):
+        self.sink = sink
+        self.journal = journal
+        self.count = 0
+
+    def write(self, record: Any) -> None:
+        self.sink.write(record)
+        self.count += 1
+        if record.get("status", "ok") == "ok" and record.get("sha256"):
+            self.sink.flush()
+            self.journal.add(record["sha256"], record["source"])
+
+    def flush(self) -> None:
+        self.sink.flush()
+
+    def close(self) -> None:
+        self.sink.close()
+        self.journal.close()
+
+# --- Merging ---
+def _read_records(paths: List[str]) -> Iterable[Tuple[int, int, Optional[dict]]]:
+    """(file index, line index, record) per line; None for a line torn by a crash."""
+    for file_index, path in enumerate(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_index, line in enumerate(f):
+                if not line.strip():
+                    continue
+                try:
+                    yield file_index, line_index, json.loads(line)
+                except ValueError:
+                    yield file_index, line_index, None
+
+def merge_outputs(paths: List[str], sink: RecordSink) -> Dict[str, int]:
+    """
+    Merges per-shard NDJSON outputs into sink, one record per source. Where
+    a source appears more than once (a record repeated after a restart, a
+    failed document retried), the last occurrence wins, taking the files in
+    the order given. Two passes over the files: the first finds the winning
+    line of each source, the second writes them, so only the sources are
+    held in memory. Torn lines are skipped (their documents were not
+    journaled and are in the output again after the restart).
+    """
+    last: Dict[str, Tuple[int, int]] = {}
+    summary = {"read": 0, "torn": 0, "written": 0, "ok": 0, "error": 0}
+    for file_index, line_index, record in _read_records(paths):
+        if record is None:
+            summary["torn"] += 1
+            continue
+        last[record.get("source")] = (file_index, line_index)
+        summary["read"] += 1
+    winners = set(last.values())
+    for file_index, line_index, record in _read_records(paths):
+        if (file_index, line_index) in winners:
+            sink.write(record)
+            summary["written"] += 1
+            summary["error" if record.get("status") == "error" else "ok"] += 1
+    sink.flush()
+    return summary
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Merge the per-shard outputs of src.batch --shard I/N --journal J into one result set.")
+    parser.add_argument("inputs", nargs="+", help="Per-shard NDJSON outputs (later files win on repeated sources)")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    parser.add_argument("--format", choices=["ndjson", "json", "sqlite"], default="ndjson", help="Output format")
+    args = parser.parse_args(argv)
+
+    if args.format == "sqlite" and args.output == "-":
+        print("Error: --format sqlite needs an output file (-o results.db)", file=sys.stderr)
+        return 1
+    with open_sink(args.output, args.format) as sink:
+        summary = merge_outputs(args.inputs, sink)
+    print(f"Merged {summary['read']} record(s) from {len(args.inputs)} file(s) into {summary['written']} "
+          f"({summary['ok']} ok, {summary['error']} failed, {summary['torn']} torn line(s) skipped)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+# src/store.py
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Optional, Tuple
+
+from src.output import RecordSink, encode_json, get_serializer
+from src.pdf_parser import PARSER_VERSION
+
+if TYPE_CHECKING:
+    from src.data_models import URLAData
+
+# Bump when the schema changes; older stores are rejected rather than migrated.
+SCHEMA_VERSION = 3
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    content_hash TEXT PRIMARY KEY,
+    source TEXT,
+    method TEXT,
+    parser_version TEXT,
+    stored_at REAL NOT NULL,
+    loan_amount REAL,
+    property_zip TEXT,
+    property_street TEXT,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS applications_loan_amount ON applications (loan_amount);
+CREATE INDEX IF NOT EXISTS applications_property ON applications (property_zip, property_street);
+CREATE TABLE IF NOT EXISTS borrowers (
+    content_hash TEXT NOT NULL REFERENCES applications (content_hash) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name_key TEXT,
+    ssn_digits TEXT,
+    PRIMARY KEY (content_hash, position)
+);
+CREATE INDEX IF NOT EXISTS borrowers_ssn_digits ON borrowers (ssn_digits);
+CREATE INDEX IF NOT EXISTS borrowers_name_key ON borrowers (name_key);
+"""
+
+_UPSERT_APPLICATION = """
+INSERT INTO applications (content_hash, source, method, parser_version, stored_at, loan_amount, property_zip, property_street, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (content_hash) DO UPDATE SET
+    source = excluded.source, method = excluded.method, parser_version = excluded.parser_version,
+    stored_at = excluded.stored_at, loan_amount = excluded.loan_amount, property_zip = excluded.property_zip,
+    property_street = excluded.property_street, data = excluded.data
+"""
+
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
+
+# --- Index keys ---
+def ssn_digits(ssn: Optional[str]) -> Optional[str]:
+    """The digits of an SSN, so differently punctuated numbers match: "12-234-3123" -> "122343123"."""
+    digits = "".join(c for c in ssn or "" if c.isdigit())
+    return digits or None
+
+def name_key(name: Optional[str]) -> Optional[str]:
+    """Case- and punctuation-insensitive form of a name: "Allen, Thomas J." -> "allen thomas j"."""
+    key = _NON_ALNUM_RE.sub(" ", name or "").strip().casefold()
+    return key or None
+
+@dataclass
+class StoredApplication:
+    """One stored result: the populated model plus where and how it was extracted."""
+    content_hash: str
+    source: Optional[str]
+    method: Optional[str]
+    parser_version: Optional[str]
+    stored_at: float
+    data: "URLAData"
+
+def _borrower_rows(content_hash: str, data: dict) -> List[Tuple[str, int, Optional[str], Optional[str]]]:
+    borrowers = [data.get("borrower") or {}, *(data.get("additional_borrowers") or [])]
+    return [(content_hash, position, name_key(b.get("name")), ssn_digits(b.get("social_security_number")))
+            for position, b in enumerate(borrowers)]
+
+class ResultStore:
+    """
+    SQLite store of extracted applications, keyed by the SHA-256 of the PDF
+    bytes (storing a document again replaces its row). Lookups by borrower
+    SSN or name (co-borrowers included), property ZIP/street, loan amount
+    range and content hash are index lookups; the full URLAData dict is kept
+    as JSON and rebuilt into model objects on the way out.
+
+    Writes are buffered and committed batch_size rows per transaction (one
+    executemany per table), so bulk loads are not bound by per-row commits.
+    Call flush() (or close(), or use the store as a context manager) to
+    commit the tail.
+
+    The store holds personal data in clear text: the JSON keeps every
+    extracted field, and SSNs and names are indexed as they are. Protect
+    the file like the source PDFs; use a redacted batch export (--redact)
+    for anything shared.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500):
+        self.path = path
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise ValueError(f"{path} has store schema version {version}, expected {SCHEMA_VERSION}")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._pending: List[Tuple[str, Optional[str], Optional[str], dict]] = []
+
+    # --- Writing ---
+    def add(self, data: Any, content_hash: str, source: Optional[str] = None, method: Optional[str] = None) -> None:
+        """Queues one result (a URLAData object or its dict form) for the next batch."""
+        if not isinstance(data, dict):
+            data = get_serializer(type(data))(data)
+        self._pending.append((content_hash, source, method, data))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def add_record(self, record: dict) -> bool:
+        """Queues an ok record of the batch runner; error records are skipped (False)."""
+        if record.get("status", "ok") != "ok" or not record.get("sha256"):
+            return False
+        self.add(record["data"], record["sha256"], record.get("source"), record.get("method"))
+        return True
+
+    def add_many(self, records: Iterable[dict]) -> int:
+        """Stores batch runner records and commits them; returns how many were stored."""
+        count = sum(self.add_record(record) for record in records)
+        self.flush()
+        return count
+
+    def flush(self) -> None:
+        """Writes the queued results in a single transaction."""
+        if not self._pending:
+            return
+        now = time.time()
+        applications, borrowers = [], []
+        for content_hash, source, method, data in self._pending:
+            loan = data.get("loan") or {}
+            address = loan.get("property_address") or {}
+            applications.append((content_hash, source, method, PARSER_VERSION, now, loan.get("loan_amount"),
+                                 address.get("zip_code"), name_key(address.get("street")), encode_json(data)))
+            borrowers += _borrower_rows(content_hash, data)
+        with self._conn:
+            # Replacing a document drops its previous borrower rows (ON DELETE CASCADE does
+            # not fire for an upsert, which updates the row in place).
+            self._conn.executemany("DELETE FROM borrowers WHERE content_hash = ?", [(a[0],) for a in applications])
+            self._conn.executemany(_UPSERT_APPLICATION, applications)
+            self._conn.executemany("INSERT OR REPLACE INTO borrowers VALUES (?, ?, ?, ?)", borrowers)
+        self._pending = []
+
+    # --- Queries ---
+    def _select(self, where: str, params: tuple, limit: Optional[int] = None) -> Iterator[StoredApplication]:
+        from src.data_models import URLAData
+        from src.mapper import from_dict
+        self.flush()
+        sql = f"SELECT content_hash, source, method, parser_version, stored_at, data FROM applications WHERE {where}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        for content_hash, source, method, parser_version, stored_at, data in self._conn.execute(sql, params):
+            yield StoredApplication(content_hash, source, method, parser_version, stored_at,
+                                    from_dict(URLAData, json.loads(data)))
+
+    def get(self, content_hash: str) -> Optional[StoredApplication]:
+        return next(self._select("content_hash = ?", (content_hash,)), None)
+
+    def __contains__(self, content_hash: str) -> bool:
+        self.flush()
+        return self._conn.execute("SELECT 1 FROM applications WHERE content_hash = ?", (content_hash,)).fetchone() is not None
+
+    def find_by_ssn(self, ssn: str, limit: Optional[int] = None) -> List[StoredApplication]:
+        """Applications with a borrower or co-borrower of this SSN (the dedupe check)."""
+        where = "content_hash IN (SELECT content_hash FROM borrowers WHERE ssn_digits = ?)"
+        return list(self._select(where, (ssn_digits(ssn),), limit))
+
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> List[StoredApplication]:
+        """Applications with a borrower or co-borrower of this name (compared as name_key)."""
+        where = "content_hash IN (SELECT content_hash FROM borrowers WHERE name_key = ?)"
+        return list(self._select(where, (name_key(name),), limit))
+
+    def find_by_property(self, zip_code: str, street: Optional[str] = None,
+                         limit: Optional[int] = None) -> List[StoredApplication]:
+        """Applications on the subject property with this ZIP code (and street, if given)."""
+        if street is None:
+            return list(self._select("property_zip = ?", (zip_code,), limit))
+        return list(self._select("property_zip = ? AND property_street = ?", (zip_code, name_key(street)), limit))
+
+    def find_by_loan_amount(self, minimum: Optional[float] = None, maximum: Optional[float] = None,
+                            limit: Optional[int] = None) -> List[StoredApplication]:
+        """Applications whose loan amount lies in [minimum, maximum] (either bound optional), by amount."""
+        conditions, params = ["loan_amount IS NOT NULL"], []
+        if minimum is not None:
+            conditions.append("loan_amount >= ?")
+            params.append(minimum)
+        if maximum is not None:
+            conditions.append("loan_amount <= ?")
+            params.append(maximum)
+        return list(self._select(" AND ".join(conditions) + " ORDER BY loan_amount", tuple(params), limit))
+
+    def count(self) -> int:
+        self.flush()
+        return self._conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+class StoreSink(RecordSink):
+    """Output sink writing the batch runner's ok records into a ResultStore (--format sqlite)."""
+
+    def __init__(self, target: str, batch_size: int = 500):
+        if not isinstance(target, str) or target == "-":
+            raise ValueError("the sqlite format needs an output file (-o results.db)")
+        self.store = ResultStore(target, batch_size)
+        self.count = 0
+
+    def write(self, record: Any) -> None:
+        self.count += self.store.add_record(record)
+
+    def flush(self) -> None:
+        self.store.flush()
+
+    def close(self) -> None:
+        self.store.close()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load batch results into the SQLite result store or query it.")
+    parser.add_argument("store", help="SQLite store file")
+    parser.add_argument("--load", metavar="RESULTS", help="NDJSON or JSON output of src.batch to store")
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument("--hash", help="Document content hash (SHA-256 of the PDF)")
+    query.add_argument("--ssn", help="Borrower or co-borrower SSN")
+    query.add_argument("--name", help="Borrower or co-borrower name")
+    query.add_argument("--zip", help="Subject property ZIP code")
+    query.add_argument("--loan-amount", nargs=2, type=float, metavar=("MIN", "MAX"), help="Loan amount range")
+    parser.add_argument("--street", help="With --zip: subject property street")
+    args = parser.parse_args(argv)
+
+    try:
+        store = ResultStore(args.store)
+    except (ValueError, sqlite3.DatabaseError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    with store:
+        if args.load:
+            with open(args.load, "r", encoding="utf-8") as f:
+                first = f.read(1)
+                f.seek(0)
+                records = json.load(f) if first == "[" else (json.loads(line) for line in f if line.strip())
+                print(f"Stored {store.add_many(records)} application(s)", file=sys.stderr)
+        if args.hash:
+            found = [a for a in [store.get(args.hash)] if a is not None]
+        elif args.ssn:
+            found = store.find_by_ssn(args.ssn)
+        elif args.name:
+            found = store.find_by_name(args.name)
+        elif args.zip:
+            found = store.find_by_property(args.zip, args.street)
+        elif args.loan_amount:
+            found = store.find_by_loan_amount(*args.loan_amount)
+        else:
+            return 0
+        for application in found:
+            sys.stdout.write(json.dumps({"sha256": application.content_hash, "source": application.source,
+                                         "data": get_serializer(type(application.data))(application.data)}) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+# src/templates.py
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from src.geometry import GEOMETRY_SPECS, GeometrySpec
+from src.pdf_parser import FIELD_SPECS, URLA_LAYOUT, FieldSpec
+
+# Bands of the first page (top, bottom, in points) read for the fingerprint:
+# the lender header above Section 1 and the form footer. Only these go
+# through word extraction.
+FINGERPRINT_BANDS = ((0, 110), (715, 792))
+
+class UnsupportedTemplateError(ValueError):
+    """The document is a known Form 1003 revision that has no extractor."""
+
+@dataclass
+class UrlaTemplate:
+    """
+    One revision of Form 1003 and the extractor tuned for it: the section
+    layout (page and crop box per section key), the field-spec table and
+    the geometry specs. markers are phrases that must all appear in the
+    first page's header/footer words for a document to be this revision.
+    A revision registered without an extractor (supported=False) is still
+    recognised, so such documents fail fast instead of parsing to nothing.
+    """
+    revision: str
+    markers: Tuple[str, ...]
+    layout: Dict[str, List[Tuple[int, Tuple[float, float, float, float]]]] = field(default_factory=dict)
+    field_specs: List[FieldSpec] = field(default_factory=list)
+    geometry_specs: List[GeometrySpec] = field(default_factory=list)
+    supported: bool = True
+    _selected: Dict[Optional[FrozenSet[str]], List[FieldSpec]] = field(default_factory=dict, repr=False)
+
+    def matches(self, text: str) -> bool:
+        return all(marker in text for marker in self.markers)
+
+    def select_field_specs(self, keys: Optional[Set[str]]) -> List[FieldSpec]:
+        """The field specs of these exact layout keys (all for None), selected once per key set."""
+        key = None if keys is None else frozenset(keys)
+        if key not in self._selected:
+            self._selected[key] = self.field_specs if key is None else [s for s in self.field_specs if s.section in key]
+        return self._selected[key]
+
+    @property
+    def spec_sections(self) -> FrozenSet[str]:
+        """Layout keys that have field specs (header-only keys have none)."""
+        return frozenset(spec.section for spec in self.field_specs)
+
+    @property
+    def geometry_sections(self) -> FrozenSet[str]:
+        return frozenset(spec.section for spec in self.geometry_specs)
+
+# --- Registry ---
+TEMPLATES: Dict[str, UrlaTemplate] = {}
+
+def register_template(template: UrlaTemplate) -> UrlaTemplate:
+    """Adds a revision; fingerprints are tried in registration order, so register specific ones first."""
+    TEMPLATES[template.revision] = template
+    return template
+
+URLA_2021 = register_template(UrlaTemplate(
+    "2021-01", ("Fannie Mae Form 1003", "Effective 1/2021"), URLA_LAYOUT, FIELD_SPECS, GEOMETRY_SPECS))
+# The pre-2021 URLA ("Fannie Mae Form 1003 7/05 (rev.6/09)"): a different form, no extractor yet.
+register_template(UrlaTemplate("2009-06", ("Fannie Mae Form 1003 7/05",), supported=False))
+
+# Documents without a recognisable footer (scans, stripped or re-typeset
+# copies) get the current revision's extractor, as before fingerprinting.
+DEFAULT_TEMPLATE = URLA_2021
+
+def get_template(revision: str) -> UrlaTemplate:
+    try:
+        return TEMPLATES[revision]
+    except KeyError:
+        raise ValueError(f"Unknown URLA template revision '{revision}'") from None
+
+def fingerprint(text: str) -> Optional[UrlaTemplate]:
+    """The first registered revision whose markers all appear in text, or None."""
+    return next((template for template in TEMPLATES.values() if template.matches(text)), None)
+
+def _header_footer_words(page: Any) -> str:
+    words = []
+    for top, bottom in FINGERPRINT_BANDS:
+        if top < page.height:
+            band = page.crop((0, top, page.width, min(bottom, page.height)))
+            words += [word["text"] for word in band.extract_words(x_tolerance=1)]
+    return " ".join(words)
+
+def detect_template(pdf: Any) -> UrlaTemplate:
+    """
+    Picks the extractor for an open document from the header/footer words of
+    its first page; DEFAULT_TEMPLATE when nothing is recognised. Raises
+    UnsupportedTemplateError for a known revision without an extractor.
+    """
+    template = fingerprint(_header_footer_words(pdf.pages[0])) if pdf.pages else None
+    return check_supported(template or DEFAULT_TEMPLATE)
+
+def template_for_text(text: str) -> UrlaTemplate:
+    """Same as detect_template, for already extracted document text (e.g. from the cache)."""
+    return check_supported(fingerprint(text) or DEFAULT_TEMPLATE)
+
+def check_supported(template: UrlaTemplate) -> UrlaTemplate:
+    if not template.supported:
+        raise UnsupportedTemplateError(f"URLA revision {template.revision} is recognised but has no extractor")
+    return template
@@ -0,0 +1,13 @@
+# tests/conftest.py
+import os
+
+import pytest
+
+URLA_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data", "URLA.pdf")
+
+@pytest.fixture(scope="session")
+def urla_record() -> dict:
+    """The batch runner record of Data/URLA.pdf, extracted once per test run."""
+    from src.main import extract_urla_record
+    record = extract_urla_record(URLA_PDF)
+    return {"source": URLA_PDF, "status": "ok", **record}
@@ -0,0 +1,41 @@
+# tests/test_analytics.py
+import math
+
+import pytest
+
+from src.analytics import UnderwritingLimits, score
+from src.data_models import (BankAccount, Borrower, Employment, GrossMonthlyIncome, Liability, MortgageLoanOnProperty,
+                             RealEstateProperty, URLAData)
+
+def _application(base: float, payments: float) -> URLAData:
+    urla = URLAData()
+    urla.loan.loan_amount, urla.loan.property_value = 200000.0, 250000.0
+    urla.borrower.current_employment = Employment(gross_monthly_income=GrossMonthlyIncome(base=base, total=base))
+    urla.borrower.assets_bank_retirement_other = [BankAccount(cash_or_market_value=60000.0)]
+    urla.borrower.liabilities_credit_cards_debts_leases = [
+        Liability(monthly_payment=payments), Liability(monthly_payment=300.0, paid_off_at_closing=True)]
+    urla.borrower.real_estate_owned = [RealEstateProperty(mortgage_loans=[
+        MortgageLoanOnProperty(monthly_mortgage_payment=1000.0),
+        MortgageLoanOnProperty(monthly_mortgage_payment=800.0, to_be_paid_off_at_closing=True)])]
+    co_borrower = Borrower(current_employment=Employment(gross_monthly_income=GrossMonthlyIncome(base=3000.0)))
+    urla.additional_borrowers = [co_borrower]
+    return urla
+
+def test_ratios_cover_every_borrower_and_skip_paid_off_debts():
+    scores = score([_application(5000.0, 500.0), URLAData()])
+    first, empty = scores.records()
+    # Income 5,000 + the co-borrower's 3,000; debt 500 + the retained mortgage's 1,000.
+    assert first["total_monthly_income"] == 8000.0
+    assert first["monthly_debt"] == 1500.0
+    assert first["dti"] == pytest.approx(1500 / 8000)
+    assert first["ltv"] == 0.8
+    assert first["violations"] == []
+    assert empty["dti"] is None and math.isnan(scores.metrics["dti"][1])
+    assert set(empty["violations"]) == {"missing_loan_amount", "missing_income"}
+
+def test_limits_and_summary():
+    scores = score([_application(5000.0, 500.0), _application(2000.0, 2500.0)], UnderwritingLimits(max_dti=0.36))
+    assert scores.flagged().tolist() == [1]
+    assert scores.summary() == {"records": 2, "flagged": 1, "employment_total_mismatch": 0, "dti_above_limit": 1,
+                                "ltv_above_limit": 0, "missing_loan_amount": 0, "missing_income": 0,
+                                "insufficient_funds_to_close": 0}
@@ -0,0 +1,56 @@
+# tests/test_batch.py
+import io
+import json
+import shutil
+
+from src.batch import collect_input_files, main, process_file, run_batch
+from src.output import NDJSONSink
+
+from tests.conftest import URLA_PDF
+
+def _corpus(tmp_path):
+    (tmp_path / "sub").mkdir()
+    good = [str(tmp_path / "a.pdf"), str(tmp_path / "sub" / "b.pdf")]
+    for path in good:
+        shutil.copy(URLA_PDF, path)
+    bad = tmp_path / "bad.pdf"
+    bad.write_bytes(b"%PDF-1.4 not really a pdf")
+    return good, str(bad)
+
+def _run(paths, workers):
+    out = io.BytesIO()
+    summary = run_batch(paths, NDJSONSink(out), workers)
+    return summary, {r["source"]: r for r in map(json.loads, out.getvalue().splitlines())}
+
+def test_collects_directories_manifests_and_globs(tmp_path):
+    good, bad = _corpus(tmp_path)
+    assert collect_input_files(str(tmp_path)) == sorted([*good, bad])
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# batch\nsub/b.pdf\n\n" + good[0] + "\n", encoding="utf-8")
+    assert collect_input_files(str(manifest)) == [good[1], good[0]]
+    assert collect_input_files(str(tmp_path / "*.pdf")) == sorted([good[0], bad])
+
+def test_bad_file_is_isolated(tmp_path, urla_record):
+    good, bad = _corpus(tmp_path)
+    record = process_file(bad)
+    assert record["status"] == "error" and record["source"] == bad
+    assert record["error"]
+    summary, records = _run([good[0], bad, good[1]], workers=1)
+    assert (summary["total"], summary["ok"], summary["error"]) == (3, 2, 1)
+    assert records[good[1]]["data"] == urla_record["data"]
+    assert records[bad]["status"] == "error"
+
+def test_pool_matches_inline(tmp_path):
+    good, bad = _corpus(tmp_path)
+    inline = _run([*good, bad], workers=1)[1]
+    pooled = _run([*good, bad], workers=2)[1]
+    strip = lambda records: {s: {k: v for k, v in r.items() if k != "elapsed_seconds"} for s, r in records.items()}
+    assert strip(pooled) == strip(inline)
+
+def test_cli_exit_codes(tmp_path, capsys):
+    good, bad = _corpus(tmp_path)
+    output = tmp_path / "out.ndjson"
+    assert main([str(tmp_path / "sub"), "-o", str(output), "-w", "1"]) == 0
+    assert [json.loads(line)["status"] for line in output.read_text().splitlines()] == ["ok"]
+    assert main([str(tmp_path), "-o", str(output), "-w", "1"]) == 2
+    assert main([str(tmp_path / "missing"), "-w", "1"]) == 1
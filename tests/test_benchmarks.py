@@ -0,0 +1,29 @@
+# tests/test_benchmarks.py
+from benchmarks.run_benchmarks import compare, percentile, run_target, summarize
+from benchmarks.synthetic_corpus import generate_corpus
+from src.pdf_parser import extract_borrower_personal_info
+
+def test_percentile_is_nearest_rank():
+    values = [float(v) for v in range(1, 11)]
+    assert percentile(values, 50) == 5.0
+    assert percentile(values, 90) == 9.0
+    assert percentile(values, 100) == 10.0
+    assert summarize([2.0, 4.0]) == {"mean": 3.0, "p50": 2.0, "p90": 4.0, "p99": 4.0}
+
+def test_corpus_is_reproducible_and_parseable(tmp_path):
+    first = generate_corpus(str(tmp_path / "a"), count=2, seed=7)
+    second = generate_corpus(str(tmp_path / "b"), count=2, seed=7)
+    assert [open(p, "rb").read() for p in first] == [open(p, "rb").read() for p in second]
+    data = extract_borrower_personal_info(first[0], raise_errors=True)
+    assert data["borrower_info"].get("social_security_number")
+    assert data["assets"]["bank_retirement_other"]
+
+def test_run_target_and_compare(tmp_path):
+    paths = generate_corpus(str(tmp_path), count=2, seed=7, max_extra_pages=0)
+    result = run_target("extract_urla_record", paths, repeat=1)
+    assert result["docs"] == 2 and result["docs_per_sec"] > 0
+    assert {"regex", "extract_text"} <= set(result["stages"])
+    slower = {**result, "docs_per_sec": result["docs_per_sec"] / 2}
+    lines = compare({"targets": {"t": slower}}, {"targets": {"t": result}}, 0.2)
+    assert any("docs_per_sec" in line and "REGRESSION" in line for line in lines)
+    assert compare({"targets": {"t": result}}, {"targets": {}}, 0.2) == ["t: not in baseline"]
@@ -0,0 +1,65 @@
+# tests/test_cache.py
+import os
+import pickle
+
+from src.cache import ResultCache
+from src.main import extract_urla_record
+
+from tests.conftest import URLA_PDF
+
+def _age(cache: ResultCache, doc_hash: str, kind: str, mtime: float) -> None:
+    os.utime(cache._path(doc_hash, kind, "v1"), (mtime, mtime))
+
+def test_hit_and_version_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("ab" * 32, "result", "v1", {"loan": 1})
+    assert cache.get("ab" * 32, "result", "v1") == {"loan": 1}
+    assert cache.get("ab" * 32, "result", "v2") is None
+    assert cache.get("cd" * 32, "result", "v1") is None
+
+def test_bypass_misses_but_writes(tmp_path):
+    cache = ResultCache(str(tmp_path), bypass=True)
+    cache.put("ab" * 32, "result", "v1", [1])
+    assert cache.get("ab" * 32, "result", "v1") is None
+    assert ResultCache(str(tmp_path)).get("ab" * 32, "result", "v1") == [1]
+
+def test_evicts_least_recently_used_down_to_low_water(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=10)
+    hashes = [f"{i:02d}" * 32 for i in range(11)]
+    for i, doc_hash in enumerate(hashes[:10]):
+        cache.put(doc_hash, "result", "v1", i)
+        _age(cache, doc_hash, "result", 1000 + i)
+    # A hit makes the oldest entry the most recently used one.
+    assert cache.get(hashes[0], "result", "v1") == 0
+    cache.put(hashes[10], "result", "v1", 10)
+    assert len(cache._entries()) == 9
+    assert cache.get(hashes[1], "result", "v1") is None and cache.get(hashes[2], "result", "v1") is None
+    assert cache.get(hashes[0], "result", "v1") == 0
+    assert cache.get(hashes[10], "result", "v1") == 10
+
+def test_evicts_by_size(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=5000)
+    for i in range(6):
+        cache.put(f"{i:02d}" * 32, "result", "v1", "x" * 1000)
+    assert len(cache._entries()) == 4
+
+def test_scans_once_per_process(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path), max_entries=100)
+    cache.put("aa" * 32, "result", "v1", 1)
+    scans = []
+    entries = ResultCache._entries
+    monkeypatch.setattr(ResultCache, "_entries", lambda self: scans.append(1) or entries(self))
+    # The batch runner sends a pickled copy of the cache with every task.
+    for i in range(5):
+        pickle.loads(pickle.dumps(cache)).put(f"{i:02d}" * 32, "result", "v1", i)
+    assert scans == []
+    assert len(entries(cache)) == 6
+
+def test_repeated_document_is_served_from_cache(tmp_path, urla_record):
+    cache = ResultCache(str(tmp_path))
+    first = extract_urla_record(URLA_PDF, cache)
+    second = extract_urla_record(URLA_PDF, cache)
+    assert not first["cached"] and second["cached"]
+    assert second["method"] == "cache"
+    assert second["sha256"] == first["sha256"] == urla_record["sha256"]
+    assert second["data"] == first["data"] == urla_record["data"]
@@ -0,0 +1,56 @@
+# tests/test_columnar.py
+import math
+from array import array
+
+import numpy as np
+
+from src.columnar import column_names, to_columns
+from src.data_models import BankAccount, Liability, MortgageLoanOnProperty, RealEstateProperty, URLAData
+from src.mapper import from_dict
+
+def test_columns_of_the_sample(urla_record):
+    urla = from_dict(URLAData, urla_record["data"])
+    columns = to_columns([urla, URLAData()])
+    assert isinstance(columns["loan.loan_amount"], np.ndarray)
+    assert columns["loan.loan_amount"][0] == 1000000.0 and math.isnan(columns["loan.loan_amount"][1])
+    assert columns["borrower.social_security_number"] == ["12-234-3123", None]
+    accounts = urla.borrower.assets_bank_retirement_other
+    assert columns["borrower.assets_bank_retirement_other.count"].tolist() == [len(accounts), 0]
+    total = columns["borrower.assets_bank_retirement_other.cash_or_market_value.sum"]
+    assert total[0] == sum(a.cash_or_market_value for a in accounts) and math.isnan(total[1])
+
+def test_only_amounts_are_summed():
+    names = column_names()
+    assert "borrower.real_estate_owned.address.how_long_years.sum" not in names
+    assert "borrower.liabilities_credit_cards_debts_leases.paid_off_at_closing.sum" not in names
+    assert "borrower.additional_employment.gross_monthly_income.base.sum" in names
+    assert "loan.number_of_units" in names
+    assert len(names) == len(set(names))
+
+def test_nested_lists_and_paid_off_items():
+    urla = URLAData()
+    urla.borrower.liabilities_credit_cards_debts_leases = [
+        Liability(monthly_payment=100.0), Liability(monthly_payment=50.0, paid_off_at_closing=True)]
+    urla.borrower.real_estate_owned = [
+        RealEstateProperty(mortgage_loans=[MortgageLoanOnProperty(monthly_mortgage_payment=900.0),
+                                           MortgageLoanOnProperty(monthly_mortgage_payment=400.0,
+                                                                  to_be_paid_off_at_closing=True)]),
+        RealEstateProperty()]
+    columns = to_columns([urla])
+    assert columns["borrower.liabilities_credit_cards_debts_leases.monthly_payment.sum"][0] == 150.0
+    assert columns["borrower.liabilities_credit_cards_debts_leases.monthly_payment.sum_after_closing"][0] == 100.0
+    assert columns["borrower.real_estate_owned.mortgage_loans.monthly_mortgage_payment.sum"][0] == 1300.0
+    assert columns["borrower.real_estate_owned.mortgage_loans.monthly_mortgage_payment.sum_after_closing"][0] == 900.0
+    # Nothing is paid off among the assets: no after-closing variant.
+    assert "borrower.assets_bank_retirement_other.cash_or_market_value.sum_after_closing" not in columns
+
+def test_without_numpy_columns_are_arrays():
+    urla = URLAData()
+    urla.borrower.assets_bank_retirement_other = [BankAccount(cash_or_market_value=10.0), BankAccount()]
+    columns = to_columns([urla], as_numpy=False)
+    assert isinstance(columns["loan.loan_amount"], array)
+    assert columns["borrower.assets_bank_retirement_other.cash_or_market_value.sum"].tolist() == [10.0]
+
+def test_empty_input():
+    columns = to_columns([])
+    assert set(columns) == set(column_names()) and len(columns["loan.loan_amount"]) == 0
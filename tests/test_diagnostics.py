@@ -0,0 +1,48 @@
+# tests/test_diagnostics.py
+from benchmarks.synthetic_corpus import write_pdf
+from src.batch import BatchOptions, process_file
+from src.diagnostics import DiagnosticsRollup, DocumentDiagnostics, write_manifest
+from src.pdf_parser import extract_urla
+
+from tests.conftest import URLA_PDF
+
+def test_sample_report():
+    diagnostics = DocumentDiagnostics()
+    result = extract_urla(URLA_PDF, diagnostics=diagnostics)
+    ssn = diagnostics.fields["social_security_number"]
+    assert (ssn.status, ssn.anchor) == ("matched", "1a")
+    assert result.text[ssn.start:ssn.end].startswith("Social Security Number 12 – 234 – 3123")
+    assert diagnostics.fields["liabilities.credit_cards_debts_leases"].rows == 3
+    report = diagnostics.as_dict()
+    assert (report["method"], report["template"], report["errors"]) == ("text", "2021-01", {})
+    assert "current_employment.address" in report["missed"]
+
+def test_conversion_errors_are_recorded_not_raised(tmp_path):
+    path = str(tmp_path / "garbled.pdf")
+    write_pdf([[""] * 9 + ["Section 1: Borrower Information", "1a. Personal Information",
+                           "Social Security Number 123-45-6789", "1b. Current Employment/Self-Employment and Income",
+                           "Base $ ./month"]], path)
+    record = process_file(path, BatchOptions(diagnostics=True))
+    assert record["status"] == "ok"
+    assert list(record["diagnostics"]["errors"]) == ["current_employment.base"]
+    assert record["data"]["borrower"]["social_security_number"] == "123-45-6789"
+
+def _record(source, missed=(), errors=None, status="ok"):
+    return {"source": source, "status": status,
+            "diagnostics": {"fields": {"ssn": ["1a", 0, 9]} if "ssn" not in missed else {},
+                            "missed": list(missed), "errors": errors or {}}}
+
+def test_rollup_picks_the_documents_to_reprocess(tmp_path):
+    rollup = DiagnosticsRollup().add_many([
+        _record("a.pdf", missed=["alternate_names"]),
+        _record("b.pdf", missed=["alternate_names", "ssn"]),
+        _record("c.pdf", missed=["alternate_names"], errors={"base": "ValueError: ."}),
+        _record("d.pdf", missed=["alternate_names"]),
+        {"source": "e.pdf", "status": "error", "error": "PdfminerException: broken"}])
+    assert rollup.miss_rates() == {"alternate_names": 1.0, "base": 1.0, "ssn": 0.25}
+    # A field most documents have (ssn) counts as a miss; one nearly all leave blank does not.
+    assert rollup.to_reprocess() == ["b.pdf", "c.pdf", "e.pdf"]
+    assert rollup.as_dict()["fields"]["ssn"] == {"miss_rate": 0.25, "matched": 3, "missed": 1}
+    manifest = tmp_path / "reprocess.txt"
+    write_manifest(str(manifest), rollup.to_reprocess())
+    assert [line.rsplit("/", 1)[1] for line in manifest.read_text().splitlines()] == ["b.pdf", "c.pdf", "e.pdf"]
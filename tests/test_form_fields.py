@@ -0,0 +1,48 @@
+# tests/test_form_fields.py
+from benchmarks.synthetic_corpus import write_pdf
+from src.form_fields import map_form_fields, normalize_field_name
+from src.pdf_parser import _new_extracted_data, extract_urla
+
+# Text pages on the 1/2021 layout: the blank lines move the headers into their section regions.
+PAGES = [[""] * 9 + ["Section 1: Borrower Information", "1a. Personal Information",
+                     "Social Security Number 123-45-6789", "Email tamass@superduper.com"],
+         [], [], [],
+         [""] * 5 + ["Section 4: Loan and Property Information", "4a. Loan and Property Information",
+                     "Loan Amount $ 250,000", "Number of Units 2"]]
+
+def test_normalize_field_name():
+    assert normalize_field_name("form1[0].Page1[0].Borrower_SSN[0]") == "borrowerssn"
+    assert normalize_field_name("Loan Amount") == "loanamount"
+
+def test_map_form_fields_reports_filled_sections():
+    data = _new_extracted_data()
+    filled = map_form_fields({"form1[0].SSN[0]": "123-45-6789", "form1[0].LoanAmount[0]": "$250,000.00",
+                              "form1[0].Unknown[0]": "x", "form1[0].PropertyValue[0]": ""}, data)
+    assert filled == {"1a", "4a"}
+    assert data["borrower_info"]["social_security_number"] == "123-45-6789"
+    assert data["loan_property_info"]["loan_amount"] == 250000.0
+    assert "property_value" not in data["loan_property_info"]
+    assert map_form_fields({"form1[0].SSN[0]": "123-45-6789"}, _new_extracted_data(), {"4a"}) == set()
+
+def test_partly_filled_form_reads_the_other_sections_from_text(tmp_path):
+    path = str(tmp_path / "form.pdf")
+    write_pdf(PAGES, path, {"form1[0].LoanAmount[0]": "275,000"})
+    result = extract_urla(path)
+    assert result.method == "acroform+text"
+    assert result.data["loan_property_info"]["loan_amount"] == 275000.0
+    assert result.data["borrower_info"]["social_security_number"] == "123-45-6789"
+    assert result.data["borrower_info"]["contact_info"]["email"] == "tamass@superduper.com"
+
+def test_form_covering_the_requested_sections_skips_the_text(tmp_path):
+    path = str(tmp_path / "form.pdf")
+    write_pdf(PAGES, path, {"form1[0].LoanAmount[0]": "275,000"})
+    result = extract_urla(path, sections=["4a"])
+    assert result.method == "acroform" and result.text is None
+    assert result.data["loan_property_info"] == {"property_address": {}, "loan_amount": 275000.0}
+
+def test_flattened_document_uses_the_text(tmp_path):
+    path = str(tmp_path / "flat.pdf")
+    write_pdf(PAGES, path)
+    result = extract_urla(path)
+    assert result.method == "text"
+    assert result.data["loan_property_info"]["loan_amount"] == 250000.0
@@ -0,0 +1,45 @@
+# tests/test_geometry.py
+import pdfplumber
+
+from benchmarks.synthetic_corpus import write_pdf
+from src.geometry import GEOMETRY_SECTIONS, WordGrid, extract_geometry
+from src.pdf_parser import _new_extracted_data, extract_urla
+
+from tests.conftest import URLA_PDF
+
+def _word(text, x0, top):
+    return {"text": text, "x0": x0, "x1": x0 + 6 * len(text), "top": top, "bottom": top + 8}
+
+def test_word_grid():
+    grid = WordGrid([_word("Loan", 40, 100), _word("Amount", 70, 100), _word("$", 200, 100),
+                     _word("250,000", 210, 100), _word("Loan", 40, 400), _word("Purpose", 70, 400)])
+    assert grid.find("Loan Amount", (36, 104)) is grid.words[0]
+    # The phrase must follow the first word, and sit within the tolerance of its template position.
+    assert grid.find("Loan Amount", (40, 400)) is None
+    assert grid.find("Loan Purpose", (40, 395)) is grid.words[4]
+    assert [w["text"] for w in grid.within(190, 95, 300, 115)] == ["$", "250,000"]
+
+def test_sample_fields_from_word_positions():
+    geometry, text = extract_urla(URLA_PDF, engine="geometry"), extract_urla(URLA_PDF)
+    assert geometry.method == "geometry"
+    borrower = geometry.data["borrower_info"]
+    for key in ("name", "social_security_number", "date_of_birth", "citizenship"):
+        assert borrower[key] == text.data["borrower_info"][key]
+    assert geometry.data["employment_info"]["current_employment"]["gross_monthly_income"] == \
+        text.data["employment_info"]["current_employment"]["gross_monthly_income"]
+    assert geometry.data["loan_property_info"]["loan_amount"] == 1000000.0
+    # Values the linearized text runs together are read from their boxes.
+    assert borrower["contact_info"]["home_phone"] == "(248) 777-1234"
+    assert borrower["alternate_names"] == "T.A."
+    # Sections outside the template fields stay on the text path.
+    assert geometry.data["assets"] == text.data["assets"]
+
+def test_off_template_pages_fall_back_to_the_text(tmp_path):
+    path = str(tmp_path / "plain.pdf")
+    write_pdf([[""] * 9 + ["Section 1: Borrower Information", "1a. Personal Information",
+                           "Social Security Number 123-45-6789"]], path)
+    with pdfplumber.open(path) as pdf:
+        data = _new_extracted_data()
+        assert extract_geometry(pdf, None, data) == GEOMETRY_SECTIONS
+        assert data == _new_extracted_data()
+    assert extract_urla(path, engine="geometry").data["borrower_info"]["social_security_number"] == "123-45-6789"
@@ -0,0 +1,38 @@
+# tests/test_incremental.py
+from benchmarks.synthetic_corpus import write_pdf
+from src.cache import ResultCache
+from src.incremental import extract_revision
+from src.main import extract_urla_record
+
+def _pages(loan_amount: str) -> list:
+    return [["Section 1: Borrower Information", "1a. Personal Information", "Social Security Number 123-45-6789"],
+            ["Section 4: Loan and Property Information", "4a. Loan and Property Information",
+             f"Loan Amount $ {loan_amount}"]]
+
+def test_revision_reparses_only_the_changed_pages(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    first, second = str(tmp_path / "rev1.pdf"), str(tmp_path / "rev2.pdf")
+    write_pdf(_pages("250,000"), first)
+    write_pdf(_pages("275,000"), second)
+    original = extract_revision(first, cache)
+    assert original["method"] == "text" and original["sections"] is None
+
+    revised = extract_revision(second, cache, previous=original["sha256"])
+    assert revised["method"] == "incremental"
+    assert revised["changed_pages"] == [1]
+    assert "4a" in revised["sections"] and "1a" not in revised["sections"]
+    assert revised["data"] == extract_urla_record(second)["data"]
+    assert revised["data"]["loan"]["loan_amount"] == 275000.0
+
+    again = extract_revision(second, cache, previous=original["sha256"])
+    assert again["cached"] and again["data"] == revised["data"]
+
+def test_form_widgets_merge_with_the_uncovered_text(tmp_path):
+    path = str(tmp_path / "form.pdf")
+    write_pdf(_pages("250,000"), path, {"form1[0].LoanAmount[0]": "300,000"})
+    record = extract_revision(path, ResultCache(str(tmp_path / "cache")))
+    assert record["method"] == "acroform+text"
+    # Only the section the widgets filled is left out of the text parse.
+    assert "4a" not in record["sections"] and "1a" in record["sections"]
+    assert record["data"]["loan"]["loan_amount"] == 300000.0
+    assert record["data"]["borrower"]["social_security_number"] == "123-45-6789"
@@ -0,0 +1,31 @@
+# tests/test_mapper.py
+from src.data_models import Borrower, URLAData
+from src.mapper import from_dict, get_builder, urla_from_extracted_dict
+from src.output import dataclass_to_dict
+from src.pdf_parser import extract_borrower_personal_info
+
+from tests.conftest import URLA_PDF
+
+def test_populates_the_sample_application():
+    urla = urla_from_extracted_dict(extract_borrower_personal_info(URLA_PDF, raise_errors=True))
+    assert urla.borrower.social_security_number == "12-234-3123"
+    assert urla.borrower.contact_info.email == "tamass@superduper.com"
+    assert urla.loan.loan_amount == 1000000.0
+    assert urla.loan.property_address.zip_code == "07306"
+    assert urla.borrower.assets_bank_retirement_other[0].account_number == "234-24-199492"
+
+def test_round_trip(urla_record):
+    urla = from_dict(URLAData, urla_record["data"])
+    assert isinstance(urla, URLAData)
+    assert dataclass_to_dict(urla) == urla_record["data"]
+    assert dataclass_to_dict(from_dict(URLAData, dataclass_to_dict(urla))) == urla_record["data"]
+
+def test_missing_fields_get_defaults():
+    urla = from_dict(URLAData, {})
+    assert urla == URLAData()
+    assert urla.borrower.assets_bank_retirement_other == []
+    assert urla.borrower.assets_bank_retirement_other is not URLAData().borrower.assets_bank_retirement_other
+
+def test_builder_passes_instances_through():
+    borrower = Borrower(name="Allen Thomas")
+    assert get_builder(Borrower)(borrower) is borrower
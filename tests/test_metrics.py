@@ -0,0 +1,34 @@
+# tests/test_metrics.py
+import time
+
+from src.batch import BatchOptions, process_file
+from src.main import extract_urla_record
+from src.metrics import DocumentMetrics, stage
+
+from tests.conftest import URLA_PDF
+
+def test_stages_accumulate():
+    metrics = DocumentMetrics()
+    for _ in range(2):
+        with metrics.stage("regex"):
+            time.sleep(0.01)
+    with stage(None, "regex"):
+        pass
+    assert metrics.stages["regex"]["wall"] >= 0.02
+    assert set(metrics.as_dict()["stages"]) == {"regex"}
+
+def test_document_metrics():
+    metrics = DocumentMetrics()
+    extract_urla_record(URLA_PDF, metrics=metrics)
+    record = metrics.as_dict()
+    assert record["source"] == URLA_PDF and record["method"] == "text"
+    assert record["page_count"] == 9 and record["text_length"] > 0
+    assert {"read", "open", "extract_text", "regex", "populate", "serialize"} <= set(record["stages"])
+    assert {"1a", "4a"} <= set(record["sections"])
+    assert "profile" not in record
+
+def test_profiled_batch_record():
+    record = process_file(URLA_PDF, BatchOptions(profile=True))
+    assert record["status"] == "ok"
+    profile = record["metrics"]["profile"]
+    assert profile["peak_memory_bytes"] > 0 and "cumulative" in profile["cumulative_top"]
@@ -0,0 +1,36 @@
+# tests/test_ocr.py
+import pdfplumber
+
+import src.ocr
+from benchmarks.synthetic_corpus import write_pdf
+from src.cache import ResultCache
+from src.ocr import OcrEngine, default_ocr_engine, is_image_only
+
+def _fake_ocr(calls):
+    def ocr_page(source, page_index, resolution=300, lang="eng", timeout=None):
+        calls.append(page_index)
+        return f"page {page_index}"
+    return ocr_page
+
+def test_worker_processes_recognise_inline_and_cache(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(src.ocr, "ocr_page", _fake_ocr(calls))
+    monkeypatch.setattr(src.ocr, "_in_worker", lambda: True)
+    engine = OcrEngine(workers=4, cache=ResultCache(str(tmp_path)))
+    assert engine.recognize(b"%PDF", {0: "a" * 64, 2: "b" * 64}) == {0: "page 0", 2: "page 2"}
+    # No pool of its own inside a worker process.
+    assert engine._executor is None and calls == [0, 2]
+    assert engine.recognize(b"%PDF", {5: "b" * 64}) == {5: "page 2"}
+    assert calls == [0, 2]
+
+def test_default_engines_are_closed_at_exit(tmp_path):
+    engine = default_ocr_engine(ResultCache(str(tmp_path)))
+    assert default_ocr_engine(ResultCache(str(tmp_path))) is engine
+    src.ocr._close_default_engines()
+    assert default_ocr_engine(ResultCache(str(tmp_path))) is not engine
+
+def test_text_pages_are_not_scans(tmp_path):
+    path = str(tmp_path / "text.pdf")
+    write_pdf([["Section 1: Borrower Information"]], path)
+    with pdfplumber.open(path) as pdf:
+        assert not is_image_only(pdf.pages[0])
@@ -0,0 +1,59 @@
+# tests/test_output.py
+import dataclasses
+import io
+import json
+
+import pytest
+
+from src.data_models import URLAData
+from src.mapper import from_dict
+from src.output import (JSONArraySink, NDJSONSink, OutputSink, RecordSink, dataclass_to_dict, encode_json,
+                        get_serializer, open_sink)
+
+def test_serializer_matches_asdict(urla_record):
+    urla = from_dict(URLAData, urla_record["data"])
+    assert get_serializer(URLAData)(urla) == dataclasses.asdict(urla)
+    assert dataclass_to_dict([urla]) == [dataclasses.asdict(urla)]
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_encode_json(fast):
+    assert json.loads(encode_json({"name": "Zoë", "amount": 1.5, "rows": [None]}, fast)) == \
+        {"name": "Zoë", "amount": 1.5, "rows": [None]}
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_ndjson_sink_flushes_by_buffer_size(fast):
+    out = io.BytesIO()
+    sink = NDJSONSink(out, buffer_size=64, fast=fast)
+    sink.write({"source": "a.pdf"})
+    assert out.getvalue() == b""
+    sink.write({"source": "b.pdf", "padding": "x" * 64})
+    assert out.getvalue().count(b"\n") == 2
+    sink.write({"source": "c.pdf"})
+    sink.close()
+    assert [json.loads(line)["source"] for line in out.getvalue().splitlines()] == ["a.pdf", "b.pdf", "c.pdf"]
+    assert sink.count == 3
+
+def test_json_array_sink(tmp_path):
+    path = str(tmp_path / "out.json")
+    with open_sink(path, "json") as sink:
+        for source in ("a.pdf", "b.pdf"):
+            sink.write({"source": source})
+    assert [r["source"] for r in json.load(open(path))] == ["a.pdf", "b.pdf"]
+    out = io.BytesIO()
+    JSONArraySink(out).close()
+    assert json.loads(out.getvalue()) == []
+
+def test_append_continues_a_file(tmp_path):
+    path = str(tmp_path / "out.ndjson")
+    for source in ("a.pdf", "b.pdf"):
+        with open_sink(path, "ndjson", append=True) as sink:
+            sink.write({"source": source})
+    assert [json.loads(line)["source"] for line in open(path)] == ["a.pdf", "b.pdf"]
+
+def test_sinks_are_abstract():
+    with pytest.raises(TypeError):
+        OutputSink()
+    with pytest.raises(TypeError):
+        RecordSink()
+    with pytest.raises(ValueError):
+        open_sink("-", "xml")
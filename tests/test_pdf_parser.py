@@ -0,0 +1,190 @@
+# tests/test_pdf_parser.py
+import re
+
+import pdfplumber
+import pytest
+
+from benchmarks.synthetic_corpus import write_pdf
+from src.pdf_parser import (FieldSpec, _layout_regions, _new_extracted_data, _parallel_region_texts,
+                            apply_field_specs, extract_borrower_personal_info, extract_text, extract_urla,
+                            iter_urla_pages, parse_urla_text, resolve_sections, select_field_specs, split_borrowers,
+                            split_sections)
+
+from tests.conftest import URLA_PDF
+
+TEXT = ("Section 1: Borrower Information\n"
+        "1a. Personal Information\nSocial Security Number 123 – 45 – 6789\n"
+        "1b. Current Employment\nBase $ 5,000.00/month\n"
+        "Section 4: Loan and Property Information\n"
+        "4a. Loan and Property Information\nLoan Amount $ 250,000\n"
+        "Section 1: Borrower Information\n"
+        "1a. Personal Information\nSocial Security Number 987-65-4321\n")
+
+def test_split_sections_spans_run_to_the_next_header():
+    spans = split_sections(TEXT)
+    assert list(spans) == ["1", "1a", "1b", "4", "4a"]
+    start, end = spans["1a"]
+    assert TEXT[start:end] == "1a. Personal Information\nSocial Security Number 123 – 45 – 6789\n"
+    assert spans["1b"][1] == spans["4"][0]
+    # A repeated header (an additional borrower's pages) keeps the first span.
+    assert spans["1"][0] == 0
+
+def test_split_borrowers():
+    parts = split_borrowers(TEXT)
+    assert len(parts) == 2
+    assert TEXT[parts[1][0]:].startswith("Section 1:") and parts[1][1] == len(TEXT)
+
+def test_specs_run_against_their_section_only():
+    data = parse_urla_text(TEXT)
+    assert data["borrower_info"]["social_security_number"] == "123-45-6789"
+    assert data["employment_info"]["current_employment"]["gross_monthly_income"]["base"] == 5000.0
+    assert data["loan_property_info"]["loan_amount"] == 250000.0
+    assert data["additional_borrowers"][0]["borrower_info"]["social_security_number"] == "987-65-4321"
+
+def test_fallback_and_extend():
+    spec = FieldSpec("amounts", "2a", ("other_income_sources",), re.compile(r"\$ ([\d,]+)"),
+                     lambda m: m.group(1), mode="extend")
+    data = apply_field_specs(TEXT, [spec], _new_extracted_data())
+    assert data["other_income_sources"] == ["5,000", "250,000"]
+    strict = FieldSpec(spec.name, spec.section, spec.path, spec.pattern, spec.convert, "extend", fallback=False)
+    assert apply_field_specs(TEXT, [strict], _new_extracted_data())["other_income_sources"] == []
+
+def test_select_field_specs():
+    assert {spec.section for spec in select_field_specs(["4a"])} == {"4a"}
+    assert {spec.section for spec in select_field_specs(["1"])} >= {"1a", "1b", "1c"}
+
+def test_sample_document():
+    data = extract_borrower_personal_info(URLA_PDF, raise_errors=True)
+    assert data["borrower_info"]["social_security_number"] == "12-234-3123"
+    assert data["loan_property_info"]["loan_amount"] == 1000000.0
+    assert data["loan_property_info"]["property_address"]["zip"] == "07306"
+
+# --- Section selection ---
+def test_resolve_sections():
+    assert resolve_sections(None) is None
+    assert resolve_sections(["1"]) == {"1", "1a", "1b", "1c", "1d", "1e"}
+    assert resolve_sections(["4a", " 9"]) == {"4a", "9"}
+    with pytest.raises(ValueError):
+        resolve_sections(["10"])
+
+def test_adjacent_regions_are_merged():
+    regions = _layout_regions({"1b", "1a", "1c"})
+    assert regions == [(0, (0, 158, 612, 792)), (1, (0, 0, 612, 218))]
+
+def test_requested_sections_match_the_full_extraction():
+    full = extract_urla(URLA_PDF).data
+    partial = extract_urla(URLA_PDF, sections=["4"]).data
+    assert partial["loan_property_info"] == full["loan_property_info"]
+    assert partial["rental_income_on_property"] == full["rental_income_on_property"]
+    assert partial["borrower_info"] == _new_extracted_data()["borrower_info"]
+
+def test_failed_conversion_keeps_the_fields_parsed_before_it(tmp_path, capsys):
+    path = str(tmp_path / "garbled.pdf")
+    write_pdf([[""] * 9 + ["Section 1: Borrower Information", "1a. Personal Information",
+                           "Social Security Number 123-45-6789", "1b. Current Employment/Self-Employment and Income",
+                           "Base $ ./month"]], path)
+    data = extract_borrower_personal_info(path)
+    assert data["borrower_info"]["social_security_number"] == "123-45-6789"
+    assert "An error occurred during parsing" in capsys.readouterr().out
+    with pytest.raises(ValueError):
+        extract_borrower_personal_info(path, raise_errors=True)
+
+# --- Streaming ---
+FOOTER = "Uniform Residential Loan Application"
+STATEMENT = ["Chase Bank Monthly Statement", "Beginning Balance $ 1,200.00"]
+PACKET = [STATEMENT,
+          ["Section 1: Borrower Information", "1a. Personal Information",
+           "Social Security Number 123-45-6789", FOOTER],
+          ["Section 2: Financial Information — Assets and Liabilities", FOOTER],
+          ["Section 4: Loan and Property Information", "4a. Loan and Property Information",
+           "Loan Amount $ 250,000", FOOTER],
+          STATEMENT]
+
+def test_iter_urla_pages_skips_the_rest_of_the_packet(tmp_path):
+    path = str(tmp_path / "packet.pdf")
+    write_pdf(PACKET, path)
+    with pdfplumber.open(path) as pdf:
+        assert [index for index, _ in iter_urla_pages(pdf)] == [1, 2, 3]
+        # Section 2's header is past the last requested section: the walk stops there.
+        assert [index for index, _ in iter_urla_pages(pdf, {"1a"})] == [1, 2]
+
+def test_streamed_extraction(tmp_path):
+    path = str(tmp_path / "packet.pdf")
+    write_pdf(PACKET, path)
+    result = extract_urla(path, stream=True)
+    assert result.pages == (1, 3)
+    assert result.data["borrower_info"]["social_security_number"] == "123-45-6789"
+    assert result.data["loan_property_info"]["loan_amount"] == 250000.0
+    assert "Monthly Statement" not in result.text
+
+# --- Parallel pages ---
+def test_parallel_pages_match_sequential():
+    assert extract_text(URLA_PDF, page_workers=2) == extract_text(URLA_PDF)
+    assert extract_text(URLA_PDF, ["4"], page_workers=3) == extract_text(URLA_PDF, ["4"])
+    parallel = extract_urla(URLA_PDF, page_workers=2)
+    assert (parallel.method, parallel.data) == ("text", extract_urla(URLA_PDF).data)
+
+def test_parallel_pages_without_regions(tmp_path):
+    # A one-page document has none of section 4's pages: nothing to extract.
+    path = str(tmp_path / "short.pdf")
+    write_pdf([["Section 1: Borrower Information"]], path)
+    assert _parallel_region_texts(path, [], 2) == []
+    assert extract_text(path, ["4"], page_workers=2) == extract_text(path, ["4"]) == ""
+
+# --- Tables ---
+TABLES = ("Section 2: Financial Information — Assets and Liabilities\n"
+          "2c. Liabilities\n"
+          "Installment Ally Bank 2302-24 $ 4,999 $ 120\n"
+          "Revolving Comerica Bank 20222-22 $ 399 4 $ 12\n"
+          "Lease Unknown 1 $ ?? $ 80\n"
+          "Other $ $\n"
+          "Section 3: Financial Information — Real Estate\n"
+          "3a. Property You Own\n"
+          "Address Street 34 Cherry Street Unit # A\n"
+          "City Cherryville State WA ZIP 19324 Country USA\n"
+          "$ 1,400,000 Pending Sale Primary Residence $ 3,400 $ $\n"
+          "Washington Bank 222222002 $ 1,700 $ 340,000 4 Conventional $\n"
+          "Section 4: Loan and Property Information\n"
+          "4d. Gifts or Grants\n"
+          "Grant Deposited 4 Not Deposited Community Nonprofit $ 100,000\n")
+
+def test_table_rows():
+    data = parse_urla_text(TABLES)
+    assert data["liabilities"]["credit_cards_debts_leases"] == [
+        {"account_type": "Installment", "company_name": "Ally Bank", "account_number": "2302-24",
+         "unpaid_balance": 4999.0, "paid_off_at_closing": False, "monthly_payment": 120.0},
+        {"account_type": "Revolving", "company_name": "Comerica Bank", "account_number": "20222-22",
+         "unpaid_balance": 399.0, "paid_off_at_closing": True, "monthly_payment": 12.0},
+        # An unreadable cell becomes None; the empty template row never matches.
+        {"account_type": "Lease", "company_name": "Unknown", "account_number": "1",
+         "unpaid_balance": None, "paid_off_at_closing": False, "monthly_payment": 80.0}]
+    prop, = data["real_estate_owned"]
+    assert prop["address"]["city"] == "Cherryville"
+    assert (prop["property_value"], prop["status"], prop["monthly_rental_income"]) == (1400000.0, "Pending Sale", None)
+    assert prop["mortgage_loans"] == [{"creditor_name": "Washington Bank", "account_number": "222222002",
+                                       "monthly_mortgage_payment": 1700.0, "unpaid_balance": 340000.0,
+                                       "to_be_paid_off_at_closing": True, "type": "Conventional", "credit_limit": None}]
+    assert data["gifts_grants"] == [{"asset_type": "Grant", "deposited_not_deposited": "Not Deposited",
+                                     "source": "Community Nonprofit", "cash_or_market_value": 100000.0}]
+
+def test_additional_borrower_tables():
+    borrower = "Section 1: Borrower Information\n1a. Personal Information\nSocial Security Number 123-45-6789\n"
+    co_borrower = ("Section 1: Borrower Information\n"
+                   "1a. Personal Information\nSocial Security Number 987-65-4321\n"
+                   "Section 2: Financial Information — Assets and Liabilities\n"
+                   "2c. Liabilities\nInstallment Chase 77 $ 1,000 $ 50\n")
+    data = parse_urla_text(borrower + TABLES + co_borrower)
+    extra, = data["additional_borrowers"]
+    assert extra["borrower_info"]["social_security_number"] == "987-65-4321"
+    assert [row["company_name"] for row in extra["liabilities"]["credit_cards_debts_leases"]] == ["Chase"]
+    assert len(data["liabilities"]["credit_cards_debts_leases"]) == 3
+    # Loan sections (gifts, new mortgages) only belong to the application, not to a borrower.
+    assert "gifts_grants" not in extra
+
+def test_sample_tables():
+    data = extract_urla(URLA_PDF).data
+    liabilities = data["liabilities"]["credit_cards_debts_leases"]
+    assert [row["paid_off_at_closing"] for row in liabilities] == [False, False, True]
+    assert [prop["status"] for prop in data["real_estate_owned"]][0] == "Pending Sale"
+    assert data["other_new_mortgage_loans"][0]["lien_type"] == "Subordinate Lien"
+    assert sum(gift["cash_or_market_value"] for gift in data["gifts_grants"]) == 113000.0
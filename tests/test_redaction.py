@@ -0,0 +1,42 @@
+# tests/test_redaction.py
+import copy
+
+import pytest
+
+from src.data_models import URLAData
+from src.mapper import from_dict
+from src.output import Redactor
+
+def test_masks(urla_record):
+    record = copy.deepcopy(urla_record)
+    redacted = Redactor("mask").redact_record(record)
+    borrower = redacted["data"]["borrower"]
+    assert borrower["social_security_number"] == "***-**-3123"
+    assert borrower["contact_info"]["email"] == "***@superduper.com"
+    # The extension is not part of the number.
+    assert borrower["contact_info"]["work_phone"] == "(***) ***-1234"
+    assert borrower["assets_bank_retirement_other"][0]["account_number"] == "****9492"
+    assert borrower["name"] == urla_record["data"]["borrower"]["name"]
+    assert redacted["data"]["loan"] == urla_record["data"]["loan"]
+    assert record == urla_record
+
+def test_hashes_are_keyed_and_normalized():
+    redactor = Redactor("hash", b"key-1")
+    token = redactor.redact("ssn", "123-45-6789")
+    assert token == redactor.redact("ssn", "123 45 6789") == redactor.redact("ssn", "123456789")
+    assert token != Redactor("hash", b"key-2").redact("ssn", "123-45-6789")
+    assert "6789" not in token
+    assert redactor.redact("phone", "(248) 333-1234 Ext. 211") == redactor.redact("phone", "248-333-1234")
+    assert redactor.redact("email", " Tamass@SuperDuper.com") == redactor.redact("email", "tamass@superduper.com")
+
+def test_redacts_dataclasses(urla_record):
+    urla = from_dict(URLAData, urla_record["data"])
+    redacted = Redactor("hash", b"key").redact_record(urla)
+    assert redacted["borrower"]["social_security_number"] == Redactor("hash", b"key").redact("ssn", "12-234-3123")
+    assert urla.borrower.social_security_number == "12-234-3123"
+
+def test_hash_mode_needs_a_key():
+    with pytest.raises(ValueError):
+        Redactor("hash")
+    with pytest.raises(ValueError):
+        Redactor("scramble")
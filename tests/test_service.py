@@ -0,0 +1,121 @@
+# tests/test_service.py
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import src.service
+from src.service import ExtractionService
+
+from tests.conftest import URLA_PDF
+
+async def _request(port: int, method: str, path: str, body: Optional[bytes] = b"",
+                   length: Optional[int] = None) -> Tuple[int, dict, dict]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    length = len(body) if length is None else length
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {length}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), 30)
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    headers = dict(line.split(": ", 1) for line in header_lines)
+    return int(status_line.split(" ")[1]), headers, json.loads(payload)
+
+def _serve(service: ExtractionService, scenario) -> None:
+    async def run():
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        async with server:
+            await scenario(server.sockets[0].getsockname()[1])
+    try:
+        asyncio.run(run())
+    finally:
+        service.close()
+
+def test_extracts_and_rejects_unreadable_uploads(urla_record):
+    with open(URLA_PDF, "rb") as f:
+        pdf_bytes = f.read()
+    executor = ThreadPoolExecutor(1)
+    service = ExtractionService(workers=1, executor=executor)
+
+    async def scenario(port):
+        status, _, data = await _request(port, "POST", "/extract", pdf_bytes)
+        assert status == 200
+        assert data == urla_record["data"]
+        status, _, data = await _request(port, "POST", "/extract", b"not a pdf")
+        assert status == 422
+        status, _, _ = await _request(port, "POST", "/extract?sections=99", pdf_bytes)
+        assert status == 400
+        assert (await _request(port, "GET", "/health"))[2]["admitted"] == 0
+
+    _serve(service, scenario)
+    executor.shutdown()
+
+def test_refuses_with_429_when_saturated(monkeypatch):
+    release, started = threading.Event(), threading.Event()
+
+    def blocked(pdf_bytes, sections=None):
+        started.set()
+        release.wait(30)
+        return b"{}"
+
+    monkeypatch.setattr(src.service, "extract_pdf_bytes", blocked)
+    executor = ThreadPoolExecutor(1)
+    service = ExtractionService(workers=1, queue_size=1, executor=executor)
+
+    async def scenario(port):
+        running = asyncio.ensure_future(_request(port, "POST", "/extract", b"%PDF"))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 30)
+        waiting = asyncio.ensure_future(_request(port, "POST", "/extract", b"%PDF"))
+        while service.admitted < 2:
+            await asyncio.sleep(0.01)
+        # Refused before the body is read: the upload is announced but never sent.
+        status, headers, data = await _request(port, "POST", "/extract", b"", length=10 * 1024 * 1024)
+        assert status == 429
+        assert headers["Retry-After"] == "1"
+        assert service.admitted == 2
+        # A client that sends its upload anyway still gets the 429 rather than a reset.
+        assert (await _request(port, "POST", "/extract", b"%PDF" * 256 * 1024))[0] == 429
+        release.set()
+        assert [(await running)[0], (await waiting)[0]] == [200, 200]
+        assert service.admitted == 0
+
+    _serve(service, scenario)
+    executor.shutdown()
+
+def test_extract_refuses_past_capacity(monkeypatch):
+    service = ExtractionService(workers=1, queue_size=0, executor=ThreadPoolExecutor(1))
+    service.admitted = 1
+    status, body = asyncio.run(service.extract(b"%PDF"))
+    assert status == 429 and b"busy" in body
+    service._executor.shutdown()
+
+def test_timeout_drops_queued_requests(monkeypatch):
+    release, started = threading.Event(), threading.Event()
+
+    def blocked(pdf_bytes, sections=None):
+        started.set()
+        release.wait(30)
+        return b"{}"
+
+    monkeypatch.setattr(src.service, "extract_pdf_bytes", blocked)
+    executor = ThreadPoolExecutor(1)
+    service = ExtractionService(workers=1, queue_size=1, timeout=0.2, executor=executor)
+
+    async def scenario():
+        running = asyncio.ensure_future(service.extract(b"%PDF"))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 30)
+        # The queued request never got a worker: it is dropped, not left waiting.
+        assert (await service.extract(b"%PDF"))[0] == 504
+        assert service.admitted == 1
+        # The running one times out too but keeps its slot until the worker is done.
+        assert (await running)[0] == 504
+        assert service.admitted == 1
+        release.set()
+        while service.admitted:
+            await asyncio.sleep(0.01)
+        assert await service.extract(b"%PDF") == (200, b"{}")
+
+    asyncio.run(scenario())
+    executor.shutdown()
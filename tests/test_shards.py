@@ -0,0 +1,66 @@
+# tests/test_shards.py
+import io
+import json
+
+import pytest
+
+from src.output import NDJSONSink
+from src.shards import ShardJournal, end_torn_line, merge_outputs, parse_shard, select_shard, shard_of
+
+def _write(path, lines):
+    path.write_text("".join(lines), encoding="utf-8")
+    return str(path)
+
+def _record(source, status="ok", value=None):
+    return json.dumps({"source": source, "status": status, "data": value}) + "\n"
+
+def _merge(paths):
+    out = io.BytesIO()
+    summary = merge_outputs(paths, NDJSONSink(out))
+    return summary, [json.loads(line) for line in out.getvalue().splitlines()]
+
+def test_merge_keeps_last_record_per_source(tmp_path):
+    first = _write(tmp_path / "0.ndjson", [_record("a.pdf", value=1), _record("b.pdf", "error")])
+    second = _write(tmp_path / "1.ndjson", [_record("b.pdf", value=2), _record("a.pdf", value=3)])
+    summary, records = _merge([first, second])
+    assert {r["source"]: r["data"] for r in records} == {"a.pdf": 3, "b.pdf": 2}
+    assert summary == {"read": 4, "torn": 0, "written": 2, "ok": 2, "error": 0}
+
+def test_merge_skips_torn_lines(tmp_path):
+    torn = _record("c.pdf", value=4)[:20]
+    path = _write(tmp_path / "0.ndjson", [_record("a.pdf", value=1), torn])
+    end_torn_line(path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(_record("c.pdf", value=5))
+    summary, records = _merge([path])
+    assert {r["source"]: r["data"] for r in records} == {"a.pdf": 1, "c.pdf": 5}
+    assert summary["torn"] == 1
+
+def test_end_torn_line_leaves_complete_files(tmp_path):
+    path = _write(tmp_path / "0.ndjson", [_record("a.pdf")])
+    end_torn_line(path)
+    end_torn_line(str(tmp_path / "missing.ndjson"))
+    assert open(path, encoding="utf-8").read() == _record("a.pdf")
+
+def test_journal_resumes(tmp_path):
+    path = str(tmp_path / "journal.txt")
+    journal = ShardJournal(path)
+    journal.add("0" * 64, "a.pdf")
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("1" * 30)  # cut short by a crash
+    journal = ShardJournal(path)
+    assert journal.remaining(["a.pdf", "b.pdf"]) == ["b.pdf"]
+    journal.close()
+
+def test_shards_partition_paths():
+    paths = [f"/data/u{i}.pdf" for i in range(200)]
+    shards = [select_shard(paths, index, 4) for index in range(4)]
+    assert sorted(sum(shards, [])) == sorted(paths)
+    assert all(shards)
+    assert shard_of(paths[0], 4) == shard_of(paths[0], 4)
+
+@pytest.mark.parametrize("value", ["4/4", "-1/2", "1", "a/b"])
+def test_parse_shard_rejects(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
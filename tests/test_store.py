@@ -0,0 +1,62 @@
+# tests/test_store.py
+import copy
+import sqlite3
+
+import pytest
+
+from src.data_models import URLAData
+from src.store import SCHEMA_VERSION, ResultStore, ssn_digits
+
+def _other(urla_record, content_hash, ssn, zip_code, amount):
+    record = copy.deepcopy(urla_record)
+    record["sha256"] = content_hash
+    record["data"]["borrower"]["social_security_number"] = ssn
+    record["data"]["loan"]["property_address"]["zip_code"] = zip_code
+    record["data"]["loan"]["loan_amount"] = amount
+    return record
+
+@pytest.fixture
+def store(tmp_path, urla_record):
+    with ResultStore(str(tmp_path / "results.db")) as store:
+        stored = store.add_many([urla_record, _other(urla_record, "f" * 64, "999-88-7777", "10001", 250000.0),
+                                 {"source": "bad.pdf", "status": "error", "error": "broken"}])
+        assert stored == 2
+        yield store
+
+def test_get_and_contains(store, urla_record):
+    application = store.get(urla_record["sha256"])
+    assert isinstance(application.data, URLAData)
+    assert application.source == urla_record["source"]
+    assert application.data.loan.loan_amount == 1000000.0
+    assert urla_record["sha256"] in store and "0" * 64 not in store
+    assert store.get("0" * 64) is None
+    assert store.count() == 2
+
+def test_find_by_ssn_ignores_punctuation(store, urla_record):
+    found = store.find_by_ssn("122343123")
+    assert [a.content_hash for a in found] == [urla_record["sha256"]]
+    assert store.find_by_ssn("000-00-0000") == []
+
+def test_find_by_name_property_and_amount(store, urla_record):
+    assert len(store.find_by_name("thomas allen masserman j r")) == 2
+    assert [a.content_hash for a in store.find_by_property("10001")] == ["f" * 64]
+    assert [a.content_hash for a in store.find_by_property("07306", "4th")] == [urla_record["sha256"]]
+    assert [a.data.loan.loan_amount for a in store.find_by_loan_amount()] == [250000.0, 1000000.0]
+    assert [a.content_hash for a in store.find_by_loan_amount(500000)] == [urla_record["sha256"]]
+
+def test_storing_again_replaces(store, urla_record):
+    store.add_many([_other(urla_record, "f" * 64, "111-22-3333", "10001", 300000.0)])
+    assert store.count() == 2
+    assert store.find_by_ssn("999-88-7777") == []
+    assert store.get("f" * 64).data.loan.loan_amount == 300000.0
+
+def test_index_keys():
+    assert ssn_digits("12-234-3123") == ssn_digits("12 234 3123") == "122343123"
+    assert ssn_digits(None) is None and ssn_digits("n/a") is None
+
+def test_other_schema_versions_are_rejected(tmp_path, store):
+    store.close()
+    with sqlite3.connect(store.path) as conn:
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION - 1}")
+    with pytest.raises(ValueError):
+        ResultStore(store.path)
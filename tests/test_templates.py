@@ -0,0 +1,37 @@
+# tests/test_templates.py
+import pytest
+
+from benchmarks.synthetic_corpus import write_pdf
+from src.pdf_parser import FIELD_SPECS, URLA_LAYOUT, extract_urla
+from src.templates import (DEFAULT_TEMPLATE, TEMPLATES, URLA_2021, UnsupportedTemplateError, UrlaTemplate,
+                           fingerprint, get_template, template_for_text)
+
+from tests.conftest import URLA_PDF
+
+def test_fingerprint():
+    assert fingerprint("Freddie Mac Form 65 • Fannie Mae Form 1003 Effective 1/2021") is URLA_2021
+    assert fingerprint("Fannie Mae Form 1003 7/05 (rev.6/09)").revision == "2009-06"
+    assert fingerprint("Chase Bank Monthly Statement") is None
+    assert template_for_text("no footer at all") is DEFAULT_TEMPLATE
+    with pytest.raises(ValueError):
+        get_template("1999-01")
+
+def test_sample_is_the_2021_revision():
+    assert extract_urla(URLA_PDF, sections=["4a"]).template == "2021-01"
+
+def test_recognised_revision_without_extractor_fails_fast(tmp_path):
+    path = str(tmp_path / "old1003.pdf")
+    write_pdf([["Uniform Residential Loan Application", "Fannie Mae Form 1003 7/05 (rev.6/09)"]], path)
+    with pytest.raises(UnsupportedTemplateError):
+        extract_urla(path)
+
+def test_form_sections_come_from_the_revision(tmp_path, monkeypatch):
+    # A revision whose only field specs are section 4a's: its widgets cover everything.
+    loan_only = UrlaTemplate("test-4a", ("Test Form",), URLA_LAYOUT, [s for s in FIELD_SPECS if s.section == "4a"])
+    monkeypatch.setitem(TEMPLATES, loan_only.revision, loan_only)
+    path = str(tmp_path / "form.pdf")
+    write_pdf([["Section 1: Borrower Information"]], path, {"form1[0].LoanAmount[0]": "275,000"})
+    assert extract_urla(path).method == "acroform+text"
+    result = extract_urla(path, template="test-4a")
+    assert (result.method, result.template) == ("acroform", "test-4a")
+    assert result.data["loan_property_info"]["loan_amount"] == 275000.0